@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 from backend.entity.mood_modifiers import apply_numeric_modifier, apply_override
-from backend.intelligence.feature_store import Feature, prefetch_features, set_feature
+from backend.intelligence.feature_store import (
+    Feature,
+    get_feature_store,
+    prefetch_features,
+    set_feature,
+)
 from backend.memory.why_layer import WhyEntry, log_why, suggest_next_step
 from backend.observability.mission_debugger import get_debugger_config
 from backend.runner.vpn_provisioner import get_vpn_config
 
-_FEATURE_STORE: dict[str, dict[str, Feature]] = {}
-
-
 def get_autonomy_mode(
     autonomy: int, aggression: int, mood: str | None = "calm"
 ) -> dict:
@@ -68,7 +70,8 @@ def build_setup_context(
     patience: int,
     curiosity: int,
 ) -> dict:
-    cached = prefetch_features(target_id, _FEATURE_STORE)
+    store = get_feature_store()
+    cached = prefetch_features(target_id, store)
     if not cached:
         baseline = Feature(
             name="osint_enriched",
@@ -77,8 +80,8 @@ def build_setup_context(
             ttl_hours=48,
             source="planner_prefetch",
         )
-        set_feature(target_id, baseline, _FEATURE_STORE)
-        cached = prefetch_features(target_id, _FEATURE_STORE)
+        set_feature(target_id, baseline, store)
+        cached = prefetch_features(target_id, store)
 
     return {
         "target_id": target_id,
@@ -158,12 +158,12 @@ async def nexusmon_tick(payload: Dict[str, Any] | None = None):
     # Observe symbolic lane status without activating/loading any symbolic system.
     try:
         from backend.symbolic_governance import list_active_systems
-        from backend.symbolic_registry import discover_families, list_family_entries
+        from backend.symbolic_registry import count_family_entries, discover_families
 
         families = discover_families()
         observed_entries = 0
         for family in families:
-            observed_entries += len(list_family_entries(family))
+            observed_entries += count_family_entries(family)
         record_event(
             "symbolic_observation",
             {
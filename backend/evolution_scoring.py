@@ -30,6 +30,18 @@ class EvolutionScore:
     timestamp: str
 
 
+# Weights of the breakdown fields in the total; complexity counts inverted.
+SCORE_WEIGHTS = {
+    "relevance": 0.25,
+    "safety": 0.25,
+    "complexity": 0.15,
+    "impact": 0.25,
+    "confidence": 0.10,
+}
+HIGH_BAND = 0.66
+MEDIUM_BAND = 0.33
+
+
 def clamp(v: float) -> float:
     return max(0.0, min(1.0, v))
 
@@ -46,17 +58,17 @@ def score_proposal(proposal: Dict[str, Any]) -> EvolutionScore:
     confidence = 0.6 if "ensure" in rationale.lower() else 0.5
 
     total = clamp(
-        relevance * 0.25
-        + safety * 0.25
-        + (1 - complexity) * 0.15
-        + impact * 0.25
-        + confidence * 0.10
+        relevance * SCORE_WEIGHTS["relevance"]
+        + safety * SCORE_WEIGHTS["safety"]
+        + (1 - complexity) * SCORE_WEIGHTS["complexity"]
+        + impact * SCORE_WEIGHTS["impact"]
+        + confidence * SCORE_WEIGHTS["confidence"]
     )
 
     band = (
         ScoreBand.HIGH
-        if total >= 0.66
-        else ScoreBand.MEDIUM if total >= 0.33 else ScoreBand.LOW
+        if total >= HIGH_BAND
+        else ScoreBand.MEDIUM if total >= MEDIUM_BAND else ScoreBand.LOW
     )
 
     return EvolutionScore(
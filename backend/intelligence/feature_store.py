@@ -1,7 +1,23 @@
+"""Target feature store.
+
+Functions accept either a plain ``dict[target_id, dict[name, Feature]]``
+(in-memory, per caller) or a ``FeatureStore``: a SQLite table
+(``nexusmon_features``) behind an in-process read-through LRU.  The store
+applies ``FEATURE_CATALOG`` TTLs, drops expired rows, and can prefetch
+many targets in one query.  Targets prefetched within
+``PREFETCH_MAX_AGE_SEC`` are served from the LRU without touching SQLite.
+"""
+
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Iterable, Union
+import json
+import os
+import sqlite3
+import threading
 import time
 
 
@@ -32,9 +48,229 @@ FEATURE_CATALOG: dict[str, dict[str, Any]] = {
 }
 
 
+DEFAULT_DB_PATH = Path("data/nexusmon_features.db")
+DEFAULT_CACHE_SIZE = 1024
+PURGE_EVERY_WRITES = 256
+PREFETCH_MAX_AGE_SEC = 300.0
+_SQL_VARS = 500
+
+
+class FeatureStore:
+    """SQLite-backed feature table with a read-through LRU."""
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[tuple[str, str], Feature] = OrderedDict()
+        # target_id -> (loaded_at, feature names) for targets whose whole
+        # feature set is in the LRU.
+        self._loaded: OrderedDict[str, tuple[float, set[str]]] = OrderedDict()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS nexusmon_features ("
+            " target_id TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " computed_at REAL NOT NULL,"
+            " ttl_hours REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " source TEXT NOT NULL DEFAULT '',"
+            " PRIMARY KEY (target_id, name))"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_nexusmon_features_expires"
+            " ON nexusmon_features (expires_at)"
+        )
+
+    @staticmethod
+    def _row_to_feature(row: tuple) -> Feature:
+        target_id, name, value, computed_at, ttl_hours, source = row
+        return Feature(
+            name=name,
+            value=json.loads(value),
+            target_id=target_id,
+            computed_at=computed_at,
+            ttl_hours=ttl_hours,
+            source=source,
+        )
+
+    def _remember(self, feature: Feature) -> None:
+        key = (feature.target_id, feature.name)
+        self._cache[key] = feature
+        self._cache.move_to_end(key)
+        loaded = self._loaded.get(feature.target_id)
+        if loaded is not None:
+            loaded[1].add(feature.name)
+        while len(self._cache) > self.cache_size:
+            (target_id, _), _ = self._cache.popitem(last=False)
+            self._loaded.pop(target_id, None)
+
+    def _cached_target(self, target_id: str, now: float) -> dict[str, Feature] | None:
+        """Fresh features of a fully loaded target, or None if it must be queried."""
+        loaded = self._loaded.get(target_id)
+        if loaded is None or now - loaded[0] >= PREFETCH_MAX_AGE_SEC:
+            return None
+        out: dict[str, Feature] = {}
+        for name in loaded[1]:
+            key = (target_id, name)
+            feat = self._cache.get(key)
+            if feat is not None and feat.is_fresh:
+                self._cache.move_to_end(key)
+                out[name] = feat
+        self._loaded.move_to_end(target_id)
+        return out
+
+    def get(self, target_id: str, feature_name: str) -> Feature | None:
+        key = (target_id, feature_name)
+        with self._lock:
+            feat = self._cache.get(key)
+            if feat is not None:
+                if feat.is_fresh:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return feat
+                del self._cache[key]
+            self.misses += 1
+            row = self.conn.execute(
+                "SELECT target_id, name, value, computed_at, ttl_hours, source"
+                " FROM nexusmon_features"
+                " WHERE target_id = ? AND name = ? AND expires_at > ?",
+                (target_id, feature_name, time.time()),
+            ).fetchone()
+            if row is None:
+                return None
+            feat = self._row_to_feature(row)
+            self._remember(feat)
+            return feat
+
+    def set(self, feature: Feature) -> None:
+        catalog = FEATURE_CATALOG.get(feature.name)
+        if catalog is not None:
+            # Store a copy; the caller's Feature is left as passed in.
+            feature = replace(
+                feature,
+                ttl_hours=float(catalog["ttl_hours"]),
+                source=feature.source or str(catalog.get("source", "")),
+            )
+        expires_at = feature.computed_at + feature.ttl_hours * 3600
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO nexusmon_features VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    feature.target_id,
+                    feature.name,
+                    json.dumps(feature.value, default=str),
+                    feature.computed_at,
+                    feature.ttl_hours,
+                    expires_at,
+                    feature.source,
+                ),
+            )
+            self._remember(feature)
+            self._writes += 1
+            if self._writes % PURGE_EVERY_WRITES == 0:
+                self._purge_locked()
+
+    def prefetch(self, target_ids: Iterable[str]) -> dict[str, dict[str, Feature]]:
+        """Load every fresh feature of ``target_ids``.
+
+        Recently loaded targets come from the LRU; the rest are read with
+        one query per 500 ids.
+        """
+        ids = list(dict.fromkeys(target_ids))
+        out: dict[str, dict[str, Feature]] = {}
+        now = time.time()
+        with self._lock:
+            missing: list[str] = []
+            for tid in ids:
+                cached = self._cached_target(tid, now)
+                if cached is None:
+                    missing.append(tid)
+                    out[tid] = {}
+                else:
+                    out[tid] = cached
+            self.hits += len(ids) - len(missing)
+            self.misses += len(missing)
+            for start in range(0, len(missing), _SQL_VARS):
+                chunk = missing[start : start + _SQL_VARS]
+                marks = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    "SELECT target_id, name, value, computed_at, ttl_hours, source"
+                    f" FROM nexusmon_features WHERE target_id IN ({marks})"
+                    " AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+                for tid in chunk:
+                    self._loaded[tid] = (now, set())
+                    self._loaded.move_to_end(tid)
+                for row in rows:
+                    feat = self._row_to_feature(row)
+                    out[feat.target_id][feat.name] = feat
+                    self._remember(feat)
+            while len(self._loaded) > self.cache_size:
+                self._loaded.popitem(last=False)
+        return out
+
+    def _purge_locked(self) -> int:
+        now = time.time()
+        for key in [k for k, f in self._cache.items() if not f.is_fresh]:
+            del self._cache[key]
+        cur = self.conn.execute(
+            "DELETE FROM nexusmon_features WHERE expires_at <= ?", (now,)
+        )
+        return cur.rowcount
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; return how many were removed."""
+        with self._lock:
+            return self._purge_locked()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            rows = self.conn.execute("SELECT COUNT(*) FROM nexusmon_features").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "rows": rows,
+                "cached": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+FeatureBackend = Union[dict[str, dict[str, Feature]], FeatureStore]
+
+_store: FeatureStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Process-wide store at ``SWARMZ_FEATURE_DB`` (default data/nexusmon_features.db)."""
+    global _store
+    with _store_lock:
+        db_path = Path(os.environ.get("SWARMZ_FEATURE_DB", str(DEFAULT_DB_PATH)))
+        if _store is None or _store.db_path != db_path:
+            _store = FeatureStore(db_path)
+        return _store
+
+
 def get_feature(
-    target_id: str, feature_name: str, feature_store: dict[str, dict[str, Feature]]
+    target_id: str, feature_name: str, feature_store: FeatureBackend
 ) -> Feature | None:
+    if isinstance(feature_store, FeatureStore):
+        return feature_store.get(target_id, feature_name)
     feat = feature_store.get(target_id, {}).get(feature_name)
     if feat and feat.is_fresh:
         return feat
@@ -42,8 +278,13 @@ def get_feature(
 
 
 def set_feature(
-    target_id: str, feature: Feature, feature_store: dict[str, dict[str, Feature]]
+    target_id: str, feature: Feature, feature_store: FeatureBackend
 ) -> None:
+    if isinstance(feature_store, FeatureStore):
+        if feature.target_id != target_id:
+            feature = replace(feature, target_id=target_id)
+        feature_store.set(feature)
+        return
     feature_store.setdefault(target_id, {})[feature.name] = feature
 
 
@@ -59,7 +300,18 @@ def get_feature_store_config(patience: int, curiosity: int) -> dict[str, Any]:
 
 
 def prefetch_features(
-    target_id: str, feature_store: dict[str, dict[str, Feature]]
+    target_id: str, feature_store: FeatureBackend
 ) -> dict[str, Feature]:
-    cached = feature_store.get(target_id, {})
-    return {name: feat for name, feat in cached.items() if feat.is_fresh}
+    return prefetch_features_batch([target_id], feature_store)[target_id]
+
+
+def prefetch_features_batch(
+    target_ids: Iterable[str], feature_store: FeatureBackend
+) -> dict[str, dict[str, Feature]]:
+    if isinstance(feature_store, FeatureStore):
+        return feature_store.prefetch(target_ids)
+    out: dict[str, dict[str, Feature]] = {}
+    for target_id in target_ids:
+        cached = feature_store.get(target_id, {})
+        out[target_id] = {name: feat for name, feat in cached.items() if feat.is_fresh}
+    return out
@@ -1,9 +1,77 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import zlib
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 
-def simulate_proposal(proposal: Dict[str, Any]) -> Dict[str, Any]:
+from backend.evolution_scoring import (
+    HIGH_BAND,
+    MEDIUM_BAND,
+    SCORE_WEIGHTS,
+    score_proposal,
+)
+from core.monte_carlo import DEFAULT_TRIALS, interval, run_batches
+
+_FIELDS = tuple(SCORE_WEIGHTS)
+
+
+def _score_kernel(params, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Sample ``n`` proposal totals with each breakdown field Beta-distributed."""
+    means, weights, inverted, concentration = params
+    means = np.clip(means, 0.01, 0.99)
+    draws = rng.beta(means * concentration, (1.0 - means) * concentration, (n, len(means)))
+    draws = np.where(inverted, 1.0 - draws, draws)
+    return np.clip(draws @ weights, 0.0, 1.0)
+
+
+def project_score(
+    proposal: Dict[str, Any],
+    trials: int = DEFAULT_TRIALS,
+    seed: Optional[int] = None,
+    workers: int = 0,
+) -> Dict[str, Any]:
+    """Monte Carlo spread of the evolution score around its point estimate.
+
+    Each breakdown field is drawn from a Beta distribution centred on its
+    rule-based value; the lower the proposal's confidence, the wider the
+    draws.  The seed defaults to one derived from the proposal id.
+    """
+    breakdown = asdict(score_proposal(proposal).breakdown)
+    means = np.array([breakdown[f] for f in _FIELDS], dtype=np.float64)
+    weights = np.array([SCORE_WEIGHTS[f] for f in _FIELDS])
+    inverted = np.array([f == "complexity" for f in _FIELDS])
+    concentration = 4.0 + 36.0 * breakdown["confidence"]
+    if seed is None:
+        seed = zlib.crc32(str(proposal.get("id", "")).encode("utf-8"))
+    totals = run_batches(
+        _score_kernel,
+        (means, weights, inverted, concentration),
+        trials,
+        seed,
+        workers=workers,
+    )
+    count = max(len(totals), 1)
+    high = int((totals >= HIGH_BAND).sum())
+    medium = int((totals >= MEDIUM_BAND).sum()) - high
+    return {
+        "trials": int(len(totals)),
+        "seed": seed,
+        "projected_score": interval(totals),
+        "band_probability": {
+            "high": round(high / count, 4),
+            "medium": round(medium / count, 4),
+            "low": round((len(totals) - high - medium) / count, 4),
+        },
+    }
+
+
+def simulate_proposal(
+    proposal: Dict[str, Any],
+    trials: int = DEFAULT_TRIALS,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
     ptype = proposal["type"]
     risk = proposal["risk"]
     impacts: List[str] = []
@@ -21,5 +89,6 @@ def simulate_proposal(proposal: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "impacts": impacts,
         "warnings": warnings,
-        "summary": "Rule-based simulation of likely impact.",
+        "projection": project_score(proposal, trials=trials, seed=seed),
+        "summary": "Rule-based simulation of likely impact with a Monte Carlo score projection.",
     }
@@ -13,6 +13,7 @@ from backend.symbolic_governance import (
 from backend.symbolic_lineage_log import list_lineage_records
 from backend.symbolic_registry import (
     SYMBOLIC_FAMILIES,
+    count_family_entries,
     discover_families,
     get_entry_manifest,
     get_family_manifest,
@@ -111,7 +112,7 @@ async def symbolic_families():
             "families": [
                 {
                     "family": family,
-                    "entry_count": len(list_family_entries(family)),
+                    "entry_count": count_family_entries(family),
                 }
                 for family in families
             ],
@@ -133,7 +134,7 @@ async def symbolic_family(family: str):
             "family": family_payload["family"],
             "path": family_payload["path"],
             "manifest": family_payload["manifest"],
-            "entry_count": len(list_family_entries(family)),
+            "entry_count": count_family_entries(family),
         }
     )
 
@@ -1,12 +1,30 @@
+"""Symbolic family/entry registry.
+
+Parsed and validated manifests are cached per file, keyed on
+``(st_mtime_ns, st_size)``.  Each family additionally keeps its entry list
+and an ``entry_id`` index together with a signature made of the mtimes of
+every directory and manifest file under it; a request only re-stats those
+paths, and a family is re-walked only when the signature changes.
+
+A compiled index (``symbolic/.registry_index.json``, built at deploy time
+by ``scripts/build_symbolic_index.py``) seeds the per-file cache, so a cold
+start only parses manifests that changed since the index was built.
+"""
+
 from __future__ import annotations
 
+import copy
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.symbolic_manifest_schema import validate_manifest
 
 SYMBOLIC_ROOT = Path(__file__).resolve().parents[1] / "symbolic"
+INDEX_FILENAME = ".registry_index.json"
+INDEX_VERSION = 1
 
 SYMBOLIC_FAMILIES: tuple[str, ...] = (
     "pantheons",
@@ -29,9 +47,122 @@ SYMBOLIC_FAMILIES: tuple[str, ...] = (
 )
 
 
+_lock = threading.RLock()
+# absolute path -> (mtime_ns, size, validated manifest)
+_file_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+# family -> (signature, entries, entry_id -> entry)
+_family_cache: Dict[str, Tuple[Tuple[Tuple[str, int], ...], List[Dict[str, Any]], Dict[str, Dict[str, Any]]]] = {}
+_index_loaded_for: Optional[Path] = None
+
+
+def _load_compiled_index() -> None:
+    """Seed the per-file cache from the compiled index, once per root."""
+    global _index_loaded_for
+    if _index_loaded_for == SYMBOLIC_ROOT:
+        return
+    _index_loaded_for = SYMBOLIC_ROOT
+    try:
+        raw = json.loads((SYMBOLIC_ROOT / INDEX_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if not isinstance(raw, dict) or raw.get("version") != INDEX_VERSION:
+        return
+    for record in raw.get("files", []):
+        try:
+            path = str(SYMBOLIC_ROOT / record["path"])
+            _file_cache.setdefault(
+                path, (int(record["mtime_ns"]), int(record["size"]), record["manifest"])
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+
+
 def _read_manifest(path: Path) -> Dict[str, Any]:
+    st = path.stat()
+    key = str(path)
+    with _lock:
+        _load_compiled_index()
+        cached = _file_cache.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
     data = json.loads(path.read_text(encoding="utf-8-sig"))
-    return validate_manifest(data)
+    manifest = validate_manifest(data)
+    with _lock:
+        _file_cache[key] = (st.st_mtime_ns, st.st_size, manifest)
+    return manifest
+
+
+def _walk_family(family_path: Path) -> Tuple[List[Path], List[Path]]:
+    dirs: List[Path] = []
+    manifests: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(family_path):
+        dirnames.sort()
+        current = Path(dirpath)
+        dirs.append(current)
+        if "manifest.json" in filenames and current != family_path:
+            manifests.append(current / "manifest.json")
+    return dirs, manifests
+
+
+def _signature(paths: List[Path]) -> Tuple[Tuple[str, int], ...]:
+    out = []
+    for path in paths:
+        try:
+            out.append((str(path), path.stat().st_mtime_ns))
+        except OSError:
+            out.append((str(path), -1))
+    return tuple(out)
+
+
+def _family_index(family: str) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    if family not in SYMBOLIC_FAMILIES:
+        raise KeyError("unknown family")
+
+    family_path = SYMBOLIC_ROOT / family
+    if not family_path.exists():
+        raise FileNotFoundError("family directory not found")
+
+    with _lock:
+        cached = _family_cache.get(family)
+    if cached is not None:
+        signature, entries, by_id = cached
+        if _signature([Path(p) for p, _ in signature]) == signature:
+            return entries, by_id
+
+    dirs, manifest_paths = _walk_family(family_path)
+    signature = _signature(dirs + manifest_paths)
+    entries: list[dict[str, Any]] = []
+    for manifest_path in manifest_paths:
+        relative = manifest_path.relative_to(family_path)
+        entry_id = relative.parts[0]
+        manifest = _read_manifest(manifest_path)
+        entries.append(
+            {
+                "family": family,
+                "entry_id": entry_id,
+                "path": str(manifest_path.relative_to(SYMBOLIC_ROOT.parent)),
+                "manifest": manifest,
+            }
+        )
+    entries.sort(key=lambda item: (item["entry_id"], item["path"]))
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        by_id.setdefault(entry["entry_id"], entry)
+    with _lock:
+        _family_cache[family] = (signature, entries, by_id)
+    return entries, by_id
+
+
+def invalidate_cache(family: Optional[str] = None) -> None:
+    """Drop cached family indexes (all families when ``family`` is None)."""
+    global _index_loaded_for
+    with _lock:
+        if family is None:
+            _family_cache.clear()
+            _file_cache.clear()
+            _index_loaded_for = None
+        else:
+            _family_cache.pop(family, None)
 
 
 def discover_families() -> List[str]:
@@ -51,39 +182,52 @@ def get_family_manifest(family: str) -> Dict[str, Any]:
     return {
         "family": family,
         "path": str(manifest_path.relative_to(SYMBOLIC_ROOT.parent)),
-        "manifest": manifest,
+        "manifest": copy.deepcopy(manifest),
     }
 
 
-def list_family_entries(family: str) -> List[Dict[str, Any]]:
-    if family not in SYMBOLIC_FAMILIES:
-        raise KeyError("unknown family")
+def count_family_entries(family: str) -> int:
+    entries, _ = _family_index(family)
+    return len(entries)
 
-    family_path = SYMBOLIC_ROOT / family
-    if not family_path.exists():
-        raise FileNotFoundError("family directory not found")
 
-    entries: list[dict[str, Any]] = []
-    for manifest_path in sorted(family_path.rglob("manifest.json")):
-        if manifest_path == family_path / "manifest.json":
-            continue
-        relative = manifest_path.relative_to(family_path)
-        entry_id = relative.parts[0]
-        manifest = _read_manifest(manifest_path)
-        entries.append(
-            {
-                "family": family,
-                "entry_id": entry_id,
-                "path": str(manifest_path.relative_to(SYMBOLIC_ROOT.parent)),
-                "manifest": manifest,
-            }
-        )
-    entries.sort(key=lambda item: (item["entry_id"], item["path"]))
-    return entries
+def list_family_entries(family: str) -> List[Dict[str, Any]]:
+    entries, _ = _family_index(family)
+    return copy.deepcopy(entries)
 
 
 def get_entry_manifest(family: str, entry_id: str) -> Dict[str, Any]:
-    for entry in list_family_entries(family):
-        if entry["entry_id"] == entry_id:
-            return entry
-    raise FileNotFoundError("entry manifest not found")
+    _, by_id = _family_index(family)
+    entry = by_id.get(entry_id)
+    if entry is None:
+        raise FileNotFoundError("entry manifest not found")
+    return copy.deepcopy(entry)
+
+
+def build_compiled_index(path: Optional[Path] = None) -> Path:
+    """Parse and validate every family/entry manifest and write the compiled index."""
+    files: List[Dict[str, Any]] = []
+    for family in discover_families():
+        family_path = SYMBOLIC_ROOT / family
+        paths = [family_path / "manifest.json"] + _walk_family(family_path)[1]
+        for manifest_path in paths:
+            if not manifest_path.exists():
+                continue
+            st = manifest_path.stat()
+            data = json.loads(manifest_path.read_text(encoding="utf-8-sig"))
+            files.append(
+                {
+                    "path": manifest_path.relative_to(SYMBOLIC_ROOT).as_posix(),
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "manifest": validate_manifest(data),
+                }
+            )
+    target = Path(path) if path else SYMBOLIC_ROOT / INDEX_FILENAME
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"version": INDEX_VERSION, "files": files}, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    os.replace(tmp, target)
+    return target
@@ -0,0 +1,179 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Incremental file activity index.
+
+Answers "how many files exist / were touched in the last N hours" under a
+set of roots without walking the whole tree on every query.
+
+Each directory is remembered with its ``st_mtime_ns`` and the mtimes of
+its direct child files.  ``refresh()`` stats every directory but only
+re-lists the ones whose mtime changed (entries created, removed or
+renamed — which includes the write-to-temp + ``os.replace`` pattern used
+throughout the runtime).  In-place edits of an existing file do not touch
+the directory mtime, so a full rescan is forced every ``full_rescan_sec``
+to pick those up.
+
+File mtimes are also bucketed per hour, so window counts only inspect the
+single partial bucket at the window boundary.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+HOUR = 3600
+DEFAULT_FULL_RESCAN_SEC = 300.0
+
+
+@dataclass
+class _DirEntry:
+    mtime_ns: int
+    files: dict[str, float] = field(default_factory=dict)
+    subdirs: set[str] = field(default_factory=set)
+
+
+class ActivityIndex:
+    """Per-directory mtime cache with per-hour file activity counters."""
+
+    def __init__(
+        self,
+        roots: Iterable[Path],
+        full_rescan_sec: float = DEFAULT_FULL_RESCAN_SEC,
+    ) -> None:
+        self.roots = tuple(Path(r) for r in roots)
+        self.full_rescan_sec = full_rescan_sec
+        self._lock = threading.Lock()
+        self._dirs: dict[str, _DirEntry] = {}
+        self._hours: dict[int, dict[str, float]] = {}
+        self._file_count = 0
+        self._last_full = 0.0
+        self.dirs_rescanned = 0
+
+    # -- maintenance -------------------------------------------------------
+
+    def _track(self, path: str, mtime: float) -> None:
+        self._hours.setdefault(int(mtime // HOUR), {})[path] = mtime
+        self._file_count += 1
+
+    def _untrack(self, path: str, mtime: float) -> None:
+        bucket = self._hours.get(int(mtime // HOUR))
+        if bucket is not None and bucket.pop(path, None) is not None:
+            self._file_count -= 1
+            if not bucket:
+                del self._hours[int(mtime // HOUR)]
+
+    def _drop_tree(self, dir_path: str) -> None:
+        prefix = dir_path + os.sep
+        for key in [k for k in self._dirs if k == dir_path or k.startswith(prefix)]:
+            entry = self._dirs.pop(key)
+            for name, mtime in entry.files.items():
+                self._untrack(os.path.join(key, name), mtime)
+
+    def _rescan(self, dir_path: str, mtime_ns: int) -> _DirEntry:
+        old = self._dirs.get(dir_path)
+        entry = _DirEntry(mtime_ns)
+        try:
+            with os.scandir(dir_path) as it:
+                for child in it:
+                    try:
+                        if child.is_dir(follow_symlinks=False):
+                            entry.subdirs.add(child.name)
+                        elif child.is_file(follow_symlinks=False):
+                            entry.files[child.name] = child.stat().st_mtime
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        if old is not None:
+            for name, mtime in old.files.items():
+                if entry.files.get(name) != mtime:
+                    self._untrack(os.path.join(dir_path, name), mtime)
+            for name in old.subdirs - entry.subdirs:
+                self._drop_tree(os.path.join(dir_path, name))
+        for name, mtime in entry.files.items():
+            if old is None or old.files.get(name) != mtime:
+                self._track(os.path.join(dir_path, name), mtime)
+        self._dirs[dir_path] = entry
+        self.dirs_rescanned += 1
+        return entry
+
+    def refresh(self, force: bool = False) -> None:
+        """Bring the index up to date with the filesystem."""
+        with self._lock:
+            now = time.time()
+            full = force or (now - self._last_full) >= self.full_rescan_sec
+            if full:
+                self._last_full = now
+            stack = []
+            for root in self.roots:
+                key = str(root)
+                if root.is_dir():
+                    stack.append(key)
+                elif key in self._dirs:
+                    self._drop_tree(key)
+            while stack:
+                dir_path = stack.pop()
+                try:
+                    mtime_ns = os.stat(dir_path).st_mtime_ns
+                except OSError:
+                    self._drop_tree(dir_path)
+                    continue
+                entry = self._dirs.get(dir_path)
+                if full or entry is None or entry.mtime_ns != mtime_ns:
+                    entry = self._rescan(dir_path, mtime_ns)
+                stack.extend(os.path.join(dir_path, name) for name in entry.subdirs)
+
+    # -- queries -----------------------------------------------------------
+
+    def file_count(self) -> int:
+        with self._lock:
+            return self._file_count
+
+    def touched_within(self, hours: float, now: float | None = None) -> int:
+        """Number of indexed files modified in the last ``hours`` hours."""
+        now = time.time() if now is None else now
+        cutoff = now - hours * HOUR
+        edge = int(cutoff // HOUR)
+        with self._lock:
+            count = sum(len(files) for hour, files in self._hours.items() if hour > edge)
+            count += sum(1 for m in self._hours.get(edge, {}).values() if m >= cutoff)
+        return count
+
+    def hourly(self, hours: int = 24, now: float | None = None) -> list[dict[str, int]]:
+        """Per-hour touched-file counts for the last ``hours`` buckets, oldest first."""
+        now = time.time() if now is None else now
+        current = int(now // HOUR)
+        with self._lock:
+            return [
+                {"hour_start": h * HOUR, "files": len(self._hours.get(h, ()))}
+                for h in range(current - hours + 1, current + 1)
+            ]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "files": self._file_count,
+                "dirs": len(self._dirs),
+                "dirs_rescanned": self.dirs_rescanned,
+            }
+
+
+_indexes: dict[tuple[str, ...], ActivityIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_activity_index(roots: Iterable[Path]) -> ActivityIndex:
+    """Return the shared, refreshed index for this set of roots."""
+    roots = tuple(Path(r).resolve() for r in roots)
+    key = tuple(str(r) for r in roots)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ActivityIndex(roots)
+    index.refresh()
+    return index
@@ -6,15 +6,17 @@ Core module: weights configurable; algorithm changes require ADR.
 """
 from __future__ import annotations
 
+import heapq
 import math
+from collections import OrderedDict
 from dataclasses import dataclass
-from types import SimpleNamespace
 from typing import Any
 
 from core.agent_manifest import AgentManifest
-from core.manifest_registry import ManifestRegistry
+from core.manifest_registry import ManifestProfile, ManifestRegistry
 
 MAX_FALLBACK_DEPTH = 3
+ROUTE_CACHE_SIZE = 256
 
 
 @dataclass(frozen=True)
@@ -45,6 +47,10 @@ class CapabilityRouter:
     def __init__(self, registry: ManifestRegistry, weights: RouterWeights | None = None) -> None:
         self._registry = registry
         self._weights = weights or RouterWeights()
+        self._cache: OrderedDict[
+            tuple[frozenset[str], frozenset[str] | None], tuple[RouteCandidate, ...]
+        ] = OrderedDict()
+        self._cache_version = registry.version
 
     def route(
         self,
@@ -53,29 +59,55 @@ class CapabilityRouter:
     ) -> list[RouteCandidate]:
         """Route a task to ranked agent candidates."""
         task_set = frozenset(task_capabilities)
-        candidates: list[RouteCandidate] = []
-
-        for manifest in self._registry.all():
-            manifest_caps = self._caps(manifest)
-            if granted_capabilities is not None and not manifest_caps.issubset(
-                granted_capabilities
-            ):
+        granted = frozenset(granted_capabilities) if granted_capabilities is not None else None
+        if self._cache_version != self._registry.version:
+            self._cache.clear()
+            self._cache_version = self._registry.version
+        key = (task_set, granted)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return list(cached)
+
+        ranked = tuple(sorted(self._candidates(task_set, granted), key=self._rank_key))
+        self._cache[key] = ranked
+        if len(self._cache) > ROUTE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return list(ranked)
+
+    def top_k(
+        self,
+        task_capabilities: list[str],
+        k: int,
+        granted_capabilities: frozenset[str] | None = None,
+    ) -> list[RouteCandidate]:
+        """Return the ``k`` best candidates, in ``route`` order."""
+        if k <= 0:
+            return []
+        task_set = frozenset(task_capabilities)
+        granted = frozenset(granted_capabilities) if granted_capabilities is not None else None
+        cached = self._cache.get((task_set, granted))
+        if cached is not None and self._cache_version == self._registry.version:
+            return list(cached[:k])
+        return heapq.nsmallest(k, self._candidates(task_set, granted), key=self._rank_key)
+
+    def _candidates(
+        self, task_set: frozenset[str], granted: frozenset[str] | None
+    ) -> list[RouteCandidate]:
+        # Only agents sharing a capability with the task can score > 0.
+        out: list[RouteCandidate] = []
+        for agent_id in self._registry.candidates(task_set):
+            profile = self._registry.profile(agent_id)
+            if profile is None:
                 continue
+            if granted is not None and not profile.capabilities <= granted:
+                continue
+            out.append(self._score_profile(agent_id, profile, task_set))
+        return out
 
-            score = self._score(manifest, task_set)
-            if score.match_score > 0:
-                candidates.append(score)
-
-        return sorted(
-            candidates,
-            key=lambda c: (
-                -c.composite,
-                -c.match_score,
-                -c.trust_level,
-                c.cost_estimate,
-                c.agent_id,
-            ),
-        )
+    @staticmethod
+    def _rank_key(c: RouteCandidate) -> tuple[float, float, float, float, str]:
+        return (-c.composite, -c.match_score, -c.trust_level, c.cost_estimate, c.agent_id)
 
     def resolve_fallback(
         self,
@@ -145,14 +177,13 @@ class CapabilityRouter:
             )
         return sorted(granted)
 
-    def _score(self, manifest: AgentManifest, task_set: frozenset[str]) -> RouteCandidate:
-        matched = task_set & self._caps(manifest)
+    def _score_profile(
+        self, agent_id: str, profile: ManifestProfile, task_set: frozenset[str]
+    ) -> RouteCandidate:
+        matched = task_set & profile.capabilities
         match_score = len(matched) / len(task_set) if task_set else 0.0
-        trust_level = self._constraint_float(manifest, "trust_level", 0.5)
-
-        mem_cost = (self._constraint_float(manifest, "max_memory_mb", 256.0) or 256.0) / 4096
-        cpu_cost = (self._constraint_float(manifest, "max_cpu_percent", 25.0) or 25.0) / 100
-        cost_estimate = min((mem_cost + cpu_cost) / 2, 1.0)
+        trust_level = profile.trust_level
+        cost_estimate = profile.cost_estimate
 
         weights = self._weights
         composite = (
@@ -168,7 +199,7 @@ class CapabilityRouter:
         )
 
         return RouteCandidate(
-            agent_id=manifest.id,
+            agent_id=agent_id,
             match_score=match_score,
             trust_level=trust_level,
             cost_estimate=cost_estimate,
@@ -195,14 +226,3 @@ class CapabilityRouter:
             return None
         val = getattr(error_modes, "fallback_agent_id", None)
         return str(val) if val else None
-
-    @staticmethod
-    def _constraint_float(manifest: Any, key: str, default: float) -> float:
-        constraints = getattr(manifest, "constraints", None)
-        if constraints is None:
-            constraints = SimpleNamespace()
-        raw = getattr(constraints, key, default)
-        try:
-            return float(raw)
-        except Exception:
-            return default
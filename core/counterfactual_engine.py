@@ -2,15 +2,26 @@
 # Commercial use, hosting, and resale prohibited.
 # See LICENSE file for details.
 import json
+import zlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from core.monte_carlo import DEFAULT_TRIALS, simulate_strategies
 from core.operator_anchor import compute_record_hash
 
 
 class CounterfactualEngine:
-    def __init__(self, data_dir: str, evolution, trajectory=None, world_model=None):
+    def __init__(
+        self,
+        data_dir: str,
+        evolution,
+        trajectory=None,
+        world_model=None,
+        trials: int = DEFAULT_TRIALS,
+        seed: Optional[int] = None,
+        workers: int = 0,
+    ):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.snapshots_file = self.data_dir / "decision_snapshots.jsonl"
@@ -19,6 +30,11 @@ class CounterfactualEngine:
         self.evolution = evolution
         self.trajectory = trajectory
         self.world_model = world_model
+        # Monte Carlo settings; with a seed, each mission's draws are
+        # reproducible from (seed, mission_id).
+        self.trials = trials
+        self.seed = seed
+        self.workers = workers
         if not self.snapshots_file.exists():
             self.snapshots_file.touch()
         if not self.cf_log_file.exists():
@@ -106,6 +122,14 @@ class CounterfactualEngine:
                 best_alt = pred
         regret_score = max(0.0, best_alt - actual_score)
         surprise_score = abs(predicted_vs_actual_delta)
+        monte_carlo = self.simulate(
+            mission_id,
+            inputs_hash,
+            selected_strategy,
+            candidate_strategies,
+            trend_vector,
+            actual_score,
+        )
 
         log_entry = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -117,6 +141,7 @@ class CounterfactualEngine:
             "predicted_vs_actual_delta": predicted_vs_actual_delta,
             "regret_score": regret_score,
             "surprise_score": surprise_score,
+            "monte_carlo": monte_carlo,
             "trend_vector": trend_vector,
             "success": success,
         }
@@ -134,6 +159,40 @@ class CounterfactualEngine:
 
         self._maybe_emit_report()
 
+    def simulate(
+        self,
+        mission_id: str,
+        inputs_hash: str,
+        selected_strategy: str,
+        candidate_strategies: List[str],
+        trend_vector: float,
+        actual_score: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Sample candidate outcomes from their recent scores.
+
+        Strategies without history fall back to their point average.
+        Returns confidence intervals for the selected strategy's projected
+        score and for regret, plus the seed that reproduces the run.
+        """
+        samples: Dict[str, List[float]] = {}
+        for strat in dict.fromkeys(list(candidate_strategies) + [selected_strategy]):
+            history = self.evolution.strategy_samples(inputs_hash, strat)
+            samples[strat] = history or [
+                self.evolution.strategy_average(inputs_hash, strat)
+            ]
+        seed = None
+        if self.seed is not None:
+            seed = [self.seed, zlib.crc32(mission_id.encode("utf-8"))]
+        return simulate_strategies(
+            samples,
+            selected_strategy,
+            actual=actual_score,
+            shift=trend_vector * 0.05,
+            trials=self.trials,
+            seed=seed,
+            workers=self.workers,
+        )
+
     # ---------- Reporting ----------
     def _load_cf_log(self) -> List[Dict[str, Any]]:
         entries: List[Dict[str, Any]] = []
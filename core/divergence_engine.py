@@ -7,6 +7,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any
 
+from core.activity_index import get_activity_index
+
 
 class DivergenceEngine:
     def __init__(self, data_dir: str = "data"):
@@ -22,16 +24,8 @@ class DivergenceEngine:
 
     def _count_prepared(self, hours: float = 24.0) -> int:
         base = self.data_dir.parent / "prepared_actions"
-        count = 0
-        cutoff = time.time() - hours * 3600
-        for sub in ["messages", "schedules", "commands", "purchases"]:
-            root = base / sub
-            if not root.exists():
-                continue
-            for p in root.glob("**/*"):
-                if p.is_file() and p.stat().st_mtime >= cutoff:
-                    count += 1
-        return count
+        roots = [base / sub for sub in ["messages", "schedules", "commands", "purchases"]]
+        return get_activity_index(roots).touched_within(hours)
 
     def _count_executed(self, hours: float = 24.0) -> int:
         perf_file = self.data_dir / "perf_ledger.jsonl"
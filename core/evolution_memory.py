@@ -2,12 +2,22 @@
 # Commercial use, hosting, and resale prohibited.
 # See LICENSE file for details.
 import json
+import os
 import random
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from core.operator_anchor import compute_record_hash, sign_record, verify_signature
+from swarmz_runtime.storage.jsonl_pages import read_backward
+
+# Records kept in memory for history_tail(); older ones stay on disk only.
+HISTORY_TAIL = 1000
+# Recent scores kept per (inputs_hash, strategy) aggregate.
+STRATEGY_WINDOW = 20
+# Appends between chain checkpoint writes.
+CHECKPOINT_EVERY = 100
 
 
 class EvolutionMemory:
@@ -26,6 +36,7 @@ class EvolutionMemory:
         self.personality_file = self.data_dir / "personality_vector.json"
         self.reliability_file = self.data_dir / "strategy_reliability.json"
         self.uncertainty_file = self.data_dir / "uncertainty_profile.json"
+        self.checkpoint_file = self.data_dir / "evolution_checkpoint.json"
         self.epochs_dir = self.data_dir / "epochs"
         self.epochs_dir.mkdir(exist_ok=True)
         if not self.history_file.exists():
@@ -40,7 +51,12 @@ class EvolutionMemory:
         self._reliability = self._load_reliability()
         self._uncertainty = self._load_uncertainty()
         self._commitments: Dict[str, float] = {}
-        self._history_cache: List[Dict[str, Any]] = []
+        self._history_cache: deque = deque(maxlen=HISTORY_TAIL)
+        self._aggregates: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._record_count = 0
+        self._last_hash = "GENESIS"
+        self._verified_offset = 0
+        self._since_checkpoint = 0
         self._load_chain()
 
     @staticmethod
@@ -65,12 +81,72 @@ class EvolutionMemory:
         return round(base * speed_factor * cost_factor, 4)
 
     # ---------- Chain management ----------
-    def _load_chain(self) -> None:
-        prev_hash = "GENESIS"
-        records: List[Dict[str, Any]] = []
+    @property
+    def record_count(self) -> int:
+        return self._record_count
+
+    def _read_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Checkpoint to resume verification from, if it still matches the log.
+
+        The checkpoint records the byte offset up to which the chain was
+        verified, the hash of the record ending there and the aggregates at
+        that point.  It is discarded if it was written under a different
+        operator key or the record before the offset no longer carries the
+        recorded hash (the log was truncated or rewritten).
+        """
+        try:
+            with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+                cp = json.load(f)
+            offset = int(cp["offset"])
+            if cp.get("key") != self.anchor.get("operator_public_key"):
+                return None
+            if offset == 0:
+                return cp
+            with open(self.history_file, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() < offset:
+                    return None
+                start = max(0, offset - 64 * 1024)
+                f.seek(start)
+                lines = f.read(offset - start).rstrip(b"\n").split(b"\n")
+            if json.loads(lines[-1]).get("record_hash") != cp["last_hash"]:
+                return None
+            return cp
+        except Exception:
+            return None
+
+    def _write_checkpoint(self) -> None:
+        cp = {
+            "offset": self._verified_offset,
+            "records": self._record_count,
+            "last_hash": self._last_hash,
+            "key": self.anchor.get("operator_public_key"),
+            "aggregates": self._aggregates,
+        }
+        tmp = self.checkpoint_file.with_suffix(".json.tmp")
         try:
-            with open(self.history_file, "r", encoding="utf-8") as f:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(cp, f, separators=(",", ":"))
+            os.replace(tmp, self.checkpoint_file)
+            self._since_checkpoint = 0
+        except OSError:
+            pass
+
+    def _load_chain(self, full: bool = False) -> None:
+        """Verify the hash chain, resuming from the checkpoint unless ``full``."""
+        cp = None if full else self._read_checkpoint()
+        offset = cp["offset"] if cp else 0
+        prev_hash = cp["last_hash"] if cp else "GENESIS"
+        count = cp["records"] if cp else 0
+        self._aggregates = cp["aggregates"] if cp else {}
+        self.chain_valid = True
+        verified = 0
+        priv = self.anchor.get("operator_private_key", "")
+        try:
+            with open(self.history_file, "rb") as f:
+                f.seek(offset)
                 for line in f:
+                    offset += len(line)
                     if not line.strip():
                         continue
                     row = json.loads(line)
@@ -88,26 +164,38 @@ class EvolutionMemory:
                     if record_hash != row.get("record_hash"):
                         self.chain_valid = False
                         break
-                    priv = self.anchor.get("operator_private_key", "")
                     if priv and not verify_signature(
                         priv, record_hash, row.get("signature", "")
                     ):
                         self.chain_valid = False
                         break
-                    records.append(row)
+                    self._fold(row)
+                    count += 1
+                    verified += 1
                     prev_hash = row.get("record_hash")
         except Exception:
             self.chain_valid = False
+        self._history_cache.clear()
         if self.chain_valid:
-            self._history_cache = records
+            self._record_count = count
+            self._last_hash = prev_hash
+            self._verified_offset = offset
+            tail = read_backward(self.history_file, limit=HISTORY_TAIL).records
+            self._history_cache.extend(reversed(tail))
+            if verified or cp is None:
+                self._write_checkpoint()
         else:
             self.allow_write = False
-            self._history_cache = []
+            self._aggregates = {}
+            self._record_count = 0
+
+    def verify_chain(self, full: bool = True) -> bool:
+        """Re-verify the history; ``full`` ignores the checkpoint."""
+        self._load_chain(full=full)
+        return self.chain_valid
 
     def _next_previous_hash(self) -> str:
-        if not self._history_cache:
-            return "GENESIS"
-        return self._history_cache[-1].get("record_hash", "GENESIS")
+        return self._last_hash if self._record_count else "GENESIS"
 
     def append_record(
         self,
@@ -146,39 +234,59 @@ class EvolutionMemory:
             "signature": signature,
         }
 
-        with open(self.history_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(full_record, separators=(",", ":")) + "\n")
+        with open(self.history_file, "ab") as f:
+            line = json.dumps(full_record, separators=(",", ":")) + "\n"
+            f.write(line.encode("utf-8"))
+            self._verified_offset = f.tell()
 
         self._history_cache.append(full_record)
+        self._record_count += 1
+        self._last_hash = record_hash
+        self._fold(full_record)
         self._maybe_emit_epoch()
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= CHECKPOINT_EVERY:
+            self._write_checkpoint()
 
     def load_history(self, limit: int = 20) -> List[Dict[str, Any]]:
         if not self.chain_valid:
             return []
         if limit <= 0:
             return []
-        return self._history_cache[-limit:]
+        return list(self._history_cache)[-limit:]
 
     def history_tail(self, limit: int = 20) -> List[Dict[str, Any]]:
         return self.load_history(limit=limit)
 
     # ---------- Strategy aggregation ----------
+    def _fold(self, row: Dict[str, Any]) -> None:
+        """Add one history record to the running per-hash, per-strategy stats."""
+        strat = row.get("strategy_used", "baseline")
+        score = float(row.get("score", 0.0))
+        rec = self._aggregates.setdefault(row.get("inputs_hash"), {}).setdefault(
+            strat, {"total": 0.0, "count": 0, "success": 0, "window": []}
+        )
+        rec["total"] += score
+        rec["count"] += 1
+        rec["success"] += 1 if row.get("success_bool") else 0
+        window = rec["window"]
+        window.append(score)
+        if len(window) > STRATEGY_WINDOW:
+            del window[0]
+
     def _aggregate_by_strategy(self, inputs_hash: str) -> Dict[str, Dict[str, float]]:
         stats: Dict[str, Dict[str, float]] = {}
-        for row in self._history_cache:
-            if row.get("inputs_hash") != inputs_hash:
-                continue
-            strat = row.get("strategy_used", "baseline")
-            score = float(row.get("score", 0.0))
-            success = bool(row.get("success_bool"))
-            rec = stats.setdefault(strat, {"total": 0.0, "count": 0, "success": 0})
-            rec["total"] += score
-            rec["count"] += 1
-            rec["success"] += 1 if success else 0
-        for rec in stats.values():
-            cnt = max(rec.get("count", 1), 1)
-            rec["avg_score"] = rec.get("total", 0.0) / cnt
-            rec["success_rate"] = rec.get("success", 0) / cnt
+        for strat, rec in self._aggregates.get(inputs_hash, {}).items():
+            cnt = max(rec["count"], 1)
+            window = rec["window"]
+            stats[strat] = {
+                "total": rec["total"],
+                "count": rec["count"],
+                "success": rec["success"],
+                "avg_score": rec["total"] / cnt,
+                "success_rate": rec["success"] / cnt,
+                "window_avg": sum(window) / len(window) if window else 0.0,
+            }
         return stats
 
     def strategy_average(self, inputs_hash: str, strategy: str) -> float:
@@ -187,6 +295,11 @@ class EvolutionMemory:
             return float(stats[strategy].get("avg_score", 0.0))
         return 0.0
 
+    def strategy_samples(self, inputs_hash: str, strategy: str) -> List[float]:
+        """Most recent scores (up to STRATEGY_WINDOW) for ``strategy`` on ``inputs_hash``."""
+        rec = self._aggregates.get(inputs_hash, {}).get(strategy)
+        return list(rec["window"]) if rec else []
+
     def _weight_with_personality(self, base_score: float) -> float:
         r = self._personality.get("risk_tolerance", 0.5)
         s = self._personality.get("speed_preference", 0.5)
@@ -313,7 +426,7 @@ class EvolutionMemory:
 
     def get_scoreboard(self) -> Dict[str, Any]:
         return {
-            "records": len(self._history_cache),
+            "records": self._record_count,
             "chain_valid": self.chain_valid,
             "personality": self._personality,
             "companion_state": self.get_companion_state(),
@@ -479,7 +592,7 @@ class EvolutionMemory:
 
     # ---------- Epoch compression ----------
     def _maybe_emit_epoch(self) -> None:
-        count = len(self._history_cache)
+        count = self._record_count
         if count == 0 or count % 100 != 0:
             return
         epoch_idx = count // 100
@@ -495,7 +608,7 @@ class EvolutionMemory:
             "strategies": {},
         }
         strat_totals: Dict[str, Dict[str, Any]] = {}
-        for row in self._history_cache[-100:]:
+        for row in list(self._history_cache)[-100:]:
             strat = row.get("strategy_used", "baseline")
             st = strat_totals.setdefault(
                 strat, {"scores": [], "success": 0, "count": 0}
@@ -0,0 +1,199 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Cached health snapshot for readiness and cockpit probes.
+
+Health fields (test counts, observatory size, latest diary write, ...)
+are expensive to compute: they walk directory trees and parse registry
+JSON.  ``HealthSnapshot`` keeps each registered field in memory with the
+time it was computed, and a daemon thread recomputes a field when
+
+- it is older than ``refresh_sec``, or
+- the ``st_mtime_ns`` of one of its watched paths changed (a cheap stat
+  that catches entries added to or removed from a directory, and
+  registry files rewritten in place).
+
+Probes read from memory.  A field older than ``max_stale_sec`` (e.g.
+because the refresher is not running) is recomputed on read, so callers
+in async handlers should go through ``read_async``, which only leaves the
+event loop when a recompute is needed.  ``on_change`` is called with the
+field name and new value whenever a recompute changes a value.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+DEFAULT_REFRESH_SEC = 15.0
+DEFAULT_MAX_STALE_SEC = 60.0
+DEFAULT_TICK_SEC = 1.0
+
+
+@dataclass
+class _Field:
+    compute: Callable[[], Any]
+    watch: tuple[Path, ...]
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    value: Any = None
+    computed_at: Optional[float] = None
+    signature: tuple = ()
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+
+def _signature(paths: Iterable[Path]) -> tuple:
+    out = []
+    for path in paths:
+        try:
+            out.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+class HealthSnapshot:
+    """Named health fields computed off the request path."""
+
+    def __init__(
+        self,
+        refresh_sec: float = DEFAULT_REFRESH_SEC,
+        max_stale_sec: float = DEFAULT_MAX_STALE_SEC,
+        tick_sec: float = DEFAULT_TICK_SEC,
+        clock: Callable[[], float] = time.time,
+        on_change: Optional[Callable[[str, Any], None]] = None,
+    ) -> None:
+        self.refresh_sec = refresh_sec
+        self.max_stale_sec = max_stale_sec
+        self.tick_sec = tick_sec
+        self._clock = clock
+        self._on_change = on_change
+        self._fields: dict[str, _Field] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.refreshes = 0
+
+    def register(
+        self,
+        name: str,
+        compute: Callable[[], Any],
+        watch: Iterable[Path] = (),
+    ) -> None:
+        self._fields[name] = _Field(compute, tuple(Path(p) for p in watch))
+
+    # -- computation -------------------------------------------------------
+
+    def refresh(self, name: str) -> Any:
+        """Recompute ``name`` now and return the new value."""
+        entry = self._fields[name]
+        with entry.lock:
+            signature = _signature(entry.watch)
+            started = time.perf_counter()
+            try:
+                value = entry.compute()
+            except Exception as exc:
+                # Keep serving the previous value; the error is reported.
+                entry.error = str(exc)
+                entry.computed_at = self._clock()
+                return entry.value
+            entry.duration_ms = (time.perf_counter() - started) * 1000.0
+            changed = entry.computed_at is not None and value != entry.value
+            entry.value = value
+            entry.signature = signature
+            entry.computed_at = self._clock()
+            entry.error = None
+            self.refreshes += 1
+        if changed and self._on_change is not None:
+            self._on_change(name, value)
+        return value
+
+    def _due(self, entry: _Field, now: float) -> bool:
+        if entry.computed_at is None or now - entry.computed_at >= self.refresh_sec:
+            return True
+        return bool(entry.watch) and _signature(entry.watch) != entry.signature
+
+    def refresh_due(self) -> int:
+        """Recompute every field that is due; return how many were."""
+        now = self._clock()
+        names = [name for name, entry in self._fields.items() if self._due(entry, now)]
+        for name in names:
+            self.refresh(name)
+        return len(names)
+
+    def _stale(self, name: str, now: float) -> bool:
+        entry = self._fields[name]
+        return entry.computed_at is None or now - entry.computed_at > self.max_stale_sec
+
+    # -- reads -------------------------------------------------------------
+
+    def read(self, names: Iterable[str]) -> tuple[dict[str, Any], dict[str, str]]:
+        """Values and ISO computed-at timestamps for ``names``."""
+        values: dict[str, Any] = {}
+        computed: dict[str, str] = {}
+        now = self._clock()
+        for name in names:
+            if self._stale(name, now):
+                self.refresh(name)
+            entry = self._fields[name]
+            values[name] = entry.value
+            computed[name] = datetime.fromtimestamp(
+                entry.computed_at, timezone.utc
+            ).isoformat()
+        return values, computed
+
+    async def read_async(
+        self, names: Iterable[str]
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        names = list(names)
+        now = self._clock()
+        if any(self._stale(name, now) for name in names):
+            return await asyncio.to_thread(self.read, names)
+        return self.read(names)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="swarmz-health", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh_due()
+            except Exception:
+                pass
+            self._stop.wait(self.tick_sec)
+
+    def stats(self) -> dict[str, Any]:
+        now = self._clock()
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "refresh_sec": self.refresh_sec,
+            "max_stale_sec": self.max_stale_sec,
+            "refreshes": self.refreshes,
+            "fields": {
+                name: {
+                    "age_sec": None if e.computed_at is None else now - e.computed_at,
+                    "duration_ms": round(e.duration_ms, 3),
+                    "error": e.error,
+                }
+                for name, e in self._fields.items()
+            },
+        }
@@ -0,0 +1,79 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Compiled keyword matcher for rule-based intent routing.
+
+Rule tables are ``(label, keywords)`` pairs in priority order.  A label
+matches when any of its keywords occurs as a substring of the text, and
+``match`` returns the highest-priority matching label -- the same answer
+as testing ``any(k in text for k in keywords)`` rule by rule, but in a
+single pass over the text.
+
+The keywords are compiled once into an Aho-Corasick automaton flattened
+to a DFA: one dict lookup per character, with each state carrying the
+best (lowest) rule index of every keyword ending there.  The scan stops
+early once the top-priority rule has matched.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Optional, Sequence
+
+
+class KeywordMatcher:
+    """Priority-ordered substring matcher over a fixed rule table."""
+
+    def __init__(self, rules: Sequence[tuple[str, Iterable[str]]]) -> None:
+        self.labels: tuple[str, ...] = tuple(label for label, _ in rules)
+        none = len(self.labels)
+        goto: list[dict[str, int]] = [{}]
+        best: list[int] = [none]
+        for rank, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                if not keyword:
+                    raise ValueError(f"empty keyword in rule {self.labels[rank]!r}")
+                state = 0
+                for ch in keyword:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto.append({})
+                        best.append(none)
+                        goto[state][ch] = nxt
+                    state = nxt
+                best[state] = min(best[state], rank)
+
+        # Breadth-first: fill in failure transitions so every state has a
+        # complete edge map (missing characters fall back to the root).
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{}] * (len(goto) - 1)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            edges = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                best[nxt] = min(best[nxt], best[fail[nxt]])
+                edges[ch] = nxt
+                queue.append(nxt)
+            delta[state] = edges
+        self._delta = delta
+        self._best = best
+        self._none = none
+
+    def rank(self, text: str) -> Optional[int]:
+        """Index of the highest-priority rule matching ``text``, if any."""
+        delta, best = self._delta, self._best
+        state, found = 0, self._none
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return None if found == self._none else found
+
+    def match(self, text: str) -> Optional[str]:
+        """Label of the highest-priority rule matching ``text``, if any."""
+        found = self.rank(text)
+        return None if found is None else self.labels[found]
@@ -5,30 +5,112 @@ Core module: API shape frozen at v0.1. Immutable without ADR.
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Iterable
 
 from core.agent_manifest import AgentManifest
+from core.registry import registry as v1_registry
+
+
+@dataclass(frozen=True)
+class ManifestProfile:
+    """Routing attributes precomputed once per registered manifest."""
+
+    capabilities: frozenset[str]
+    trust_level: float
+    cost_estimate: float
+
+
+def _constraint_float(manifest: Any, key: str, default: float) -> float:
+    constraints = getattr(manifest, "constraints", None)
+    raw = getattr(constraints, key, default) if constraints is not None else default
+    try:
+        return float(raw)
+    except Exception:
+        return default
+
+
+def build_profile(manifest: Any) -> ManifestProfile:
+    """Derive capability set, trust and normalised cost from a manifest."""
+    mem_cost = (_constraint_float(manifest, "max_memory_mb", 256.0) or 256.0) / 4096
+    cpu_cost = (_constraint_float(manifest, "max_cpu_percent", 25.0) or 25.0) / 100
+    return ManifestProfile(
+        capabilities=frozenset(str(c) for c in getattr(manifest, "capabilities", [])),
+        trust_level=_constraint_float(manifest, "trust_level", 0.5),
+        cost_estimate=min((mem_cost + cpu_cost) / 2, 1.0),
+    )
 
 
 class ManifestRegistry:
     """
     Loads, validates, and indexes agent manifests.
     Query by agent ID or capability token.
+
+    Besides the capability -> agents inverted index, each manifest's
+    routing profile is computed on registration. ``version`` increases on
+    every mutation so routers can invalidate cached results.
+
+    ``follow`` subscribes to the schema-enforcing registry in
+    ``core.registry`` so hot updates and removals applied there are
+    re-indexed here through ``replace`` / ``unregister``.
     """
 
     def __init__(self) -> None:
         self._by_id: dict[str, AgentManifest] = {}
-        self._by_capability: dict[str, list[AgentManifest]] = {}
+        self._by_capability: dict[str, dict[str, AgentManifest]] = {}
+        self._profiles: dict[str, ManifestProfile] = {}
+        self.version = 0
+
+    def _index(self, manifest: AgentManifest) -> None:
+        profile = build_profile(manifest)
+        self._by_id[manifest.id] = manifest
+        self._profiles[manifest.id] = profile
+        for cap in profile.capabilities:
+            self._by_capability.setdefault(cap, {})[manifest.id] = manifest
+        self.version += 1
+
+    def _unindex(self, agent_id: str) -> AgentManifest | None:
+        manifest = self._by_id.pop(agent_id, None)
+        profile = self._profiles.pop(agent_id, None)
+        if profile is not None:
+            for cap in profile.capabilities:
+                bucket = self._by_capability.get(cap)
+                if bucket is not None:
+                    bucket.pop(agent_id, None)
+                    if not bucket:
+                        del self._by_capability[cap]
+        self.version += 1
+        return manifest
 
     def register(self, manifest: AgentManifest) -> None:
         """Register a manifest. Duplicate IDs are rejected (append-only semantics)."""
         if manifest.id in self._by_id:
             raise ValueError(f"Manifest with id={manifest.id} already registered")
+        self._index(manifest)
 
-        self._by_id[manifest.id] = manifest
-        for cap in manifest.capabilities:
-            bucket = self._by_capability.setdefault(cap, [])
-            bucket.append(manifest)
+    def replace(self, manifest: AgentManifest) -> AgentManifest | None:
+        """Hot-reload path: swap in a new version of a manifest, re-indexing it.
+
+        Returns the previous manifest, or None if the ID was not registered.
+        """
+        previous = self._unindex(manifest.id)
+        self._index(manifest)
+        return previous
+
+    def unregister(self, agent_id: str) -> AgentManifest | None:
+        """Remove a manifest and its index entries."""
+        if agent_id not in self._by_id:
+            return None
+        return self._unindex(agent_id)
+
+    def follow(self, source: Any) -> None:
+        """Mirror hot updates and removals from a ``core.registry`` registry."""
+        source.add_listener(self._on_source_update)
+        source.add_remove_listener(self.unregister)
+
+    def _on_source_update(self, actor: str, manifest: dict[str, Any]) -> None:
+        self.replace(AgentManifest.from_dict(manifest))
 
     def load_directory(self, path: Path) -> list[str]:
         """
@@ -49,7 +131,20 @@ class ManifestRegistry:
 
     def query(self, capability: str) -> list[AgentManifest]:
         """Return all agents that declare a given capability token."""
-        return list(self._by_capability.get(capability, []))
+        return list(self._by_capability.get(capability, {}).values())
+
+    def candidates(self, capabilities: Iterable[str]) -> set[str]:
+        """Return IDs of agents declaring at least one of ``capabilities``."""
+        out: set[str] = set()
+        for cap in capabilities:
+            bucket = self._by_capability.get(cap)
+            if bucket:
+                out.update(bucket)
+        return out
+
+    def profile(self, agent_id: str) -> ManifestProfile | None:
+        """Return the precomputed routing profile for an agent."""
+        return self._profiles.get(agent_id)
 
     def all(self) -> list[AgentManifest]:
         """Return all registered manifests."""
@@ -62,6 +157,8 @@ class ManifestRegistry:
     def clear(self) -> None:
         self._by_id.clear()
         self._by_capability.clear()
+        self._profiles.clear()
+        self.version += 1
 
     def list_ids(self) -> list[str]:
         """Return registered manifest IDs."""
@@ -75,3 +172,4 @@ class ManifestRegistry:
 
 
 REGISTRY = ManifestRegistry()
+REGISTRY.follow(v1_registry)
@@ -1,12 +1,26 @@
-﻿"""Manifest watcher with schema validation and hot-reload callbacks."""
+﻿"""Manifest watcher with schema validation and hot-reload callbacks.
+
+On Linux the watcher blocks on inotify events for the manifests directory,
+debounces bursts of writes and re-parses only the files that changed. When
+inotify is unavailable it falls back to polling file mtimes every
+``poll_seconds``. Each batch of valid manifests is handed to batch
+listeners in one call, so the registry can apply it atomically.
+"""
 from __future__ import annotations
 
+import ctypes
+import ctypes.util
 import json
 import logging
+import math
 import os
+import select
+import struct
 import subprocess
+import sys
 import threading
 import time
+from collections import deque
 from pathlib import Path
 from typing import Any, Callable
 
@@ -15,6 +29,66 @@ from core.registry import registry
 
 logger = logging.getLogger(__name__)
 
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+LATENCY_SAMPLES = 256
+
+
+class _Inotify:
+    """Minimal ctypes binding for one inotify watch on a directory."""
+
+    def __init__(self, directory: Path) -> None:
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is not available on this platform")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, str(directory).encode(), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+
+    def read(self, timeout: float) -> list[tuple[int, str]]:
+        """Return ``(mask, name)`` events, waiting at most ``timeout`` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0.0))
+        if not ready:
+            return []
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events: list[tuple[int, str]] = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buf):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset : offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            events.append((mask, name))
+        return events
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
 
 class ManifestWatcher:
     def __init__(
@@ -23,15 +97,28 @@ class ManifestWatcher:
         poll_seconds: float = 2.0,
         ci_status_path: str = "artifacts/manifest-validation-status.json",
         audit_logger: ManifestAuditLogger | None = None,
+        debounce_seconds: float = 0.2,
+        max_batch_seconds: float = 2.0,
+        use_inotify: bool = True,
     ) -> None:
         self._manifests_path = Path(manifests_path)
         self._poll_seconds = poll_seconds
         self._ci_status_path = ci_status_path
         self._audit = audit_logger or ManifestAuditLogger()
+        self._debounce_seconds = debounce_seconds
+        self._max_batch_seconds = max_batch_seconds
+        self._use_inotify = use_inotify
         self._listeners: list[Callable[[str, str, dict[str, Any]], None]] = []
+        self._batch_listeners: list[Callable[[list[tuple[str, dict[str, Any]]]], None]] = []
         self._mtimes: dict[str, float] = {}
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
+        self._mode = "stopped"
+        self._metrics_lock = threading.Lock()
+        self._latencies_ms: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._batches = 0
+        self._files_reloaded = 0
+        self._last_reload_ts: float | None = None
 
     def add_listener(self, callback: Callable[[str, str, dict[str, Any]], None]) -> None:
         self._listeners.append(callback)
@@ -40,11 +127,29 @@ class ManifestWatcher:
         if callback in self._listeners:
             self._listeners.remove(callback)
 
+    def add_batch_listener(
+        self, callback: Callable[[list[tuple[str, dict[str, Any]]]], None]
+    ) -> None:
+        """Register a callback receiving every valid ``(id, manifest)`` of a batch at once."""
+        self._batch_listeners.append(callback)
+
     def start(self) -> None:
         if self._thread is not None:
             return
         self._stop_event.clear()
-        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._manifests_path.mkdir(parents=True, exist_ok=True)
+        notifier: _Inotify | None = None
+        if self._use_inotify:
+            try:
+                notifier = _Inotify(self._manifests_path)
+            except OSError as exc:
+                logger.info("inotify unavailable (%s); polling %s", exc, self._manifests_path)
+        if notifier is not None:
+            self._mode = "inotify"
+            self._thread = threading.Thread(target=self._inotify_loop, args=(notifier,), daemon=True)
+        else:
+            self._mode = "poll"
+            self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
@@ -53,26 +158,63 @@ class ManifestWatcher:
         self._stop_event.set()
         self._thread.join(timeout=5)
         self._thread = None
+        self._mode = "stopped"
 
     def _loop(self) -> None:
         while not self._stop_event.is_set():
             self.poll_once()
             self._stop_event.wait(self._poll_seconds)
 
-    def _current_sha(self) -> str:
-        env_sha = os.getenv("GITHUB_SHA", "")
-        if env_sha:
-            return env_sha
+    def _inotify_loop(self, notifier: _Inotify) -> None:
         try:
-            result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return result.stdout.strip()
+            self.poll_once()
+            while not self._stop_event.is_set():
+                events = notifier.read(timeout=0.5)
+                if not events:
+                    continue
+                started = time.monotonic()
+                names: set[str] = set()
+                rescan = False
+                rewatch = False
+                # Debounce: keep draining until the directory is quiet for
+                # debounce_seconds, bounded by max_batch_seconds.
+                while events:
+                    for mask, name in events:
+                        if mask & _IN_IGNORED:
+                            rescan = rewatch = True
+                        elif mask & _IN_Q_OVERFLOW:
+                            rescan = True
+                        elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                            self._mtimes.pop(str(self._manifests_path / name), None)
+                        elif name.endswith(".json"):
+                            names.add(name)
+                    if time.monotonic() - started >= self._max_batch_seconds:
+                        break
+                    events = notifier.read(timeout=self._debounce_seconds)
+                if rewatch:
+                    # The watched directory was removed or replaced, so the
+                    # kernel dropped the watch; watch the new directory.
+                    notifier.close()
+                    try:
+                        self._manifests_path.mkdir(parents=True, exist_ok=True)
+                        notifier = _Inotify(self._manifests_path)
+                    except OSError as exc:
+                        logger.info("cannot re-watch %s (%s); polling", self._manifests_path, exc)
+                        self._mode = "poll"
+                        self._loop()
+                        return
+                if rescan:
+                    self.poll_once()
+                elif names:
+                    changed = self._changed([self._manifests_path / n for n in sorted(names)])
+                    if changed:
+                        self._reload(changed, started)
         except Exception:
-            return ""
+            logger.exception("inotify manifest watcher failed; falling back to polling")
+            self._mode = "poll"
+            self._loop()
+        finally:
+            notifier.close()
 
     def _maybe_post_pr_comment(self, filename: str, error: str, suggested_fix: str) -> None:
         if os.getenv("GITHUB_EVENT_NAME") != "pull_request":
@@ -95,17 +237,33 @@ class ManifestWatcher:
             logger.exception("failed to invoke PR failure commenter")
 
     def poll_once(self) -> None:
+        started = time.monotonic()
         self._manifests_path.mkdir(parents=True, exist_ok=True)
-        for file_path in sorted(self._manifests_path.glob("*.json")):
-            mtime = file_path.stat().st_mtime
-            key = str(file_path)
-            last_mtime = self._mtimes.get(key)
-            if last_mtime is not None and mtime <= last_mtime:
+        changed = self._changed(sorted(self._manifests_path.glob("*.json")))
+        if changed:
+            self._reload(changed, started)
+
+    def _changed(self, paths: list[Path]) -> list[Path]:
+        changed: list[Path] = []
+        for file_path in paths:
+            last_mtime = self._mtimes.get(str(file_path))
+            try:
+                mtime = file_path.stat().st_mtime
+            except FileNotFoundError:
                 continue
+            if last_mtime is None or mtime != last_mtime:
+                changed.append(file_path)
+        return changed
 
-            self._mtimes[key] = mtime
+    def _reload(self, paths: list[Path], started: float) -> None:
+        """Parse and validate ``paths``, then apply the valid ones as one batch."""
+        batch: list[tuple[str, dict[str, Any]]] = []
+        for file_path in paths:
             try:
+                self._mtimes[str(file_path)] = file_path.stat().st_mtime
                 manifest = json.loads(file_path.read_text(encoding="utf-8-sig"))
+            except FileNotFoundError:
+                continue
             except Exception as exc:
                 logger.error("manifest parse failed for %s: %s", file_path.name, exc)
                 self._maybe_post_pr_comment(file_path.name, str(exc), "Fix invalid JSON syntax.")
@@ -126,21 +284,32 @@ class ManifestWatcher:
                 )
                 self._maybe_post_pr_comment(file_path.name, errors[0], "Update fields to match schemas/agent-manifest.v1.json.")
                 continue
+            batch.append((manifest_id, manifest))
+
+        if not batch:
+            return
 
-            old_manifest = registry.get(manifest_id)
-            trace_id = f"manifest-watch-{int(time.time())}"
+        old_manifests = {manifest_id: registry.get(manifest_id) for manifest_id, _ in batch}
+        trace_id = f"manifest-watch-{int(time.time())}"
+        for batch_callback in list(self._batch_listeners):
+            try:
+                batch_callback(list(batch))
+            except Exception:
+                logger.exception("manifest watcher batch listener failed")
+        for manifest_id, manifest in batch:
             for callback in list(self._listeners):
                 try:
                     callback("manifest.updated", manifest_id, manifest)
                 except Exception:
                     logger.exception("manifest watcher listener failed")
 
+        for manifest_id, manifest in batch:
             applied_manifest = registry.get(manifest_id)
             outcome = "success" if applied_manifest == manifest else "failure"
             self._audit.log_manifest_update(
                 actor="watcher",
                 manifest_id=manifest_id,
-                old_value=old_manifest,
+                old_value=old_manifests[manifest_id],
                 new_value=manifest,
                 trace_id=trace_id,
                 outcome=outcome,
@@ -149,16 +318,48 @@ class ManifestWatcher:
             if outcome != "success":
                 logger.warning("manifest update event emitted but not applied for %s", manifest_id)
 
+        latency_ms = (time.monotonic() - started) * 1000.0
+        with self._metrics_lock:
+            self._latencies_ms.append(latency_ms)
+            self._batches += 1
+            self._files_reloaded += len(batch)
+            self._last_reload_ts = time.time()
+
+    def metrics(self) -> dict[str, Any]:
+        """Reload counters and latency (first change seen -> batch applied)."""
+        with self._metrics_lock:
+            last = self._latencies_ms[-1] if self._latencies_ms else None
+            latencies = sorted(self._latencies_ms)
+            batches = self._batches
+            files = self._files_reloaded
+            last_ts = self._last_reload_ts
+
+        def _pct(pct: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[max(0, math.ceil(pct / 100.0 * len(latencies)) - 1)]
+
+        return {
+            "mode": self._mode,
+            "batches": batches,
+            "files_reloaded": files,
+            "tracked_files": len(self._mtimes),
+            "last_reload_ts": last_ts,
+            "latency_ms": {
+                "last": last,
+                "p50": _pct(50.0),
+                "p95": _pct(95.0),
+                "max": latencies[-1] if latencies else None,
+            },
+        }
+
 
 def attach_registry_hot_reload(watcher: ManifestWatcher) -> None:
-    def _listener(event_name: str, manifest_id: str, manifest: dict[str, Any]) -> None:
-        if event_name != "manifest.updated":
-            return
-        registry.handle_manifest_updated(
-            manifest_id=manifest_id,
-            manifest=manifest,
+    def _listener(batch: list[tuple[str, dict[str, Any]]]) -> None:
+        registry.apply_batch(
+            batch,
             actor="watcher-listener",
             ci_status_path=watcher._ci_status_path,
         )
 
-    watcher.add_listener(_listener)
+    watcher.add_batch_listener(_listener)
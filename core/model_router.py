@@ -19,6 +19,8 @@ import urllib.error
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from core.provider_health import get_provider_health
+
 try:
     from core.otel_tracing import trace_llm_call
 except ImportError:
@@ -71,6 +73,35 @@ def _get_api_key(provider_cfg: Dict[str, Any]) -> Optional[str]:
     return os.environ.get(env_name) if env_name else None
 
 
+def _ollama_endpoint(cfg: Optional[Dict[str, Any]] = None) -> str:
+    cfg = get_model_config() if cfg is None else cfg
+    return cfg.get("ollama", {}).get("endpoint", "http://localhost:11434")
+
+
+def _ollama_probe() -> bool:
+    """Liveness check for Ollama; re-reads the endpoint so config edits apply."""
+    url = _ollama_endpoint().rstrip("/") + "/api/version"
+    with urllib.request.urlopen(urllib.request.Request(url, method="GET"), timeout=2):
+        return True
+
+
+def provider_health():
+    """The shared health tracker, with the Ollama probe registered."""
+    health = get_provider_health()
+    health.register_probe("ollama", _ollama_probe)
+    return health
+
+
+def provider_available(provider: str) -> bool:
+    """Cached health check used to route around a down provider.
+
+    Never blocks after the first probe of a provider: the probe result is
+    cached and refreshed in the background, and an open circuit answers
+    False immediately.
+    """
+    return provider_health().is_available(provider.lower())
+
+
 # â”€â”€ Normalised response â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 
 
@@ -497,6 +528,33 @@ def call(
     if not mdl:
         return _err_response(f"No model configured for provider '{prov}'", prov, "", 0)
 
+    health = provider_health()
+    if not health.allow(prov):
+        return _err_response(
+            f"Provider '{prov}' circuit open; skipping call", prov, mdl, 0
+        )
+    result = _dispatch(
+        prov, prov_cfg, messages, system, mdl, api_key, tout, mtok, tools, grounding
+    )
+    if result.get("ok"):
+        health.record_success(prov)
+    elif prov in ("anthropic", "openai", "ollama", "gemini"):
+        health.record_failure(prov, result.get("error"))
+    return result
+
+
+def _dispatch(
+    prov: str,
+    prov_cfg: Dict[str, Any],
+    messages: List[Dict[str, str]],
+    system: str,
+    mdl: str,
+    api_key: Optional[str],
+    tout: int,
+    mtok: int,
+    tools: Optional[List[Dict]],
+    grounding: Optional[bool],
+) -> Dict[str, Any]:
     if prov == "anthropic":
         return _call_anthropic(messages, system, mdl, api_key, tout, mtok)
     elif prov == "openai":
@@ -547,6 +605,7 @@ def get_status() -> Dict[str, Any]:
     prov_cfg = cfg.get(prov, {})
     mdl = prov_cfg.get("model", "")
     has_key = bool(_get_api_key(prov_cfg))
+    health = get_provider_health()
 
     return {
         "offlineMode": is_offline(),
@@ -555,4 +614,6 @@ def get_status() -> Dict[str, Any]:
         "apiKeySet": has_key,
         "lastCallTimestamp": _last_call_timestamp,
         "lastError": _last_call_error,
+        "breaker": health.state(prov.lower()),
+        "providers": health.states(),
     }
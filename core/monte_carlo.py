@@ -0,0 +1,177 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Batched Monte Carlo engine for what-if scoring.
+
+A simulation is a *kernel* ``kernel(params, n, rng) -> ndarray`` that draws
+``n`` trajectories (rows) with NumPy.  ``run_batches`` splits the requested
+trials into batches, gives each batch its own child of one
+``SeedSequence`` and runs them inline or across a shared process pool.
+Because seeds are tied to batches rather than workers, a given
+``(seed, trials, batch_size)`` produces the same draws whatever the
+worker count.
+
+``simulate_strategies`` is the strategy kernel used by the counterfactual
+engine: it bootstraps each candidate strategy's recent scores and reports
+confidence intervals for the selected strategy's projected score and for
+regret against the best alternative.
+"""
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+DEFAULT_TRIALS = 2000
+DEFAULT_BATCH_SIZE = 1000
+CI_LEVEL = 0.95
+
+Seed = Union[int, Sequence[int], None]
+Kernel = Callable[[Any, int, np.random.Generator], np.ndarray]
+
+
+def seed_sequence(seed: Seed) -> np.random.SeedSequence:
+    """A SeedSequence for ``seed``; fresh OS entropy when it is None."""
+    return np.random.SeedSequence(seed)
+
+
+def interval(values: np.ndarray, level: float = CI_LEVEL) -> Dict[str, float]:
+    """Mean and central ``level`` percentile interval of ``values``."""
+    if values.size == 0:
+        return {"mean": 0.0, "low": 0.0, "high": 0.0}
+    tail = (1.0 - level) / 2.0
+    low, high = np.quantile(values, [tail, 1.0 - tail])
+    return {
+        "mean": round(float(values.mean()), 4),
+        "low": round(float(low), 4),
+        "high": round(float(high), 4),
+    }
+
+
+# ---------- Process pool ----------
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared pool of ``workers`` processes, recreated if the size changes.
+
+    Workers are spawned rather than forked: the server process runs
+    background threads, and forking those is unsafe.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool, _pool_workers = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+def _run_job(job) -> np.ndarray:
+    kernel, params, n, seq = job
+    return kernel(params, n, np.random.default_rng(seq))
+
+
+def run_batches(
+    kernel: Kernel,
+    params: Any,
+    trials: int,
+    seed: Union[Seed, np.random.SeedSequence] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 0,
+) -> np.ndarray:
+    """Draw ``trials`` rows from ``kernel`` in seeded batches.
+
+    ``kernel`` and ``params`` must be picklable (a module-level function and
+    plain data) when ``workers > 1``.
+    """
+    root = seed if isinstance(seed, np.random.SeedSequence) else seed_sequence(seed)
+    batch_size = max(1, batch_size)
+    sizes = [min(batch_size, trials - start) for start in range(0, trials, batch_size)]
+    jobs = [
+        (kernel, params, n, child) for n, child in zip(sizes, root.spawn(len(sizes)))
+    ]
+    if workers > 1 and len(jobs) > 1:
+        results = list(get_pool(workers).map(_run_job, jobs))
+    else:
+        results = [_run_job(job) for job in jobs]
+    return np.concatenate(results) if results else np.empty((0,))
+
+
+# ---------- Strategy outcomes ----------
+def strategy_kernel(params, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Bootstrap ``n`` joint outcomes, one column per strategy."""
+    padded, lengths, shift = params
+    picks = (rng.random((n, len(lengths))) * lengths).astype(np.int64)
+    return padded[np.arange(len(lengths)), picks] + shift
+
+
+def simulate_strategies(
+    samples: Mapping[str, Sequence[float]],
+    selected: str,
+    actual: Optional[float] = None,
+    shift: float = 0.0,
+    trials: int = DEFAULT_TRIALS,
+    seed: Seed = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 0,
+) -> Dict[str, Any]:
+    """Monte Carlo projection of ``selected`` against its alternatives.
+
+    ``samples`` maps each candidate strategy to its empirical scores (a
+    strategy with no history should pass its point estimate).  Regret is
+    measured against ``actual`` when given, otherwise against the
+    selected strategy's own sampled score.
+    """
+    names: List[str] = list(samples)
+    if selected not in samples:
+        names.append(selected)
+    rows = [np.asarray(samples.get(name) or [0.0], dtype=np.float64) for name in names]
+    lengths = np.array([len(r) for r in rows], dtype=np.float64)
+    padded = np.zeros((len(rows), int(lengths.max())))
+    for i, r in enumerate(rows):
+        padded[i, : len(r)] = r
+
+    root = seed_sequence(seed)
+    outcomes = run_batches(
+        strategy_kernel, (padded, lengths, shift), trials, root, batch_size, workers
+    )
+    sel = names.index(selected)
+    projected = outcomes[:, sel]
+    others = np.delete(outcomes, sel, axis=1)
+    reference = projected if actual is None else actual
+    if others.shape[1]:
+        regret = np.maximum(0.0, others.max(axis=1) - reference)
+    else:
+        regret = np.zeros(len(outcomes))
+    best = np.bincount(outcomes.argmax(axis=1), minlength=len(names))
+    return {
+        "trials": int(len(outcomes)),
+        "seed": root.entropy,
+        "projected_score": interval(projected),
+        "regret": interval(regret),
+        "p_best": {
+            name: round(float(count) / max(len(outcomes), 1), 4)
+            for name, count in zip(names, best)
+        },
+    }
@@ -2,13 +2,33 @@
 # Commercial use, hosting, and resale prohibited.
 # See LICENSE file for details.
 import json
+from collections import Counter, deque
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Deque, Dict, List, Tuple
+
+from core.sequence_miner import SequenceMiner, follow_jsonl
+
+_OUTCOMES = {
+    "failure_clusters": lambda e: e.get("success_rate_recent", 0.0) < 0.25,
+    "abandoned": lambda e: e.get("divergence_score", 0.0) > 0.5,
+    "slowdowns": lambda e: e.get("work_intensity", 0.0) > 8000,
+    "recoveries": lambda e: (
+        e.get("success_rate_recent", 0.0) > 0.6 and e.get("entropy_level", 0.0) < 0.4
+    ),
+    "bursts": lambda e: (
+        e.get("success_rate_recent", 0.0) > 0.7 and e.get("entropy_level", 0.0) > 0.4
+    ),
+}
 
 
 class PhaseEngine:
-    """Detect temporal phase transitions and suggest preemptive actions."""
+    """Detect temporal phase transitions and suggest preemptive actions.
+
+    Phase history is followed by byte offset: each outcome folds only the
+    newly appended rows into per-label window counts and a streaming
+    ``SequenceMiner`` over context clusters, instead of rescanning the log.
+    """
 
     def __init__(
         self,
@@ -31,6 +51,16 @@ class PhaseEngine:
         self.entropy = entropy
         self.trajectory = trajectory
         self._sequence_window = 6
+        self._history_limit = 120
+        self._history_offset = 0
+        self._seen = 0
+        self._last_hit: Dict[str, int] = {}
+        # (labels whose window covers the entry, cluster ids of that window)
+        self._windows: Deque[Tuple[frozenset, List[str]]] = deque()
+        self._label_counts: Counter = Counter()
+        self._label_recent: Dict[str, Tuple[int, List[str]]] = {}
+        self._clusters: Deque[str] = deque(maxlen=self._sequence_window)
+        self.miner = SequenceMiner(max_len=self._sequence_window)
 
     # ---------- Hooks ----------
     def after_outcome(
@@ -125,49 +155,72 @@ class PhaseEngine:
         return "steady"
 
     def _detect_patterns(self) -> Dict[str, Any]:
-        seqs = self._load_sequences()
+        self._sync_history()
         patterns: Dict[str, Any] = {}
-        for label, windows in seqs.items():
+        oldest = self._seen - len(self._windows)
+        for label in _OUTCOMES:
+            count = self._label_counts[label]
+            at, recent = self._label_recent.get(label, (-1, []))
             patterns[label] = {
-                "count": len(windows),
-                "confidence": round(min(1.0, len(windows) / 10.0), 3),
-                "recent": windows[-1] if windows else [],
+                "count": count,
+                "confidence": round(min(1.0, count / 10.0), 3),
+                "recent": recent if at >= oldest else [],
             }
         self.patterns_file.write_text(json.dumps(patterns, indent=2))
         return patterns
 
-    def _load_sequences(self) -> Dict[str, List[List[str]]]:
-        entries = self._tail_jsonl(self.history_file, 120)
-        labels: Dict[str, List[List[str]]] = {
-            "failure_clusters": [],
-            "abandoned": [],
-            "slowdowns": [],
-            "recoveries": [],
-            "bursts": [],
-        }
-        outcomes = {
-            "failure_clusters": lambda e: e.get("success_rate_recent", 0.0) < 0.25,
-            "abandoned": lambda e: e.get("divergence_score", 0.0) > 0.5,
-            "slowdowns": lambda e: e.get("work_intensity", 0.0) > 8000,
-            "recoveries": lambda e: (
-                e.get("success_rate_recent", 0.0) > 0.6
-                and e.get("entropy_level", 0.0) < 0.4
-            ),
-            "bursts": lambda e: (
-                e.get("success_rate_recent", 0.0) > 0.7
-                and e.get("entropy_level", 0.0) > 0.4
-            ),
-        }
-        for i in range(len(entries)):
-            window = entries[max(0, i - self._sequence_window + 1) : i + 1]
-            labels_for_window = []
-            for name, fn in outcomes.items():
-                if any(fn(e) for e in window):
-                    labels_for_window.append(name)
-            cluster_ids = [e.get("context_cluster_id") for e in window]
-            for name in labels_for_window:
-                labels[name].append(cluster_ids)
-        return labels
+    def _sync_history(self) -> None:
+        """Fold phase history rows appended since the last call."""
+        rows, offset = follow_jsonl(self.history_file, self._history_offset)
+        if offset is None:
+            self._reset_history()
+            rows, offset = follow_jsonl(self.history_file, 0)
+        self._history_offset = offset
+        for row in rows:
+            self._fold_entry(row)
+
+    def _reset_history(self) -> None:
+        self._history_offset = 0
+        self._seen = 0
+        self._last_hit.clear()
+        self._windows.clear()
+        self._label_counts.clear()
+        self._label_recent.clear()
+        self._clusters.clear()
+        self.miner.reset()
+
+    def _fold_entry(self, entry: Dict[str, Any]) -> None:
+        idx = self._seen
+        self._seen += 1
+        for name, fn in _OUTCOMES.items():
+            if fn(entry):
+                self._last_hit[name] = idx
+        cluster = str(entry.get("context_cluster_id"))
+        self._clusters.append(cluster)
+        self.miner.add(cluster)
+        labels = frozenset(
+            name
+            for name, hit in self._last_hit.items()
+            if idx - hit < self._sequence_window
+        )
+        window = list(self._clusters)
+        if len(self._windows) == self._history_limit:
+            expired, _ = self._windows.popleft()
+            self._label_counts.subtract(expired)
+        self._windows.append((labels, window))
+        self._label_counts.update(labels)
+        for name in labels:
+            self._label_recent[name] = (idx, window)
+
+    def top_chains(self, k: int = 10) -> List[Dict[str, Any]]:
+        """Most frequent context-cluster chains in the phase history."""
+        self._sync_history()
+        return self.miner.top_k(k)
+
+    def predict_next_cluster(self, k: int = 3) -> List[Dict[str, Any]]:
+        """Probable next context clusters given the most recent ones."""
+        self._sync_history()
+        return self.miner.predict_next(self._clusters, k=k)
 
     def _maybe_preempt(self, patterns: Dict[str, Any], current: Dict[str, Any]) -> None:
         for label, info in patterns.items():
@@ -234,10 +287,13 @@ class PhaseEngine:
                 pass
         probable_next = self._probable_next(patterns)
         stance = self._stance(probable_next)
+        next_clusters = self.miner.predict_next(self._clusters, k=1)
         lines = [
             f"Phase Report @ {current.get('timestamp')}",
             f"current_phase: {current.get('context_cluster_id')}",
             f"probable_next_phase: {probable_next}",
+            "probable_next_cluster: "
+            + (next_clusters[0]["event"] if next_clusters else "unknown"),
             f"recommended_stance: {stance}",
         ]
         self.report_file.write_text("\n".join(lines))
@@ -262,16 +318,3 @@ class PhaseEngine:
     def _append_jsonl(self, file_path: Path, row: Dict[str, Any]) -> None:
         with open(file_path, "a", encoding="utf-8") as f:
             f.write(json.dumps(row, separators=(",", ":")) + "\n")
-
-    def _tail_jsonl(self, file_path: Path, limit: int) -> List[Dict[str, Any]]:
-        if not file_path.exists():
-            return []
-        rows: List[Dict[str, Any]] = []
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        rows.append(json.loads(line))
-                    except Exception:
-                        continue
-        return rows[-limit:]
@@ -0,0 +1,274 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Shared provider health tracker for the model router and companion.
+
+Each provider has a health entry fed from two sources: background probes
+(for providers with a cheap liveness endpoint, e.g. Ollama's
+``/api/version``) and the outcome of real model calls.  The tracker
+
+- caches the last probe result for ``ttl_sec``; a daemon thread refreshes
+  it, so the chat path only pays for a probe the very first time a
+  provider is used;
+- counts consecutive failures and opens a circuit breaker after
+  ``failure_threshold`` of them.  While open, ``allow`` returns False and
+  callers go straight to their fallback;
+- retries an open provider after an exponential backoff
+  (``base_backoff_sec`` doubling up to ``max_backoff_sec``).  The retry is
+  a background probe when one is registered, otherwise a single trial
+  call (half-open); success closes the circuit, failure re-opens it with
+  a longer backoff.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_TTL_SEC = 30.0
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BASE_BACKOFF_SEC = 1.0
+DEFAULT_MAX_BACKOFF_SEC = 60.0
+DEFAULT_TICK_SEC = 0.5
+
+Probe = Callable[[], bool]
+
+
+@dataclass
+class _Entry:
+    probe: Optional[Probe] = None
+    healthy: Optional[bool] = None
+    checked_at: Optional[float] = None
+    state: str = CLOSED
+    failures: int = 0
+    opened_at: Optional[float] = None
+    retry_at: float = 0.0
+    backoff_sec: float = 0.0
+    last_error: Optional[str] = None
+    probes: int = 0
+    short_circuited: int = 0
+
+
+class ProviderHealth:
+    """Per-provider health cache with a circuit breaker."""
+
+    def __init__(
+        self,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        base_backoff_sec: float = DEFAULT_BASE_BACKOFF_SEC,
+        max_backoff_sec: float = DEFAULT_MAX_BACKOFF_SEC,
+        tick_sec: float = DEFAULT_TICK_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_sec = ttl_sec
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff_sec = base_backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+        self.tick_sec = tick_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        self._probe_locks: dict[str, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _entry(self, provider: str) -> _Entry:
+        entry = self._entries.get(provider)
+        if entry is None:
+            entry = self._entries[provider] = _Entry()
+            self._probe_locks[provider] = threading.Lock()
+        return entry
+
+    def register_probe(self, provider: str, probe: Probe) -> None:
+        """Set (or replace) the liveness check used for ``provider``."""
+        with self._lock:
+            self._entry(provider).probe = probe
+
+    # -- outcomes ----------------------------------------------------------
+
+    def record_success(self, provider: str) -> None:
+        with self._lock:
+            entry = self._entry(provider)
+            entry.healthy = True
+            entry.checked_at = self._clock()
+            entry.state = CLOSED
+            entry.failures = 0
+            entry.opened_at = None
+            entry.backoff_sec = 0.0
+            entry.last_error = None
+
+    def record_failure(self, provider: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            entry = self._entry(provider)
+            now = self._clock()
+            entry.healthy = False
+            entry.checked_at = now
+            entry.failures += 1
+            entry.last_error = (error or "failed")[:200]
+            if entry.state == HALF_OPEN or entry.failures >= self.failure_threshold:
+                if entry.state != OPEN:
+                    entry.opened_at = now
+                entry.state = OPEN
+                exponent = max(0, entry.failures - self.failure_threshold)
+                entry.backoff_sec = min(
+                    self.max_backoff_sec, self.base_backoff_sec * (2**exponent)
+                )
+                entry.retry_at = now + entry.backoff_sec
+
+    # -- probing -----------------------------------------------------------
+
+    def probe(self, provider: str) -> Optional[bool]:
+        """Run the registered probe now; None when there is none.
+
+        Concurrent callers for the same provider share one probe.
+        """
+        with self._lock:
+            entry = self._entry(provider)
+            probe, lock = entry.probe, self._probe_locks[provider]
+        if probe is None:
+            return None
+        if not lock.acquire(blocking=False):
+            with lock:
+                return self._entries[provider].healthy
+        try:
+            try:
+                ok = bool(probe())
+                error = None if ok else "probe returned unhealthy"
+            except Exception as exc:
+                ok, error = False, str(exc)
+            with self._lock:
+                entry.probes += 1
+            if ok:
+                self.record_success(provider)
+            else:
+                self.record_failure(provider, error)
+            return ok
+        finally:
+            lock.release()
+
+    def _probe_due(self, entry: _Entry, now: float) -> bool:
+        if entry.probe is None or entry.checked_at is None:
+            return False
+        if entry.state == OPEN:
+            return now >= entry.retry_at
+        if not entry.healthy:
+            # Unhealthy but below the threshold: retry on the same backoff.
+            return now - entry.checked_at >= self.base_backoff_sec
+        return now - entry.checked_at >= self.ttl_sec
+
+    def probe_due(self) -> int:
+        """Probe every provider whose cached state expired; return the count."""
+        now = self._clock()
+        with self._lock:
+            due = [p for p, e in self._entries.items() if self._probe_due(e, now)]
+        for provider in due:
+            self.probe(provider)
+        return len(due)
+
+    # -- routing -----------------------------------------------------------
+
+    def allow(self, provider: str) -> bool:
+        """Whether a real call to ``provider`` should be attempted now."""
+        with self._lock:
+            entry = self._entry(provider)
+            if entry.state == CLOSED:
+                return True
+            if (
+                entry.state == OPEN
+                and entry.probe is None
+                and self._clock() >= entry.retry_at
+            ):
+                entry.state = HALF_OPEN  # let exactly one trial call through
+                return True
+            entry.short_circuited += 1
+            return False
+
+    def is_available(self, provider: str) -> bool:
+        """Cached health for routing; probes synchronously only on first use."""
+        with self._lock:
+            entry = self._entry(provider)
+            unknown = entry.probe is not None and entry.checked_at is None
+        if unknown:
+            self.probe(provider)
+        self.ensure_running()
+        with self._lock:
+            entry = self._entries[provider]
+            if entry.state == CLOSED:
+                return entry.probe is None or bool(entry.healthy)
+            # Without a probe, an expired backoff means ``allow`` will admit
+            # the trial call; it is not consumed here.
+            if entry.state == OPEN and entry.probe is None and self._clock() >= entry.retry_at:
+                return True
+            entry.short_circuited += 1
+            return False
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def ensure_running(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="swarmz-provider-health", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.tick_sec):
+            try:
+                self.probe_due()
+            except Exception:
+                pass
+
+    def state(self, provider: str) -> dict[str, Any]:
+        with self._lock:
+            entry = self._entry(provider)
+            now = self._clock()
+            return {
+                "state": entry.state,
+                "healthy": entry.healthy,
+                "consecutiveFailures": entry.failures,
+                "checkedAgoSec": (
+                    None if entry.checked_at is None else round(now - entry.checked_at, 3)
+                ),
+                "retryInSec": (
+                    round(max(0.0, entry.retry_at - now), 3)
+                    if entry.state == OPEN
+                    else None
+                ),
+                "backoffSec": entry.backoff_sec,
+                "probed": entry.probe is not None,
+                "probes": entry.probes,
+                "shortCircuited": entry.short_circuited,
+                "lastError": entry.last_error,
+            }
+
+    def states(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            names = list(self._entries)
+        return {name: self.state(name) for name in names}
+
+
+_health: Optional[ProviderHealth] = None
+_health_lock = threading.Lock()
+
+
+def get_provider_health() -> ProviderHealth:
+    global _health
+    if _health is None:
+        with _health_lock:
+            if _health is None:
+                _health = ProviderHealth()
+    return _health
@@ -24,6 +24,7 @@ class ManifestRegistry:
         self._by_capability: dict[str, list[str]] = {}
         self._source_files: dict[str, str] = {}
         self._listeners: list[Callable[[str, dict[str, Any]], None]] = []
+        self._remove_listeners: list[Callable[[str], None]] = []
 
     def validate_manifest(self, manifest: dict[str, Any], source: str = "<memory>") -> list[str]:
         errors = sorted(self._validator.iter_errors(manifest), key=lambda err: err.json_path)
@@ -71,6 +72,11 @@ class ManifestRegistry:
             if callback in self._listeners:
                 self._listeners.remove(callback)
 
+    def add_remove_listener(self, callback: Callable[[str], None]) -> None:
+        """Call ``callback(manifest_id)`` whenever a manifest is removed."""
+        with self._lock:
+            self._remove_listeners.append(callback)
+
     def get(self, manifest_id: str) -> dict[str, Any] | None:
         with self._lock:
             if manifest_id in self._by_id:
@@ -105,7 +111,13 @@ class ManifestRegistry:
             del self._by_id[manifest_id]
             self._source_files.pop(manifest_id, None)
             self._reindex_locked()
-            return True
+            listeners = list(self._remove_listeners)
+        for callback in listeners:
+            try:
+                callback(manifest_id)
+            except Exception:
+                continue
+        return True
 
     def clear(self) -> None:
         with self._lock:
@@ -154,6 +166,29 @@ class ManifestRegistry:
             return False
         return True
 
+    def _check_update(self, manifest_id: str, manifest: dict[str, Any]) -> str | None:
+        """Reason ``manifest`` cannot replace ``manifest_id``, or None if it can."""
+        if str(manifest.get("id", "")) != manifest_id:
+            return "manifest_id mismatch"
+        errors = self.validate_manifest(manifest, source=f"update:{manifest_id}")
+        if errors:
+            return "validation_failed: " + "; ".join(errors)
+        return None
+
+    def _swap_in(self, accepted: list[tuple[str, dict[str, Any]]], actor: str) -> None:
+        """Install ``accepted`` under one lock and one reindex, then notify."""
+        with self._lock:
+            for manifest_id, manifest in accepted:
+                self._by_id[manifest_id] = copy.deepcopy(manifest)
+            self._reindex_locked()
+            listeners = list(self._listeners)
+        for _, manifest in accepted:
+            for callback in listeners:
+                try:
+                    callback(actor, copy.deepcopy(manifest))
+                except Exception:
+                    continue
+
     def apply_update(
         self,
         manifest_id: str,
@@ -162,28 +197,46 @@ class ManifestRegistry:
         ci_status_path: str = "artifacts/manifest-validation-status.json",
         enforce_ci_gate: bool = True,
     ) -> tuple[bool, str]:
-        if str(manifest.get("id", "")) != manifest_id:
-            return False, "manifest_id mismatch"
+        return self.apply_batch(
+            [(manifest_id, manifest)],
+            actor=actor,
+            ci_status_path=ci_status_path,
+            enforce_ci_gate=enforce_ci_gate,
+        )[manifest_id]
 
-        errors = self.validate_manifest(manifest, source=f"update:{manifest_id}")
-        if errors:
-            return False, "validation_failed: " + "; ".join(errors)
+    def apply_batch(
+        self,
+        updates: list[tuple[str, dict[str, Any]]],
+        actor: str = "watcher",
+        ci_status_path: str = "artifacts/manifest-validation-status.json",
+        enforce_ci_gate: bool = True,
+    ) -> dict[str, tuple[bool, str]]:
+        """Apply several manifest updates under one lock and one reindex.
+
+        Each update is validated on its own; every valid update is then
+        swapped in together so readers never observe half of a batch. The
+        CI gate is evaluated once for the whole batch.
+        """
+        results: dict[str, tuple[bool, str]] = {}
+        accepted: list[tuple[str, dict[str, Any]]] = []
+        for manifest_id, manifest in updates:
+            reason = self._check_update(manifest_id, manifest)
+            if reason is not None:
+                results[manifest_id] = (False, reason)
+            else:
+                accepted.append((manifest_id, manifest))
+        if not accepted:
+            return results
 
         if enforce_ci_gate and not self._ci_gate_allows(ci_status_path):
-            return False, "ci_gate_blocked"
-
-        with self._lock:
-            self._by_id[manifest_id] = copy.deepcopy(manifest)
-            self._reindex_locked()
-            listeners = list(self._listeners)
-
-        for callback in listeners:
-            try:
-                callback(actor, copy.deepcopy(manifest))
-            except Exception:
-                continue
-
-        return True, "applied"
+            for manifest_id, _ in accepted:
+                results[manifest_id] = (False, "ci_gate_blocked")
+            return results
+
+        self._swap_in(accepted, actor)
+        for manifest_id, _ in accepted:
+            results[manifest_id] = (True, "applied")
+        return results
 
     def handle_manifest_updated(
         self,
@@ -1,13 +1,52 @@
 # SWARMZ Source Available License
 # Commercial use, hosting, and resale prohibited.
 # See LICENSE file for details.
-import json
+"""Relevance engine: usefulness scoring over tiered mission memory.
+
+Tiers live under ``data/memory``:
+
+- hot: ``hot/hot.jsonl`` (an ``IndexedLog``) with its newest rows held in
+  memory for attention bundles;
+- warm: ``warm/warm.jsonl``, an ``IndexedLog``;
+- cold: ``cold/cold.blocks``, a ``BlockStore`` of compressed blocks.  A
+  legacy ``cold.jsonl.gz`` is imported once and renamed ``.migrated``;
+- archive: ``archive/archive.jsonl``, hash and timestamp only.
+
+Scoring inputs are sliding windows maintained incrementally: the last 50
+counterfactual entries (followed by byte offset) and the last 200
+evolution records, each with per-``(inputs_hash, strategy)`` sums, so an
+outcome costs the same however large the logs grow.
+"""
 import gzip
+import json
+import os
+from collections import Counter, deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from core.relevance_store import BlockStore, IndexedLog
+from core.sequence_miner import follow_jsonl
+from swarmz_runtime.storage.jsonl_pages import read_backward
 
 USEFULNESS_DECAY = 0.995
+HOT_CAPACITY = 200
+CF_WINDOW = 50
+HISTORY_WINDOW = 200
+
+Key = Tuple[Any, Any]
+
+
+def _end_of_last_line(path: Path) -> int:
+    """Byte offset just past the last complete line of ``path``."""
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            start = max(0, size - 64 * 1024)
+            f.seek(start)
+            return start + f.read().rfind(b"\n") + 1
+    except OSError:
+        return 0
 
 
 class RelevanceEngine:
@@ -28,14 +67,34 @@ class RelevanceEngine:
             self.archive_dir,
         ]:
             d.mkdir(parents=True, exist_ok=True)
-        # Make hot.jsonl deterministic and parallel-safe:
-        (self.hot_dir / "hot.jsonl").touch(exist_ok=True)
         self.lessons_file = self.data_dir / "lessons.jsonl"
         self.cognitive_file = self.data_dir / "cognitive_load.txt"
+        self.stats_file = self.mem_dir / "usefulness_stats.json"
+        self.cf_file = self.data_dir / "counterfactual_log.jsonl"
         self.evolution = evolution
         self.counterfactual = counterfactual
         self._counter = 0
 
+        self.hot = IndexedLog(self.hot_dir / "hot.jsonl")
+        self.warm = IndexedLog(self.warm_dir / "warm.jsonl")
+        self.cold = BlockStore(self.cold_dir / "cold.blocks")
+        self._migrate_legacy_cold()
+        self._hot_rows: Deque[Dict[str, Any]] = deque(
+            self.hot.tail(HOT_CAPACITY), maxlen=HOT_CAPACITY
+        )
+
+        # Counterfactual window: (key, |delta|, regret) with per-key sums.
+        self._cf_rows: Deque[Tuple[Key, float, float]] = deque()
+        self._cf_stats: Dict[Key, List[Any]] = {}
+        self._cf_offset: Optional[int] = None
+        # Evolution window: (key, score) with per-key hit counts.
+        self._hist_rows: Deque[Tuple[Key, float]] = deque()
+        self._hist_hits: Counter = Counter()
+        self._hist_signals = 0
+        self._hist_seen: Optional[int] = None
+
+        self._usefulness: Dict[str, Dict[str, Dict[str, Any]]] = self._load_stats()
+
     # ---------- Public hooks ----------
     def after_outcome(
         self,
@@ -60,6 +119,7 @@ class RelevanceEngine:
             "tier": tier,
         }
         self._persist_record(record, tier)
+        self._track_usefulness(inputs_hash, strategy, usefulness, tier)
         self._counter += 1
         if self._counter % 10 == 0:
             self._rebalance()
@@ -67,10 +127,17 @@ class RelevanceEngine:
             self._emit_cognitive_load()
 
     def get_attention_bundle(self, limit: int = 20) -> Dict[str, Any]:
-        hot = self._tail_jsonl_dir(self.hot_dir, limit)
+        hot = list(self._hot_rows)[-limit:] if limit > 0 else []
         lessons = self._tail_jsonl(self.lessons_file, 20)
         return {"hot": hot, "lessons": lessons}
 
+    def usefulness_stats(self, inputs_hash: str, strategy: str) -> Dict[str, Any]:
+        """Running usefulness stats for one situation/strategy pair."""
+        return dict(self._usefulness.get(inputs_hash, {}).get(strategy, {}))
+
+    def tier_sizes(self) -> Dict[str, int]:
+        return {"hot": len(self.hot), "warm": len(self.warm), "cold": len(self.cold)}
+
     # ---------- Scoring & tiering ----------
     def _compute_usefulness(
         self, inputs_hash: str, strategy: str, score: float, success: bool
@@ -79,33 +146,80 @@ class RelevanceEngine:
         accuracy = 0.0
         regret = 0.0
         if self.counterfactual:
-            cf_tail = self._tail_jsonl(self.data_dir / "counterfactual_log.jsonl", 50)
-            matching = [
-                e
-                for e in cf_tail
-                if e.get("inputs_hash") == inputs_hash
-                and e.get("selected_strategy") == strategy
-            ]
+            self._sync_counterfactual()
+            matching = self._cf_stats.get((inputs_hash, strategy))
             if matching:
-                deltas = [
-                    abs(e.get("predicted_vs_actual_delta", 0.0)) for e in matching
-                ]
-                accuracy = max(0.0, 1.0 - (sum(deltas) / max(len(deltas), 1)))
-                regret = max(e.get("regret_score", 0.0) for e in matching)
+                count, delta_sum, regrets = matching
+                accuracy = max(0.0, 1.0 - delta_sum / count)
+                regret = max(regrets)
         freq = self._recurrence(inputs_hash, strategy)
-        age_penalty = USEFULNESS_DECAY ** max(len(self.evolution._history_cache), 1)
+        age_penalty = USEFULNESS_DECAY ** max(self.evolution.record_count, 1)
         base = impact + accuracy + freq - regret
         return round(max(0.0, base) * age_penalty, 4)
 
     def _recurrence(self, inputs_hash: str, strategy: str) -> float:
-        hist = self.evolution.history_tail(limit=200)
-        hits = sum(
-            1
-            for h in hist
-            if h.get("inputs_hash") == inputs_hash
-            and h.get("strategy_used") == strategy
-        )
-        return min(1.0, hits / 20.0)
+        self._sync_history()
+        return min(1.0, self._hist_hits[(inputs_hash, strategy)] / 20.0)
+
+    # ---------- Sliding windows ----------
+    def _push_cf(self, row: Dict[str, Any]) -> None:
+        key = (row.get("inputs_hash"), row.get("selected_strategy"))
+        delta = abs(row.get("predicted_vs_actual_delta", 0.0))
+        regret = row.get("regret_score", 0.0)
+        self._cf_rows.append((key, delta, regret))
+        stats = self._cf_stats.setdefault(key, [0, 0.0, deque()])
+        stats[0] += 1
+        stats[1] += delta
+        stats[2].append(regret)
+        if len(self._cf_rows) > CF_WINDOW:
+            old_key, old_delta, _ = self._cf_rows.popleft()
+            old = self._cf_stats[old_key]
+            old[0] -= 1
+            old[1] -= old_delta
+            old[2].popleft()
+            if not old[0]:
+                del self._cf_stats[old_key]
+
+    def _sync_counterfactual(self) -> None:
+        if self._cf_offset is not None:
+            rows, offset = follow_jsonl(self.cf_file, self._cf_offset)
+            if offset is not None:
+                self._cf_offset = offset
+                for row in rows:
+                    self._push_cf(row)
+                return
+        # First use, or the log was rewritten: seed from its tail.
+        self._cf_rows.clear()
+        self._cf_stats.clear()
+        self._cf_offset = _end_of_last_line(self.cf_file)
+        for row in self._tail_jsonl(self.cf_file, CF_WINDOW):
+            self._push_cf(row)
+
+    def _push_history(self, row: Dict[str, Any]) -> None:
+        key = (row.get("inputs_hash"), row.get("strategy_used"))
+        signal = row.get("score", 0.0) >= 0.5
+        self._hist_rows.append((key, signal))
+        self._hist_hits[key] += 1
+        self._hist_signals += signal
+        if len(self._hist_rows) > HISTORY_WINDOW:
+            old_key, old_signal = self._hist_rows.popleft()
+            self._hist_hits[old_key] -= 1
+            if not self._hist_hits[old_key]:
+                del self._hist_hits[old_key]
+            self._hist_signals -= old_signal
+
+    def _sync_history(self) -> None:
+        count = self.evolution.record_count
+        new = count - (self._hist_seen or 0)
+        if self._hist_seen is None or new < 0 or new > HISTORY_WINDOW:
+            self._hist_rows.clear()
+            self._hist_hits.clear()
+            self._hist_signals = 0
+            new = HISTORY_WINDOW
+        if new:
+            for row in self.evolution.history_tail(limit=new):
+                self._push_history(row)
+        self._hist_seen = count
 
     def _tier_for(self, usefulness: float) -> str:
         if usefulness >= 1.2:
@@ -119,13 +233,12 @@ class RelevanceEngine:
     # ---------- Persistence helpers ----------
     def _persist_record(self, record: Dict[str, Any], tier: str) -> None:
         if tier == "hot":
-            self._append_jsonl(self.hot_dir / "hot.jsonl", record)
+            self.hot.append(record)
+            self._hot_rows.append(record)
         elif tier == "warm":
-            self._append_jsonl(self.warm_dir / "warm.jsonl", record)
+            self.warm.append(record)
         elif tier == "cold":
-            # compress cold entries
-            compressed_path = self.cold_dir / "cold.jsonl.gz"
-            self._append_gzip_jsonl(compressed_path, record)
+            self.cold.append(record)
             self._emit_lesson(record, compressed=True)
         else:
             self._append_jsonl(
@@ -138,51 +251,68 @@ class RelevanceEngine:
         with open(path, "a", encoding="utf-8") as f:
             f.write(json.dumps(row, separators=(",", ":")) + "\n")
 
-    def _append_gzip_jsonl(self, path: Path, row: Dict[str, Any]) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with gzip.open(path, "at", encoding="utf-8") as f:
-            f.write(json.dumps(row, separators=(",", ":")) + "\n")
-
     def _tail_jsonl(self, path: Path, limit: int) -> List[Dict[str, Any]]:
-        if not path.exists():
-            return []
-        rows: List[Dict[str, Any]] = []
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    try:
+        """Last ``limit`` rows of ``path``, oldest first, read from the end."""
+        return list(reversed(read_backward(path, limit=limit).records))
+
+    def _migrate_legacy_cold(self) -> None:
+        legacy = self.cold_dir / "cold.jsonl.gz"
+        if not legacy.exists():
+            return
+        migrated = legacy.with_name(legacy.name + ".migrated")
+        if self.cold.meta.get("legacy_migrated"):
+            # Imported before a crash; only the rename is left.
+            legacy.rename(migrated)
+            return
+        rows = []
+        try:
+            with gzip.open(legacy, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
                         rows.append(json.loads(line))
-                    except Exception:
-                        continue
-        return rows[-limit:]
-
-    def _tail_jsonl_dir(self, dir_path: Path, limit: int) -> List[Dict[str, Any]]:
-        latest_file = None
-        for cand in [dir_path / "hot.jsonl", dir_path / "warm.jsonl"]:
-            if cand.exists():
-                latest_file = cand
-                break
-        if not latest_file:
-            return []
-        return self._tail_jsonl(latest_file, limit)
+        except Exception:
+            return
+        self.cold.import_rows(rows, {"legacy_migrated": True})
+        legacy.rename(migrated)
 
-    # ---------- Rebalancing & lessons ----------
-    def _rebalance(self) -> None:
-        warm = self._tail_jsonl(self.warm_dir / "warm.jsonl", 200)
-        cold = []
-        cold_path = self.cold_dir / "cold.jsonl.gz"
-        if cold_path.exists():
+    # ---------- Usefulness stats ----------
+    def _load_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if self.stats_file.exists():
             try:
-                with gzip.open(cold_path, "rt", encoding="utf-8") as f:
-                    for line in f:
-                        if line.strip():
-                            cold.append(json.loads(line))
+                return json.loads(self.stats_file.read_text(encoding="utf-8"))
             except Exception:
                 pass
-        for rec in warm[-10:]:
+        return {}
+
+    def _save_stats(self) -> None:
+        tmp = self.stats_file.with_suffix(".json.tmp")
+        try:
+            tmp.write_text(
+                json.dumps(self._usefulness, separators=(",", ":")), encoding="utf-8"
+            )
+            os.replace(tmp, self.stats_file)
+        except OSError:
+            pass
+
+    def _track_usefulness(
+        self, inputs_hash: str, strategy: str, usefulness: float, tier: str
+    ) -> None:
+        rec = self._usefulness.setdefault(inputs_hash, {}).setdefault(
+            strategy, {"count": 0, "total": 0.0, "tiers": {}}
+        )
+        rec["count"] += 1
+        rec["total"] += usefulness
+        rec["mean"] = round(rec["total"] / rec["count"], 4)
+        rec["last"] = usefulness
+        rec["tiers"][tier] = rec["tiers"].get(tier, 0) + 1
+
+    # ---------- Rebalancing & lessons ----------
+    def _rebalance(self) -> None:
+        for rec in self.warm.tail(10):
             self._emit_lesson(rec, compressed=False)
-        for rec in cold[-5:]:
+        for rec in self.cold.tail(5):
             self._emit_lesson(rec, compressed=True)
+        self._save_stats()
 
     def _emit_lesson(self, rec: Dict[str, Any], compressed: bool) -> None:
         lesson = {
@@ -197,9 +327,7 @@ class RelevanceEngine:
 
     # ---------- Cognitive load ----------
     def _emit_cognitive_load(self) -> None:
-        hot_size = self._count_lines(self.hot_dir / "hot.jsonl")
-        warm_size = self._count_lines(self.warm_dir / "warm.jsonl")
-        cold_size = self._count_gzip_lines(self.cold_dir / "cold.jsonl.gz")
+        hot_size, warm_size, cold_size = len(self.hot), len(self.warm), len(self.cold)
         latency = self._avg_runtime()
         signal, noise = self._signal_noise()
         lines = [
@@ -213,19 +341,6 @@ class RelevanceEngine:
             lines.append("compression_aggressiveness: increase")
         self.cognitive_file.write_text("\n".join(lines))
 
-    def _count_lines(self, path: Path) -> int:
-        if not path.exists():
-            return 0
-        return sum(1 for _ in open(path, "r", encoding="utf-8"))
-
-    def _count_gzip_lines(self, path: Path) -> int:
-        if not path.exists():
-            return 0
-        try:
-            return sum(1 for _ in gzip.open(path, "rt", encoding="utf-8"))
-        except Exception:
-            return 0
-
     def _avg_runtime(self) -> float:
         perf = self._tail_jsonl(self.data_dir / "perf_ledger.jsonl", 100)
         if not perf:
@@ -233,10 +348,9 @@ class RelevanceEngine:
         return round(sum(e.get("runtime_ms", 0.0) for e in perf) / max(len(perf), 1), 2)
 
     def _signal_noise(self) -> Tuple[float, float]:
-        hist = self.evolution.history_tail(limit=200)
-        if not hist:
+        self._sync_history()
+        total = len(self._hist_rows)
+        if not total:
             return (0.0, 0.0)
-        signals = sum(1 for h in hist if h.get("score", 0.0) >= 0.5)
-        noise = len(hist) - signals
-        total = max(len(hist), 1)
-        return (round(signals / total, 3), round(noise / total, 3))
+        signals = self._hist_signals
+        return (round(signals / total, 3), round((total - signals) / total, 3))
@@ -0,0 +1,326 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Tier storage for the relevance engine.
+
+``IndexedLog`` is an append-only JSONL file with a sidecar ``.idx`` of
+8-byte line offsets.  Its length and last-N rows are answered from the
+index without reading the log; an index that lags the log (crash between
+the two writes, rows appended by an older version) is caught up by
+scanning only the unindexed tail, and rebuilt if it no longer fits.
+
+``BlockStore`` keeps rows in independently zlib-compressed blocks of up
+to ``block_rows`` rows, followed by a JSON footer listing each block's
+offset, length and row count::
+
+    [block 0][block 1]...[footer json][footer length: 8 bytes][MAGIC]
+
+Rows wait in an uncompressed ``.pending.jsonl`` sidecar until a block is
+full.  Counting is a footer lookup, and ``tail`` decompresses only the
+blocks it needs, newest first.
+
+Sealing appends the new blocks and footer after the current trailer, so
+the previous footer stays valid until the new one is on disk; on open, a
+torn tail is skipped by scanning back to the last valid trailer.  The
+superseded footers left between blocks are dropped by rewriting the file
+once they outweigh the block data.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b"SWZBLK01"
+_TRAILER = struct.Struct(">Q")
+_SCAN_CHUNK = 64 * 1024
+DEFAULT_BLOCK_ROWS = 256
+
+
+def _dumps(row: Dict[str, Any]) -> bytes:
+    return (json.dumps(row, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _parse_lines(data: bytes) -> List[Dict[str, Any]]:
+    rows = []
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except Exception:
+            continue
+    return rows
+
+
+class IndexedLog:
+    """Append-only JSONL log with a byte-offset index."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        self._offsets = array("Q")
+        self._load_index()
+
+    def _load_index(self) -> None:
+        offsets = array("Q")
+        try:
+            raw = self.index_path.read_bytes()
+            offsets.frombytes(raw[: len(raw) - len(raw) % offsets.itemsize])
+        except OSError:
+            pass
+        size = self.path.stat().st_size
+        with open(self.path, "rb") as f:
+            if offsets and offsets[-1] >= size:
+                offsets = array("Q")
+            elif offsets and offsets[-1] > 0:
+                # The last indexed offset must still start a line.
+                f.seek(offsets[-1] - 1)
+                if f.read(1) != b"\n":
+                    offsets = array("Q")
+            # Index everything after the last indexed line.
+            start = 0
+            if offsets:
+                f.seek(offsets[-1])
+                f.readline()
+                start = f.tell()
+            else:
+                f.seek(0)
+            pos, added = start, False
+            for line in f:
+                if line.strip():
+                    offsets.append(pos)
+                    added = True
+                pos += len(line)
+        self._offsets = offsets
+        if added or not self.index_path.exists():
+            with open(self.index_path, "wb") as f:
+                f.write(offsets.tobytes())
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def append(self, row: Dict[str, Any]) -> None:
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(_dumps(row))
+        with open(self.index_path, "ab") as f:
+            f.write(struct.pack("=Q", offset))
+        self._offsets.append(offset)
+
+    def tail(self, limit: int) -> List[Dict[str, Any]]:
+        if limit <= 0 or not self._offsets:
+            return []
+        start = self._offsets[-min(limit, len(self._offsets))]
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return _parse_lines(f.read())[-limit:]
+
+
+class BlockStore:
+    """Compressed block file with a footer index and a pending sidecar."""
+
+    def __init__(self, path: Path, block_rows: int = DEFAULT_BLOCK_ROWS) -> None:
+        self.path = Path(path)
+        self.pending_path = self.path.with_name(self.path.name + ".pending.jsonl")
+        self.block_rows = max(1, block_rows)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._blocks: List[Tuple[int, int, int]] = []
+        self._meta: Dict[str, Any] = {}
+        # Current footer spans [_footer_start, _end); seals write from _end.
+        self._footer_start = 0
+        self._end = 0
+        # Bytes between blocks that no footer points at any more.
+        self._dead = 0
+        self._cache: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        self._read_footer()
+        self._sealed_rows = sum(rows for _, _, rows in self._blocks)
+        self._pending = _parse_lines(
+            self.pending_path.read_bytes() if self.pending_path.exists() else b""
+        )
+
+    @staticmethod
+    def _parse_footer(f, end: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Footer whose trailer ends at ``end`` as ``(start, footer)``, or None."""
+        if end < len(MAGIC) + _TRAILER.size:
+            return None
+        f.seek(end - len(MAGIC) - _TRAILER.size)
+        (length,) = _TRAILER.unpack(f.read(_TRAILER.size))
+        if f.read(len(MAGIC)) != MAGIC:
+            return None
+        start = end - len(MAGIC) - _TRAILER.size - length
+        if start < 0:
+            return None
+        f.seek(start)
+        try:
+            footer = json.loads(f.read(length))
+            blocks = [tuple(b) for b in footer["blocks"]]
+        except (ValueError, KeyError, TypeError):
+            return None
+        if any(len(b) != 3 or b[0] + b[1] > start for b in blocks):
+            return None
+        footer["blocks"] = blocks
+        return start, footer
+
+    @staticmethod
+    def _magic_ends(f, size: int) -> Iterable[int]:
+        """Offsets just past each MAGIC in the file, last first."""
+        pos, carry = size, b""
+        while pos > 0:
+            step = min(_SCAN_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + carry
+            hit = buf.rfind(MAGIC)
+            while hit != -1:
+                yield pos + hit + len(MAGIC)
+                hit = buf.rfind(MAGIC, 0, hit + len(MAGIC) - 1)
+            carry = buf[: len(MAGIC) - 1]
+
+    def _read_footer(self) -> None:
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return
+        try:
+            size = self.path.stat().st_size
+            with open(self.path, "rb") as f:
+                found = self._parse_footer(f, size)
+                end = size
+                if found is None:
+                    # Torn seal: fall back to the newest intact trailer.
+                    for end in self._magic_ends(f, size):
+                        found = self._parse_footer(f, end)
+                        if found is not None:
+                            break
+            if found is None:
+                raise ValueError("no valid footer")
+        except (OSError, ValueError):
+            # Keep the damaged file for inspection and start a fresh one.
+            stamp = int(time.time())
+            self.path.rename(self.path.with_name(f"{self.path.name}.corrupt-{stamp}"))
+            return
+        start, footer = found
+        self._blocks = footer["blocks"]
+        self._meta = dict(footer.get("meta") or {})
+        self._footer_start, self._end = start, end
+        self._dead = start - sum(length for _, length, _ in self._blocks)
+
+    def __len__(self) -> int:
+        return self._sealed_rows + len(self._pending)
+
+    @property
+    def blocks(self) -> int:
+        return len(self._blocks)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """Metadata stored in the footer alongside the blocks."""
+        return dict(self._meta)
+
+    def append(self, row: Dict[str, Any]) -> None:
+        with open(self.pending_path, "ab") as f:
+            f.write(_dumps(row))
+        self._pending.append(row)
+        if len(self._pending) >= self.block_rows:
+            self.seal()
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def seal(self) -> None:
+        """Compress pending rows into a new block and append a new footer."""
+        if not self._pending:
+            return
+        self._write_blocks([self._pending], self._meta)
+        self._sealed_rows += len(self._pending)
+        self._pending = []
+        self.pending_path.write_bytes(b"")
+
+    def import_rows(self, rows: List[Dict[str, Any]], meta: Dict[str, Any]) -> None:
+        """Seal ``rows`` and merge ``meta`` into the footer in one commit.
+
+        Either every row and the metadata are on disk after a crash, or
+        none of them are.
+        """
+        self.seal()
+        chunks = [rows[i : i + self.block_rows] for i in range(0, len(rows), self.block_rows)]
+        self._write_blocks(chunks, {**self._meta, **meta})
+        self._sealed_rows += len(rows)
+
+    def _write_blocks(self, chunks: List[List[Dict[str, Any]]], meta: Dict[str, Any]) -> None:
+        blocks = list(self._blocks)
+        data = []
+        offset = self._end
+        for rows in chunks:
+            block = zlib.compress(b"".join(_dumps(r) for r in rows), 6)
+            blocks.append((offset, len(block), len(rows)))
+            data.append(block)
+            offset += len(block)
+        footer = json.dumps({"blocks": blocks, "meta": meta}, separators=(",", ":")).encode()
+        mode = "r+b" if self.path.exists() else "wb"
+        with open(self.path, mode) as f:
+            f.seek(self._end)
+            f.write(b"".join(data))
+            f.write(footer)
+            f.write(_TRAILER.pack(len(footer)))
+            f.write(MAGIC)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        # The footer we just wrote past is no longer referenced.
+        self._dead += self._end - self._footer_start
+        self._blocks = blocks
+        self._meta = dict(meta)
+        self._footer_start = offset
+        self._end = offset + len(footer) + _TRAILER.size + len(MAGIC)
+        if self._dead > sum(length for _, length, _ in blocks):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the file without superseded footers."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        blocks = []
+        with open(self.path, "rb") as src, open(tmp, "wb") as dst:
+            for offset, length, rows in self._blocks:
+                src.seek(offset)
+                blocks.append((dst.tell(), length, rows))
+                dst.write(src.read(length))
+            footer = json.dumps(
+                {"blocks": blocks, "meta": self._meta}, separators=(",", ":")
+            ).encode()
+            footer_start = dst.tell()
+            dst.write(footer)
+            dst.write(_TRAILER.pack(len(footer)))
+            dst.write(MAGIC)
+            dst.flush()
+            os.fsync(dst.fileno())
+            end = dst.tell()
+        os.replace(tmp, self.path)
+        self._blocks, self._footer_start, self._end, self._dead = blocks, footer_start, end, 0
+
+    def _block_rows(self, index: int) -> List[Dict[str, Any]]:
+        if self._cache is not None and self._cache[0] == index:
+            return self._cache[1]
+        offset, length, _ = self._blocks[index]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            rows = _parse_lines(zlib.decompress(f.read(length)))
+        self._cache = (index, rows)
+        return rows
+
+    def tail(self, limit: int) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        out = list(self._pending[-limit:])
+        index = len(self._blocks) - 1
+        while len(out) < limit and index >= 0:
+            out = self._block_rows(index)[-(limit - len(out)) :] + out
+            index -= 1
+        return out
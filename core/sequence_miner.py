@@ -20,10 +20,99 @@
 # SOFTWARE.
 
 """
-Implements the Sequence Miner layer to discover repeated event chains from the event log and store them with statistics.
+Streaming sequence miner over event logs.
+
+Events are consumed one at a time as they are appended.  Every contiguous
+chain of up to ``max_len`` events ending at the new event is counted:
+
+- all chains go into a count-min sketch, so rare chains cost a fixed
+  amount of memory and their support can still be estimated;
+- chains whose estimated support reaches ``min_support`` are promoted to
+  an exact table, bounded to ``capacity`` entries by pruning the weakest
+  quarter when it overflows.
+
+The exact table also indexes chains by prefix, which answers "top-k
+frequent chains" and "probable next event" without rescanning the log.
 """
 
-from typing import List, Dict, Any
+import heapq
+import json
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+Chain = Tuple[str, ...]
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount."""
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+
+    def _cells(self, key: Chain) -> Iterable[Tuple[List[int], int]]:
+        for i, row in enumerate(self._rows):
+            yield row, hash((i, key)) % self.width
+
+    def add(self, key: Chain, n: int = 1) -> int:
+        """Add ``n`` to ``key`` and return its new estimate."""
+        estimate = None
+        for row, col in self._cells(key):
+            row[col] += n
+            if estimate is None or row[col] < estimate:
+                estimate = row[col]
+        return estimate or 0
+
+    def estimate(self, key: Chain) -> int:
+        return min(row[col] for row, col in self._cells(key))
+
+
+def follow_jsonl(path: Path, offset: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Rows appended to ``path`` after byte ``offset`` and the new offset.
+
+    The offset is ``None`` if the file shrank (rewritten or truncated) and
+    the caller must start over from 0.  A trailing partial line is left for
+    the next call.
+    """
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return [], (offset if offset == 0 else None)
+    if size < offset:
+        return [], None
+    if size == offset:
+        return [], offset
+    with path.open("rb") as fh:
+        fh.seek(offset)
+        chunk = fh.read(size - offset)
+    end = chunk.rfind(b"\n")
+    if end == -1:
+        return [], offset
+    rows = []
+    for line in chunk[: end + 1].splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except Exception:
+            continue
+        if isinstance(row, dict):
+            rows.append(row)
+    return rows, offset + end + 1
+
+
+def _event_name(event: Any) -> Optional[str]:
+    if isinstance(event, str):
+        return event
+    if isinstance(event, dict):
+        for key in ("event", "type", "name"):
+            if event.get(key) is not None:
+                return str(event[key])
+    return None
 
 
 class SequenceMiner:
@@ -31,11 +120,176 @@ class SequenceMiner:
     Discovers repeated event chains from the event log and stores them with statistics.
     """
 
-    def __init__(self) -> None:
-        pass
+    def __init__(
+        self,
+        max_len: int = 6,
+        min_support: int = 2,
+        capacity: int = 4096,
+        sketch_width: int = 2048,
+        sketch_depth: int = 4,
+    ) -> None:
+        self.max_len = max(2, max_len)
+        self.min_support = max(1, min_support)
+        self.capacity = max(16, capacity)
+        self._lock = threading.Lock()
+        self._sketch = CountMinSketch(sketch_width, sketch_depth)
+        self._counts: Dict[Chain, int] = {}
+        # prefix -> last events seen after it, among chains in the exact table
+        self._children: Dict[Chain, Set[str]] = {}
+        self._tail: Deque[str] = deque(maxlen=self.max_len)
+        self._offsets: Dict[Path, int] = {}
+        self.events = 0
+        self.pruned = 0
+
+    # ---------- Ingestion ----------
+    def add(self, event: str) -> None:
+        """Count every chain of up to ``max_len`` events ending at ``event``."""
+        with self._lock:
+            self._tail.append(event)
+            self.events += 1
+            tail = tuple(self._tail)
+            for start in range(len(tail)):
+                self._count(tail[start:])
+            if len(self._counts) > self.capacity:
+                self._prune()
+
+    def extend(self, events: Iterable[Any]) -> int:
+        added = 0
+        for event in events:
+            name = _event_name(event)
+            if name is not None:
+                self.add(name)
+                added += 1
+        return added
+
+    def break_chain(self) -> None:
+        """Start a new chain, e.g. at a session boundary."""
+        with self._lock:
+            self._tail.clear()
+
+    def follow(
+        self, path: Path, key: Callable[[Dict[str, Any]], Optional[str]] = _event_name
+    ) -> int:
+        """Consume rows appended to the JSONL log at ``path`` since the last call."""
+        path = Path(path)
+        rows, offset = follow_jsonl(path, self._offsets.get(path, 0))
+        if offset is None:
+            self.reset()
+            rows, offset = follow_jsonl(path, 0)
+        self._offsets[path] = offset
+        added = 0
+        for row in rows:
+            name = key(row)
+            if name is not None:
+                self.add(name)
+                added += 1
+        return added
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sketch = CountMinSketch(self._sketch.width, self._sketch.depth)
+            self._counts.clear()
+            self._children.clear()
+            self._tail.clear()
+            self._offsets.clear()
+            self.events = 0
+
+    def _count(self, chain: Chain) -> None:
+        estimate = self._sketch.add(chain)
+        if chain in self._counts:
+            self._counts[chain] += 1
+        elif estimate >= self.min_support:
+            # The sketch may overcount a little; that is the price of
+            # forgetting the chain while it was rare.
+            self._counts[chain] = estimate
+            self._children.setdefault(chain[:-1], set()).add(chain[-1])
+
+    def _prune(self) -> None:
+        keep = set(
+            heapq.nlargest(
+                self.capacity * 3 // 4, self._counts, key=self._counts.__getitem__
+            )
+        )
+        for chain in [c for c in self._counts if c not in keep]:
+            del self._counts[chain]
+            siblings = self._children.get(chain[:-1])
+            if siblings is not None:
+                siblings.discard(chain[-1])
+                if not siblings:
+                    del self._children[chain[:-1]]
+            self.pruned += 1
+
+    # ---------- Queries ----------
+    def support(self, chain: Iterable[str]) -> int:
+        """Exact support for tracked chains, a sketch estimate otherwise."""
+        chain = tuple(chain)
+        with self._lock:
+            count = self._counts.get(chain)
+            return count if count is not None else self._sketch.estimate(chain)
+
+    def top_k(self, k: int = 10, min_len: int = 2) -> List[Dict[str, Any]]:
+        """Most frequent chains of at least ``min_len`` events."""
+        with self._lock:
+            top = heapq.nlargest(
+                k,
+                (
+                    (n, chain)
+                    for chain, n in self._counts.items()
+                    if len(chain) >= min_len and n >= self.min_support
+                ),
+                key=lambda item: (item[0], len(item[1])),
+            )
+        return [
+            {
+                "name": "->".join(chain),
+                "sequence": list(chain),
+                "support": n,
+                "length": len(chain),
+            }
+            for n, chain in top
+        ]
+
+    def predict_next(self, prefix: Iterable[str], k: int = 3) -> List[Dict[str, Any]]:
+        """Probable next events after ``prefix``.
+
+        Uses the longest suffix of ``prefix`` that has tracked successors,
+        backing off to shorter contexts and finally to single-event
+        frequencies.
+        """
+        context = tuple(prefix)[-(self.max_len - 1) :]
+        with self._lock:
+            while True:
+                children = self._children.get(context)
+                if children:
+                    counts = {e: self._counts[context + (e,)] for e in children}
+                    break
+                if not context:
+                    return []
+                context = context[1:]
+        total = sum(counts.values())
+        top = heapq.nlargest(k, counts.items(), key=lambda kv: (kv[1], kv[0]))
+        return [
+            {
+                "event": event,
+                "probability": round(n / total, 4),
+                "support": n,
+                "context": list(context),
+            }
+            for event, n in top
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "events": self.events,
+                "tracked_chains": len(self._counts),
+                "pruned": self.pruned,
+                "sketch_cells": self._sketch.width * self._sketch.depth,
+            }
 
     def mine_sequences(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Analyze the event log and return discovered sequences with statistics.
         """
-        pass
+        self.extend(events)
+        return self.top_k(k=len(self._counts))
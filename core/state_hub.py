@@ -0,0 +1,248 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""In-process state hub behind the cockpit server-sent-events stream.
+
+Producers (mission and audit writes, organism evolution, health refresh,
+companion replies) call ``publish(topic, delta)`` with a flat dict of
+changed keys, from any thread.  The hub
+
+- drops keys whose value equals the topic's current state, so repeated
+  publishes of unchanged values cost nothing downstream;
+- coalesces deltas per topic for ``coalesce_ms`` and emits one event per
+  topic per window, with a monotonically increasing id;
+- keeps the merged state of every topic (``snapshot``) and a ring of
+  recent events, so a reconnecting client that sends ``Last-Event-ID``
+  gets exactly the events it missed, or a fresh snapshot if the ring no
+  longer reaches back that far;
+- gives each subscriber a bounded queue.  A client that falls behind has
+  its backlog dropped and receives one ``resync`` snapshot instead, so a
+  slow consumer never holds memory or stalls other clients.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+DEFAULT_COALESCE_MS = 100.0
+DEFAULT_HISTORY = 1024
+DEFAULT_QUEUE_SIZE = 256
+MAX_KEYS_PER_TOPIC = 500
+
+
+@dataclass(frozen=True)
+class HubEvent:
+    id: int
+    topic: str
+    data: dict[str, Any]
+
+    def encode(self) -> str:
+        body = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.topic}\ndata: {body}\n\n"
+
+
+class Subscription:
+    """One client's bounded event queue, bound to the client's event loop."""
+
+    def __init__(self, hub: "StateHub", topics: Optional[set[str]], maxsize: int):
+        self._hub = hub
+        self.topics = topics
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[HubEvent] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def _offer(self, event: HubEvent) -> None:
+        # Runs on the subscriber's loop (or under the hub lock in subscribe).
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(self._hub.snapshot_event(self.topics, kind="resync"))
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[HubEvent]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self)
+
+
+class StateHub:
+    """Coalescing publish/subscribe hub with replay for resuming clients."""
+
+    def __init__(
+        self,
+        coalesce_ms: float = DEFAULT_COALESCE_MS,
+        history: int = DEFAULT_HISTORY,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self.coalesce_sec = coalesce_ms / 1000.0
+        self.queue_size = queue_size
+        self._cond = threading.Condition()
+        self._state: dict[str, OrderedDict[str, Any]] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._history: deque[HubEvent] = deque(maxlen=history)
+        self._subs: list[Subscription] = []
+        self._last_id = 0
+        self._thread: Optional[threading.Thread] = None
+        self.published = 0
+        self.suppressed = 0
+        self.emitted = 0
+
+    # -- producers ---------------------------------------------------------
+
+    def publish(self, topic: str, delta: dict[str, Any]) -> None:
+        with self._cond:
+            current = self._state.get(topic, {})
+            pending = self._pending.get(topic)
+            changed = {}
+            for key, value in delta.items():
+                if pending is not None and key in pending:
+                    if pending[key] != value:
+                        changed[key] = value
+                elif current.get(key, _MISSING) != value:
+                    changed[key] = value
+            self.published += 1
+            if not changed:
+                self.suppressed += 1
+                return
+            self._pending.setdefault(topic, {}).update(changed)
+            self._ensure_flusher()
+            self._cond.notify()
+
+    def _ensure_flusher(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._flush_loop, name="swarmz-state-hub", daemon=True
+            )
+            self._thread.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            # Let more deltas for the same topics accumulate.
+            time.sleep(self.coalesce_sec)
+            self.flush()
+
+    def flush(self) -> list[HubEvent]:
+        """Emit pending deltas now; returns the emitted events."""
+        with self._cond:
+            pending, self._pending = self._pending, {}
+            events = []
+            for topic, delta in pending.items():
+                state = self._state.setdefault(topic, OrderedDict())
+                for key, value in delta.items():
+                    state[key] = value
+                    state.move_to_end(key)
+                while len(state) > MAX_KEYS_PER_TOPIC:
+                    state.popitem(last=False)
+                self._last_id += 1
+                event = HubEvent(self._last_id, topic, {"delta": delta})
+                self._history.append(event)
+                events.append(event)
+            subs = list(self._subs)
+            self.emitted += len(events)
+        for event in events:
+            for sub in subs:
+                if sub.wants(event.topic):
+                    try:
+                        sub.loop.call_soon_threadsafe(sub._offer, event)
+                    except RuntimeError:
+                        # The client's loop is gone; drop the subscription.
+                        self.unsubscribe(sub)
+        return events
+
+    # -- consumers ---------------------------------------------------------
+
+    def snapshot(self, topics: Optional[Iterable[str]] = None) -> dict[str, dict]:
+        with self._cond:
+            names = list(self._state) if topics is None else topics
+            return {t: dict(self._state.get(t, {})) for t in names}
+
+    def snapshot_event(
+        self, topics: Optional[Iterable[str]] = None, kind: str = "snapshot"
+    ) -> HubEvent:
+        with self._cond:
+            return HubEvent(self._last_id, kind, {"state": self.snapshot(topics)})
+
+    def subscribe(
+        self,
+        topics: Optional[Iterable[str]] = None,
+        last_event_id: Optional[int] = None,
+    ) -> Subscription:
+        """Register a client on the running loop and queue its catch-up.
+
+        With ``last_event_id`` still covered by the replay ring the client
+        gets the events it missed; otherwise it starts from a snapshot.
+        """
+        wanted = set(topics) if topics else None
+        sub = Subscription(self, wanted, self.queue_size)
+        with self._cond:
+            replay = None
+            if last_event_id is not None:
+                oldest = self._history[0].id if self._history else self._last_id + 1
+                if last_event_id >= oldest - 1 and last_event_id <= self._last_id:
+                    replay = [e for e in self._history if e.id > last_event_id]
+            self._subs.append(sub)
+            if replay is None:
+                sub._offer(self.snapshot_event(wanted))
+            else:
+                for event in replay:
+                    if sub.wants(event.topic):
+                        sub._offer(event)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._cond:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "last_event_id": self._last_id,
+                "subscribers": len(self._subs),
+                "topics": sorted(self._state),
+                "published": self.published,
+                "suppressed": self.suppressed,
+                "emitted": self.emitted,
+                "history": len(self._history),
+                "dropped": sum(s.dropped for s in self._subs),
+            }
+
+
+_MISSING = object()
+
+_hub: Optional[StateHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_state_hub() -> StateHub:
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = StateHub()
+    return _hub
+
+
+def publish_state(topic: str, delta: dict[str, Any]) -> None:
+    """Best-effort publish to the process-wide hub; never raises."""
+    try:
+        get_state_hub().publish(topic, delta)
+    except Exception:
+        pass
@@ -0,0 +1,248 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Background system sampler behind ``/v1/sysmon``.
+
+A daemon thread collects CPU (total and per core), memory, swap, disk,
+network and own-process stats with ``psutil`` every ``interval_sec`` into
+a fixed-size ring buffer.  Requests read the newest sample from memory;
+nothing on the request path blocks or resolves DNS.
+
+CPU percentages use ``psutil``'s non-blocking mode, so each value is the
+utilisation since the previous sample.  Host name and IP address are
+resolved once, on the sampler thread.
+"""
+from __future__ import annotations
+
+import os
+import platform
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+DEFAULT_INTERVAL_SEC = 2.0
+DEFAULT_HISTORY = 300
+
+# Fields kept in history rows; the full sample is only served as "latest".
+_HISTORY_FIELDS = (
+    "ts",
+    "cpu_percent",
+    "memory_percent",
+    "swap_percent",
+    "disk_percent",
+    "net_sent_per_sec",
+    "net_recv_per_sec",
+    "process_cpu_percent",
+    "process_rss",
+)
+
+
+def _host_identity() -> dict[str, str]:
+    try:
+        hostname = socket.gethostname()
+        ip_address = socket.gethostbyname(hostname)
+    except Exception:
+        hostname = "unknown"
+        ip_address = "unknown"
+    return {
+        "platform": platform.platform(),
+        "hostname": hostname,
+        "ip_address": ip_address,
+    }
+
+
+class SystemSampler:
+    """Periodic ``psutil`` sampler with a ring buffer of recent samples."""
+
+    def __init__(
+        self,
+        interval_sec: float = DEFAULT_INTERVAL_SEC,
+        history: int = DEFAULT_HISTORY,
+        disk_path: str = "/",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.interval_sec = max(0.1, interval_sec)
+        self.disk_path = disk_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._ring: deque[dict[str, Any]] = deque(maxlen=max(1, history))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._identity: Optional[dict[str, str]] = None
+        self._prev_net: Optional[tuple[float, int, int]] = None
+        self._process = None
+        self.samples_taken = 0
+        self.last_error: Optional[str] = None
+        try:
+            import psutil
+        except ImportError:
+            self._psutil = None
+        else:
+            self._psutil = psutil
+            self._process = psutil.Process(os.getpid())
+            # Prime the non-blocking counters so the first sample is meaningful.
+            psutil.cpu_percent(interval=None)
+            psutil.cpu_percent(interval=None, percpu=True)
+            self._process.cpu_percent(interval=None)
+
+    @property
+    def available(self) -> bool:
+        return self._psutil is not None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="swarmz-sysmon", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample_now()
+            self._stop.wait(self.interval_sec)
+
+    # -- sampling ----------------------------------------------------------
+
+    def sample_now(self) -> Optional[dict[str, Any]]:
+        """Take one sample, append it to the ring and return it."""
+        if self._psutil is None:
+            self.last_error = "psutil not installed"
+            return None
+        with self._sample_lock:
+            if self._identity is None:
+                self._identity = _host_identity()
+            try:
+                sample = self._collect()
+            except Exception as exc:
+                self.last_error = str(exc)
+                return None
+        with self._lock:
+            self._ring.append(sample)
+            self.samples_taken += 1
+        self.last_error = None
+        return sample
+
+    def _collect(self) -> dict[str, Any]:
+        psutil = self._psutil
+        now = self._clock()
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        sample: dict[str, Any] = {
+            "ts": now,
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "per_core": psutil.cpu_percent(interval=None, percpu=True),
+            "memory_total": memory.total,
+            "memory_used": memory.used,
+            "memory_percent": memory.percent,
+            "swap_percent": swap.percent,
+            "disk_total": disk.total,
+            "disk_used": disk.used,
+            "disk_percent": (disk.used / disk.total) * 100 if disk.total else 0.0,
+        }
+        try:
+            sample["load_avg"] = list(os.getloadavg())
+        except (AttributeError, OSError):
+            sample["load_avg"] = None
+
+        net = psutil.net_io_counters()
+        sent_rate = recv_rate = None
+        if net is not None:
+            sample["net_bytes_sent"] = net.bytes_sent
+            sample["net_bytes_recv"] = net.bytes_recv
+            if self._prev_net is not None:
+                prev_ts, prev_sent, prev_recv = self._prev_net
+                elapsed = now - prev_ts
+                if elapsed > 0:
+                    sent_rate = max(0.0, (net.bytes_sent - prev_sent) / elapsed)
+                    recv_rate = max(0.0, (net.bytes_recv - prev_recv) / elapsed)
+            self._prev_net = (now, net.bytes_sent, net.bytes_recv)
+        sample["net_sent_per_sec"] = sent_rate
+        sample["net_recv_per_sec"] = recv_rate
+
+        proc = self._process
+        with proc.oneshot():
+            sample["process_cpu_percent"] = proc.cpu_percent(interval=None)
+            sample["process_rss"] = proc.memory_info().rss
+            sample["process_threads"] = proc.num_threads()
+            try:
+                sample["process_open_files"] = proc.num_fds()
+            except (AttributeError, psutil.Error):
+                sample["process_open_files"] = None
+        return sample
+
+    # -- queries -----------------------------------------------------------
+
+    def latest(self) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self._ring[-1] if self._ring else None
+
+    def history(self, limit: int) -> list[dict[str, Any]]:
+        """Newest ``limit`` samples, oldest first, reduced to summary fields."""
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = list(self._ring)[-limit:]
+        return [{k: row.get(k) for k in _HISTORY_FIELDS} for row in rows]
+
+    def identity(self) -> dict[str, str]:
+        return dict(
+            self._identity
+            or {"platform": "unknown", "hostname": "unknown", "ip_address": "unknown"}
+        )
+
+    def stats(self) -> dict[str, Any]:
+        latest = self.latest()
+        return {
+            "available": self.available,
+            "running": self.running,
+            "interval_sec": self.interval_sec,
+            "buffered": len(self._ring),
+            "capacity": self._ring.maxlen,
+            "samples_taken": self.samples_taken,
+            "age_sec": (self._clock() - latest["ts"]) if latest else None,
+            "last_error": self.last_error,
+        }
+
+
+_sampler: Optional[SystemSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_system_sampler() -> SystemSampler:
+    """Process-wide sampler, started on first use.
+
+    Cadence and buffer size come from ``SWARMZ_SYSMON_INTERVAL_SEC`` and
+    ``SWARMZ_SYSMON_HISTORY``.
+    """
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = SystemSampler(
+                    interval_sec=float(
+                        os.environ.get("SWARMZ_SYSMON_INTERVAL_SEC", DEFAULT_INTERVAL_SEC)
+                    ),
+                    history=int(os.environ.get("SWARMZ_SYSMON_HISTORY", DEFAULT_HISTORY)),
+                )
+                if _sampler.available:
+                    _sampler.start()
+    return _sampler
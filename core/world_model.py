@@ -7,6 +7,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, List
 
+from core.activity_index import get_activity_index
+
 
 class WorldModel:
     def __init__(self, data_dir: str = "data"):
@@ -17,19 +19,11 @@ class WorldModel:
         self.recompute_interval = 24 * 3600  # seconds
 
     def _gather_file_activity(self, roots: List[Path]) -> Dict[str, Any]:
-        now = time.time()
-        activity = []
-        for root in roots:
-            if not root.exists():
-                continue
-            for p in root.rglob("*"):
-                if p.is_file():
-                    mtime = p.stat().st_mtime
-                    activity.append(now - mtime)
-        if not activity:
+        index = get_activity_index(roots)
+        files = index.file_count()
+        if not files:
             return {"recent_hours": 0, "files": 0}
-        within_day = sum(1 for a in activity if a <= 86400)
-        return {"recent_hours": within_day, "files": len(activity)}
+        return {"recent_hours": index.touched_within(24), "files": files}
 
     def _load_perf(self) -> Dict[str, Any]:
         perf_file = self.data_dir / "perf_ledger.jsonl"
@@ -20,13 +20,15 @@ Systems:
  13. Memory Distortion Logger — recall vs reality measurement
 """
 
+import heapq
 import json
 import os
 import re
+import threading
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException
@@ -161,57 +163,222 @@ def avg_brier(predictions: List[Dict]) -> Optional[float]:
 # ══════════════════════════════════════════════════════════════
 
 _BDG_PATH = lambda: _data_dir() / "belief_graph.json"
+_BDG_WAL_PATH = lambda: _data_dir() / "belief_graph.wal.jsonl"
+_BDG_SNAPSHOT_EVERY = 256
+_BDG_DAMPING = 0.5
+_BDG_THRESHOLD = 0.01
+
+
+class _BeliefGraph:
+    """Belief nodes with forward/reverse adjacency, persisted as WAL + snapshot.
+
+    An edge ``from -> to`` means *from* depends on *to*.  ``_deps`` maps a
+    belief to the beliefs it depends on, ``_dependents`` the reverse, so a
+    cascade only touches edges leaving the affected subgraph.  Mutations are
+    appended to the WAL; every ``_BDG_SNAPSHOT_EVERY`` rows the full graph
+    is written to ``belief_graph.json`` and the WAL is truncated.
+    """
+
+    def __init__(self, snapshot_path: Path, wal_path: Path):
+        self.path = snapshot_path
+        self.wal_path = wal_path
+        self._lock = threading.RLock()
+        self._nodes: Dict[str, Dict] = {}
+        self._deps: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        self._dependents: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        self._edge_count = 0
+        self._wal_rows = 0
+        self._load()
+
+    def _put_node(self, node: Dict) -> None:
+        self._nodes[node["id"]] = node
+
+    def _put_edge(self, edge: Dict) -> None:
+        src, dst = edge["from"], edge["to"]
+        if dst not in self._deps[src]:
+            self._edge_count += 1
+        self._deps[src][dst] = edge
+        self._dependents[dst][src] = edge
+
+    def _apply(self, rec: Dict) -> None:
+        op = rec.get("op")
+        if op == "node" and rec.get("node", {}).get("id"):
+            self._put_node(rec["node"])
+        elif op == "edge" and rec.get("edge", {}).get("from"):
+            self._put_edge(rec["edge"])
+
+    def _load(self) -> None:
+        g = _load_json(self.path, {"nodes": {}, "edges": []})
+        for node in (g.get("nodes") or {}).values():
+            if isinstance(node, dict) and node.get("id"):
+                self._put_node(node)
+        for edge in g.get("edges") or []:
+            if isinstance(edge, dict) and edge.get("from") and edge.get("to"):
+                self._put_edge(edge)
+        for rec in _load_jsonl(self.wal_path):
+            self._apply(rec)
+            self._wal_rows += 1
+
+    def _write(self, rec: Dict) -> None:
+        self._apply(rec)
+        _append_jsonl(self.wal_path, rec)
+        self._wal_rows += 1
+        if self._wal_rows >= _BDG_SNAPSHOT_EVERY:
+            self.snapshot()
+
+    def add_node(self, belief_id: str, claim: str, confidence: float) -> None:
+        node = {
+            "id": belief_id,
+            "claim": claim,
+            "confidence": confidence,
+            "updated_at": _utc(),
+        }
+        with self._lock:
+            self._write({"op": "node", "node": node})
+
+    def add_dependency(self, from_id: str, to_id: str, strength: float) -> None:
+        with self._lock:
+            existing = self._deps.get(from_id, {}).get(to_id)
+            if existing is not None and existing.get("strength") == strength:
+                return
+            edge = {
+                "from": from_id,
+                "to": to_id,
+                "strength": strength,
+                "created_at": existing["created_at"] if existing else _utc(),
+            }
+            self._write({"op": "edge", "edge": edge})
 
+    def get_node(self, belief_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._nodes.get(belief_id)
 
-def _load_graph() -> Dict:
-    return _load_json(_BDG_PATH(), {"nodes": {}, "edges": []})
-
-
-def _save_graph(g: Dict) -> None:
-    _save_json(_BDG_PATH(), g)
-
-
-def bdg_add_node(belief_id: str, claim: str, confidence: float) -> None:
-    g = _load_graph()
-    g["nodes"][belief_id] = {
-        "id": belief_id,
-        "claim": claim,
-        "confidence": confidence,
-        "updated_at": _utc(),
-    }
-    _save_graph(g)
-
-
-def bdg_add_dependency(from_id: str, to_id: str, strength: float = 1.0) -> None:
-    g = _load_graph()
-    edge = {"from": from_id, "to": to_id, "strength": strength, "created_at": _utc()}
-    if edge not in g["edges"]:
-        g["edges"].append(edge)
-    _save_graph(g)
-
+    def export(self) -> Dict:
+        with self._lock:
+            return {
+                "nodes": dict(self._nodes),
+                "edges": [e for deps in self._deps.values() for e in deps.values()],
+            }
 
-def bdg_cascade(weakened_id: str, old_conf: float, new_conf: float) -> List[Dict]:
-    g = _load_graph()
-    delta = new_conf - old_conf
-    affected = []
-    for edge in g["edges"]:
-        if edge["to"] == weakened_id:
-            dep = g["nodes"].get(edge["from"])
-            if dep:
-                implied_delta = delta * edge["strength"]
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {"nodes": len(self._nodes), "edges": self._edge_count}
+
+    def snapshot(self) -> None:
+        with self._lock:
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            _save_json(tmp, self.export())
+            os.replace(tmp, self.path)
+            # Replaying the WAL over the snapshot is idempotent, so a crash
+            # between these two steps loses nothing.
+            _rewrite_jsonl(self.wal_path, [])
+            self._wal_rows = 0
+
+    def cascade(
+        self,
+        weakened_id: str,
+        delta: float,
+        damping: float,
+        threshold: float,
+        max_depth: Optional[int],
+    ) -> List[Dict]:
+        """Propagate ``delta`` to every transitive dependent of ``weakened_id``.
+
+        Each hop multiplies the implied delta by the edge strength, and every
+        hop past the first also by ``damping``.  Nodes are settled strongest
+        impact first, so each belief is reported once (along its strongest
+        path) and cycles terminate; branches whose impact falls below
+        ``threshold`` are cut off.
+        """
+        with self._lock:
+            origin = self._nodes.get(weakened_id, {}).get("claim", "?")[:60]
+            settled = {weakened_id}
+            heap: List[Tuple[float, int, str, float, int, str]] = []
+            seq = 0
+
+            def _push(src: str, impact: float, hops: int) -> None:
+                nonlocal seq
+                for dep_id, edge in self._dependents.get(src, {}).items():
+                    if dep_id in settled or dep_id not in self._nodes:
+                        continue
+                    implied = impact * edge.get("strength", 1.0)
+                    if hops:
+                        implied *= damping
+                    if abs(implied) < threshold:
+                        continue
+                    seq += 1
+                    heapq.heappush(heap, (-abs(implied), seq, dep_id, implied, hops + 1, src))
+
+            _push(weakened_id, delta, 0)
+            affected = []
+            while heap:
+                _, _, dep_id, implied, hops, via = heapq.heappop(heap)
+                if dep_id in settled:
+                    continue
+                settled.add(dep_id)
+                dep = self._nodes[dep_id]
+                if hops == 1:
+                    reason = f"Upstream belief '{origin}' changed by {delta:+.2f}"
+                else:
+                    reason = (
+                        f"Upstream belief '{origin}' changed by {delta:+.2f} "
+                        f"({hops} hops via '{via}')"
+                    )
                 affected.append(
                     {
-                        "belief_id": dep["id"],
+                        "belief_id": dep_id,
                         "claim": dep["claim"],
                         "current_confidence": dep["confidence"],
-                        "implied_delta": round(implied_delta, 4),
+                        "implied_delta": round(implied, 4),
                         "suggested_confidence": round(
-                            max(0.0, min(1.0, dep["confidence"] + implied_delta)), 3
+                            max(0.0, min(1.0, dep["confidence"] + implied)), 3
                         ),
-                        "reason": f"Upstream belief '{g['nodes'].get(weakened_id, {}).get('claim','?')[:60]}' changed by {delta:+.2f}",
+                        "hops": hops,
+                        "via": via,
+                        "reason": reason,
                     }
                 )
-    return affected
+                if max_depth is None or hops < max_depth:
+                    _push(dep_id, implied, hops)
+            return affected
+
+
+_graph: Optional[_BeliefGraph] = None
+_graph_lock = threading.Lock()
+
+
+def _belief_graph() -> _BeliefGraph:
+    global _graph
+    with _graph_lock:
+        path = _BDG_PATH()
+        if _graph is None or _graph.path != path:
+            _graph = _BeliefGraph(path, _BDG_WAL_PATH())
+        return _graph
+
+
+def _load_graph() -> Dict:
+    return _belief_graph().export()
+
+
+def bdg_add_node(belief_id: str, claim: str, confidence: float) -> None:
+    _belief_graph().add_node(belief_id, claim, confidence)
+
+
+def bdg_add_dependency(from_id: str, to_id: str, strength: float = 1.0) -> None:
+    _belief_graph().add_dependency(from_id, to_id, strength)
+
+
+def bdg_cascade(
+    weakened_id: str,
+    old_conf: float,
+    new_conf: float,
+    damping: float = _BDG_DAMPING,
+    threshold: float = _BDG_THRESHOLD,
+    max_depth: Optional[int] = None,
+) -> List[Dict]:
+    return _belief_graph().cascade(
+        weakened_id, new_conf - old_conf, damping, threshold, max_depth
+    )
 
 
 # ══════════════════════════════════════════════════════════════
@@ -750,15 +917,20 @@ async def add_dependency(payload: DependencyCreate):
 @router.get("/v1/cognition/belief-graph")
 async def get_belief_graph():
     g = _load_graph()
-    return {"ok": True, "nodes": len(g["nodes"]), "edges": len(g["edges"]), "graph": g}
+    counts = _belief_graph().counts()
+    return {"ok": True, "nodes": counts["nodes"], "edges": counts["edges"], "graph": g}
 
 
 @router.post("/v1/cognition/belief-graph/cascade/{belief_id}")
 async def cascade_from_belief(
-    belief_id: str, old_confidence: float = 0.8, new_confidence: float = 0.5
+    belief_id: str,
+    old_confidence: float = 0.8,
+    new_confidence: float = 0.5,
+    damping: float = _BDG_DAMPING,
+    threshold: float = _BDG_THRESHOLD,
+    max_depth: Optional[int] = None,
 ):
-    g = _load_graph()
-    node = g["nodes"].get(belief_id)
+    node = _belief_graph().get_node(belief_id)
     if not node:
         try:
             beliefs = _load_jsonl(_data_dir() / "beliefs.jsonl")
@@ -767,7 +939,9 @@ async def cascade_from_belief(
                 bdg_add_node(belief_id, b["claim"], b.get("confidence", 0.5))
         except Exception:
             pass
-    affected = bdg_cascade(belief_id, old_confidence, new_confidence)
+    affected = bdg_cascade(
+        belief_id, old_confidence, new_confidence, damping, threshold, max_depth
+    )
     return {
         "ok": True,
         "belief_id": belief_id,
@@ -1129,6 +1303,26 @@ async def list_memories():
     }
 
 
+@router.get("/v1/cognition/theorems/search")
+async def theorem_search(q: str, category: Optional[str] = None, k: int = 10):
+    from theorem_kb.query import search
+
+    k = max(1, min(k, 50))
+    results = search(q, k=k, categories=[category] if category else None)
+    return {"ok": True, "query": q, "results": results}
+
+
+@router.get("/v1/cognition/theorems/{slug}/related")
+async def theorem_related(slug: str, k: int = 5):
+    from theorem_kb.query import related
+
+    try:
+        results = related(slug, k=max(1, min(k, 50)))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="theorem not found")
+    return {"ok": True, "slug": slug, "related": results}
+
+
 @router.get("/v1/cognition/status")
 async def cognition_status():
     preds = _load_jsonl(_PRED_PATH())
@@ -30,9 +30,12 @@ import json
 import logging
 import os
 import re
+import threading
 import time
 import traceback
-from collections import Counter
+import weakref
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
@@ -49,7 +52,156 @@ logger = logging.getLogger(__name__)
 
 _COMPANION_CACHE_TTL_SEC = 12
 _COMPANION_CACHE_MAX = 128
-_companion_reply_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_COMPANION_NEAR_THRESHOLD = 0.8
+_COMPANION_ORDER_WINDOW = 3
+_STOP_WORDS = frozenset(
+    "a an and are as at be can check could current do does for from get give "
+    "how i if in is it me my now of on or please right show so tell that the "
+    "there this to up us was we what whats with would you your".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _prompt_shingles(prompt: str) -> Tuple[str, frozenset]:
+    """Canonical token signature and word-bigram shingles for ``prompt``.
+
+    Stop words and punctuation are dropped and tokens are sorted within
+    windows of ``_COMPANION_ORDER_WINDOW``, so "show me the mission status"
+    and "mission status?" normalize to the same signature.
+    """
+    tokens = [t for t in _TOKEN_RE.findall(prompt.lower()) if t not in _STOP_WORDS]
+    w = _COMPANION_ORDER_WINDOW
+    canon = [t for i in range(0, len(tokens), w) for t in sorted(tokens[i : i + w])]
+    if len(canon) < 2:
+        return " ".join(canon), frozenset(canon)
+    return " ".join(canon), frozenset(zip(canon, canon[1:]))
+
+
+class _ReplyCache:
+    """LRU + TTL cache of companion replies, namespaced per operator.
+
+    Lookups try the exact prompt first, then the canonical signature, then
+    near-duplicates whose shingle Jaccard similarity is at least
+    ``_COMPANION_NEAR_THRESHOLD`` (candidates come from a shingle index, so
+    only entries sharing a shingle are compared).
+    """
+
+    def __init__(self, max_entries: int, ttl_sec: float, threshold: float):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        # (namespace, prompt) -> (ts, payload, signature, shingles)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any], str, frozenset]]" = OrderedDict()
+        self._by_signature: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._by_shingle: Dict[Tuple[str, Any], set] = defaultdict(set)
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        ns = key[0]
+        if self._by_signature.get((ns, entry[2])) == key:
+            del self._by_signature[(ns, entry[2])]
+        for sh in entry[3]:
+            bucket = self._by_shingle.get((ns, sh))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._by_shingle[(ns, sh)]
+
+    def _live(self, key: Tuple[str, str], now: float) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry[0] > self.ttl_sec:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _near(self, ns: str, signature: str, shingles: frozenset, now: float):
+        key = self._by_signature.get((ns, signature))
+        if key is not None:
+            payload = self._live(key, now)
+            if payload is not None:
+                return payload
+        if not shingles:
+            return None
+        overlap: Dict[Tuple[str, str], int] = defaultdict(int)
+        for sh in shingles:
+            for cand in self._by_shingle.get((ns, sh), ()):
+                overlap[cand] += 1
+        best, best_score = None, self.threshold
+        for cand, shared in overlap.items():
+            other = self._entries[cand][3]
+            score = shared / (len(shingles) + len(other) - shared)
+            if score >= best_score:
+                best, best_score = cand, score
+        return self._live(best, now) if best is not None else None
+
+    def get(self, namespace: str, prompt: str) -> Optional[Dict[str, Any]]:
+        key = (namespace, prompt.strip().lower())
+        if not key[1]:
+            return None
+        now = time.time()
+        with self._lock:
+            payload = self._live(key, now)
+            if payload is not None:
+                self.hits += 1
+                return payload
+            signature, shingles = _prompt_shingles(key[1])
+            payload = self._near(namespace, signature, shingles, now) if signature else None
+            if payload is not None:
+                self.near_hits += 1
+                return payload
+            self.misses += 1
+            return None
+
+    def set(self, namespace: str, prompt: str, payload: Dict[str, Any]) -> None:
+        key = (namespace, prompt.strip().lower())
+        if not key[1]:
+            return
+        signature, shingles = _prompt_shingles(key[1])
+        with self._lock:
+            self._drop(key)
+            while len(self._entries) >= self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (time.time(), payload, signature, shingles)
+            if signature:
+                self._by_signature[(namespace, signature)] = key
+            for sh in shingles:
+                self._by_shingle[(namespace, sh)].add(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_signature.clear()
+            self._by_shingle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl_sec,
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.near_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+_companion_reply_cache = _ReplyCache(
+    _COMPANION_CACHE_MAX, _COMPANION_CACHE_TTL_SEC, _COMPANION_NEAR_THRESHOLD
+)
 
 
 def _compact_reply(text: str, max_chars: int = 320, max_sentences: int = 3) -> str:
@@ -66,28 +218,16 @@ def _compact_reply(text: str, max_chars: int = 320, max_sentences: int = 3) -> s
     return clean
 
 
-def _cache_get(prompt: str) -> Optional[Dict[str, Any]]:
-    key = prompt.strip().lower()
-    if not key:
-        return None
-    hit = _companion_reply_cache.get(key)
-    if not hit:
-        return None
-    ts, payload = hit
-    if (time.time() - ts) > _COMPANION_CACHE_TTL_SEC:
-        _companion_reply_cache.pop(key, None)
-        return None
-    return payload
+def _cache_namespace(operator_id: Optional[str] = None) -> str:
+    return operator_id or os.environ.get("NEXUSMON_OPERATOR", "operator")
+
 
+def _cache_get(prompt: str, operator_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    return _companion_reply_cache.get(_cache_namespace(operator_id), prompt)
 
-def _cache_set(prompt: str, payload: Dict[str, Any]) -> None:
-    key = prompt.strip().lower()
-    if not key:
-        return
-    if len(_companion_reply_cache) >= _COMPANION_CACHE_MAX:
-        oldest = min(_companion_reply_cache.items(), key=lambda item: item[1][0])[0]
-        _companion_reply_cache.pop(oldest, None)
-    _companion_reply_cache[key] = (time.time(), payload)
+
+def _cache_set(prompt: str, payload: Dict[str, Any], operator_id: Optional[str] = None) -> None:
+    _companion_reply_cache.set(_cache_namespace(operator_id), prompt, payload)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -341,6 +481,13 @@ def evolve(total: int, success: int, belief_count: int = 0) -> Tuple[Dict, List[
                   "xp": new_xp, "active_traits": new_traits, "level": new_level,
                   "total_missions": total, "success_count": success, "updated_at": _utc()})
     _save_json(path, state)
+    try:
+        from core.state_hub import publish_state
+        publish_state("organism", {"stage": new_stage, "stage_rank": state["stage_rank"],
+                                   "level": new_level, "xp": new_xp,
+                                   "active_traits": list(new_traits)})
+    except ImportError:
+        pass
     return state, events
 
 
@@ -617,11 +764,112 @@ def _beliefs_path() -> Path:
 # ══════════════════════════════════════════════════════════════
 
 _STEP_REGISTRY: Dict[str, Callable] = {}
+_STEP_SPECS: Dict[str, Dict[str, Any]] = {}
+
+# Blocking step handlers (LLM calls, file scans) run on this bounded pool so
+# they never hold the event loop.  Per-step-type semaphores cap how many of a
+# kind run at once.  The timeout clock starts when the handler begins, and a
+# timed-out blocking handler keeps its slot until its thread returns.
+_WORKER_THREADS = int(os.environ.get("NEXUSMON_WORKER_THREADS", "8"))
+_worker_pool: Optional[ThreadPoolExecutor] = None
+_worker_pool_lock = threading.Lock()
+_step_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def step(name: str, *, blocking: bool = False, timeout: Optional[float] = None,
+         concurrency: Optional[int] = None):
+    """Register a worker step.
+
+    blocking=True marks a synchronous handler that is run on the worker
+    thread pool; otherwise the handler is a coroutine awaited on the loop.
+    """
+    def dec(fn):
+        _STEP_REGISTRY[name] = fn
+        _STEP_SPECS[name] = {"blocking": blocking, "timeout": timeout,
+                             "concurrency": concurrency}
+        return fn
+    return dec
 
 
-def step(name: str):
-    def dec(fn): _STEP_REGISTRY[name] = fn; return fn
-    return dec
+def _get_worker_pool() -> ThreadPoolExecutor:
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = ThreadPoolExecutor(max_workers=max(1, _WORKER_THREADS),
+                                              thread_name_prefix="nexusmon-worker")
+        return _worker_pool
+
+
+def _step_semaphore(stype: str, limit: Optional[int]) -> Optional[asyncio.Semaphore]:
+    if not limit:
+        return None
+    loop = asyncio.get_running_loop()
+    per_loop = _step_semaphores.setdefault(loop, {})
+    sem = per_loop.get(stype)
+    if sem is None:
+        sem = per_loop[stype] = asyncio.Semaphore(limit)
+    return sem
+
+
+async def _run_blocking(handler: Callable, ctx: Dict, params: Dict,
+                        timeout: Optional[float],
+                        sem: Optional[asyncio.Semaphore]) -> Any:
+    """Run a sync handler on the worker pool.
+
+    A thread cannot be interrupted, so the semaphore slot is released by a
+    done-callback on the pool future rather than when the wait times out.
+    """
+    loop = asyncio.get_running_loop()
+    if sem is not None:
+        await sem.acquire()
+    started = loop.create_future()
+
+    def _mark_started():
+        if not started.done():
+            started.set_result(None)
+
+    def _run():
+        loop.call_soon_threadsafe(_mark_started)
+        return handler(ctx, params)
+
+    def _release(_done):
+        try:
+            loop.call_soon_threadsafe(sem.release)
+        except RuntimeError:  # loop already closed
+            pass
+
+    try:
+        cfut = _get_worker_pool().submit(_run)
+    except BaseException:
+        if sem is not None:
+            sem.release()
+        raise
+    if sem is not None:
+        cfut.add_done_callback(_release)
+    fut = asyncio.wrap_future(cfut)
+    try:
+        await started
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    return await asyncio.wait_for(fut, timeout)
+
+
+async def _execute_step(stype: str, handler: Callable, ctx: Dict, params: Dict) -> Any:
+    spec = _STEP_SPECS.get(stype, {})
+    timeout = spec.get("timeout")
+    sem = _step_semaphore(stype, spec.get("concurrency"))
+    try:
+        if spec.get("blocking"):
+            return await _run_blocking(handler, ctx, params, timeout, sem)
+        if sem is None:
+            return await asyncio.wait_for(handler(ctx, params), timeout)
+        async with sem:
+            return await asyncio.wait_for(handler(ctx, params), timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"step '{stype}' timed out after {timeout}s") from None
 
 
 @step("log")
@@ -630,8 +878,8 @@ async def _step_log(ctx, params):
     return {"logged": params.get("message", "")}
 
 
-@step("evolve_check")
-async def _step_evolve(ctx, params):
+@step("evolve_check", blocking=True, timeout=15, concurrency=2)
+def _step_evolve(ctx, params):
     try:
         missions = _load_jsonl(Path("data/missions.jsonl"))
         total = len(missions)
@@ -642,8 +890,8 @@ async def _step_evolve(ctx, params):
         return {"error": str(e)}
 
 
-@step("analyze_claim")
-async def _step_claim(ctx, params):
+@step("analyze_claim", blocking=True, timeout=60, concurrency=4)
+def _step_claim(ctx, params):
     claim = params.get("claim", "")
     if not claim:
         return {"error": "no claim"}
@@ -653,8 +901,8 @@ async def _step_claim(ctx, params):
         return {"claim": claim, "analysis": _analyze_claim_fallback(claim), "source": "heuristic"}
 
 
-@step("read_missions")
-async def _step_missions(ctx, params):
+@step("read_missions", blocking=True, timeout=15, concurrency=4)
+def _step_missions(ctx, params):
     missions = _load_jsonl(Path("data/missions.jsonl"))
     limit = params.get("limit", 10)
     sf = params.get("status")
@@ -663,8 +911,8 @@ async def _step_missions(ctx, params):
     return {"missions": missions[-limit:], "count": len(missions)}
 
 
-@step("summarize")
-async def _step_summarize(ctx, params):
+@step("summarize", blocking=True, timeout=60, concurrency=4)
+def _step_summarize(ctx, params):
     prev = ctx.get("last_output", {})
     try:
         from core.model_router import call as _model_call
@@ -696,22 +944,116 @@ def _plan(goal: str) -> List[Dict]:
             {"type": "summarize", "params": {}}]
 
 
+# ── Worker journal ────────────────────────────────────────────
+# Worker state is an append-only journal of small deltas folded into an
+# in-memory id index:
+#   {"op": "put",  "id": wid, "worker": {...}}           full record
+#   {"op": "set",  "id": wid, "fields": {...}}           top-level fields
+#   {"op": "step", "id": wid, "step": i, "fields": {...}, "log": {...}}
+# Legacy workers.jsonl rows are folded in first on load.  The journal is
+# compacted to one "put" per worker once dead rows dominate it.
+
+_JOURNAL_COMPACT_MIN = 1000
+
+
+class _WorkerJournal:
+    def __init__(self, data_dir: Path):
+        self.path = data_dir / "worker_journal.jsonl"
+        self.legacy_path = data_dir / "workers.jsonl"
+        self._lock = threading.RLock()
+        self._workers: Dict[str, Dict] = {}
+        self._rows = 0
+        self._load()
+
+    def _apply(self, rec: Dict) -> None:
+        wid = rec.get("id")
+        op = rec.get("op")
+        if op == "put":
+            self._workers[wid] = rec.get("worker") or {}
+            return
+        worker = self._workers.get(wid)
+        if worker is None:
+            return
+        if op == "set":
+            worker.update(rec.get("fields") or {})
+        elif op == "step":
+            idx = rec.get("step", -1)
+            steps = worker.get("steps") or []
+            if 0 <= idx < len(steps):
+                steps[idx].update(rec.get("fields") or {})
+            if rec.get("log"):
+                worker.setdefault("step_log", []).append(rec["log"])
+
+    def _load(self) -> None:
+        for w in _load_jsonl(self.legacy_path):
+            if "id" in w:
+                self._workers[w["id"]] = w
+        for rec in _load_jsonl(self.path):
+            self._apply(rec)
+            self._rows += 1
+
+    def _write(self, rec: Dict) -> None:
+        self._apply(rec)
+        _append_jsonl(self.path, rec)
+        self._rows += 1
+        if self._rows >= max(_JOURNAL_COMPACT_MIN, 4 * len(self._workers)):
+            self.compact()
+
+    def put(self, worker: Dict) -> None:
+        with self._lock:
+            self._write({"op": "put", "id": worker["id"], "worker": worker})
+
+    def set(self, wid: str, **fields: Any) -> None:
+        with self._lock:
+            self._write({"op": "set", "id": wid, "fields": fields})
+
+    def step(self, wid: str, index: int, fields: Dict, log: Dict) -> None:
+        with self._lock:
+            self._write({"op": "step", "id": wid, "step": index,
+                         "fields": fields, "log": log})
+
+    def get(self, wid: str) -> Optional[Dict]:
+        with self._lock:
+            return self._workers.get(wid)
+
+    def all(self) -> List[Dict]:
+        with self._lock:
+            return list(self._workers.values())
+
+    def compact(self) -> None:
+        with self._lock:
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            _rewrite_jsonl(tmp, [{"op": "put", "id": wid, "worker": w}
+                                 for wid, w in self._workers.items()])
+            os.replace(tmp, self.path)
+            self._rows = len(self._workers)
+
+
+_journal: Optional[_WorkerJournal] = None
+_journal_lock = threading.Lock()
+
+
+def _worker_journal() -> _WorkerJournal:
+    global _journal
+    with _journal_lock:
+        data_dir = _data_dir()
+        if _journal is None or _journal.path.parent != data_dir:
+            _journal = _WorkerJournal(data_dir)
+        return _journal
+
+
+def list_workers() -> List[Dict]:
+    """All known workers, oldest first, from the in-memory journal index."""
+    return _worker_journal().all()
+
+
 async def _run(worker: Dict, autonomous: bool) -> None:
-    wpath = _data_dir() / "workers.jsonl"
-    worker["status"] = "RUNNING"
-    worker["started_at"] = _utc()
-    ctx: Dict = {"id": worker["id"], "last_output": {}}
-
-    def _persist():
-        workers = _load_jsonl(wpath)
-        idx = next((i for i, w in enumerate(workers) if w["id"] == worker["id"]), None)
-        if idx is not None:
-            workers[idx] = worker
-            _rewrite_jsonl(wpath, workers)
-        else:
-            _append_jsonl(wpath, worker)
+    journal = _worker_journal()
+    wid = worker["id"]
+    journal.set(wid, status="RUNNING", started_at=_utc())
+    worker = journal.get(wid) or worker
+    ctx: Dict = {"id": wid, "last_output": {}}
 
-    _persist()
     try:
         for i, step_def in enumerate(worker["steps"]):
             stype = step_def["type"]
@@ -719,36 +1061,34 @@ async def _run(worker: Dict, autonomous: bool) -> None:
             if not handler:
                 raise ValueError(f"Unknown step: {stype}")
             try:
-                out = await handler(ctx, step_def.get("params", {}))
-                step_def.update({"status": "COMPLETED", "output": out})
+                out = await _execute_step(stype, handler, ctx, step_def.get("params", {}))
                 ctx["last_output"] = out
-                worker["step_log"].append({"step": i, "type": stype, "status": "COMPLETED", "output": out, "ts": _utc()})
+                journal.step(wid, i, {"status": "COMPLETED", "output": out},
+                             {"step": i, "type": stype, "status": "COMPLETED", "output": out, "ts": _utc()})
             except Exception as e:
-                step_def["status"] = "FAILED"
-                step_def["error"] = str(e)
-                worker["step_log"].append({"step": i, "type": stype, "status": "FAILED", "error": str(e), "ts": _utc()})
+                journal.step(wid, i, {"status": "FAILED", "error": str(e)},
+                             {"step": i, "type": stype, "status": "FAILED", "error": str(e), "ts": _utc()})
                 if not autonomous:
                     raise
-            _persist()
             if not autonomous and i < len(worker["steps"]) - 1:
-                worker["status"] = "PAUSED"
-                _persist()
+                journal.set(wid, status="PAUSED")
                 return
-        worker.update({"status": "COMPLETED", "completed_at": _utc(), "output": ctx.get("last_output", {})})
+        journal.set(wid, status="COMPLETED", completed_at=_utc(),
+                    output=ctx.get("last_output", {}))
         try:
             from nexusmon_artifact_vault import store_artifact
             store_artifact(
-                mission_id=worker.get("id"),
-                task_id=worker.get("id"),
+                mission_id=wid,
+                task_id=wid,
                 type="LOG",
-                title=f"Worker {worker['id']} output",
+                title=f"Worker {wid} output",
                 content=worker.get("output", {}),
                 input_snapshot={"goal": worker.get("goal"), "steps": worker.get("steps", [])}
             )
         except Exception:
             pass
         try:
-            all_w = _load_jsonl(_data_dir() / "workers.jsonl")
+            all_w = journal.all()
             total_w = len(all_w)
             success_w = sum(1 for w in all_w if w.get("status") == "COMPLETED")
             beliefs_count = len([b for b in _load_jsonl(_beliefs_path()) if b.get("status") == "active"])
@@ -756,8 +1096,7 @@ async def _run(worker: Dict, autonomous: bool) -> None:
         except Exception:
             pass
     except Exception as e:
-        worker.update({"status": "FAILED", "error": str(e), "completed_at": _utc()})
-    _persist()
+        journal.set(wid, status="FAILED", error=str(e), completed_at=_utc())
 
 
 def spawn_worker(goal: str, steps: Optional[List[Dict]] = None, autonomous: bool = True) -> Dict:
@@ -769,7 +1108,7 @@ def spawn_worker(goal: str, steps: Optional[List[Dict]] = None, autonomous: bool
         "step_log": [], "output": None, "error": None,
         "created_at": _utc(), "started_at": None, "completed_at": None,
     }
-    _append_jsonl(_data_dir() / "workers.jsonl", worker)
+    _worker_journal().put(worker)
     try:
         loop = asyncio.get_event_loop()
         if loop.is_running():
@@ -814,7 +1153,7 @@ async def organism_status():
     beliefs = _load_jsonl(_beliefs_path())
     state, _ = evolve(total, success, len(beliefs))
 
-    workers = _load_jsonl(_data_dir() / "workers.jsonl")
+    workers = list_workers()
     active = [w for w in workers if w.get("status") == "RUNNING"]
 
     return {
@@ -891,7 +1230,7 @@ async def spawn(payload: WorkerSpawn):
 
 @router.get("/v1/nexusmon/organism/worker")
 async def list_all_workers(limit: int = 20, status: Optional[str] = None):
-    workers = _load_jsonl(_data_dir() / "workers.jsonl")
+    workers = list_workers()
     if status:
         workers = [w for w in workers if w.get("status") == status]
     workers.sort(key=lambda w: w.get("created_at", ""), reverse=True)
@@ -900,7 +1239,7 @@ async def list_all_workers(limit: int = 20, status: Optional[str] = None):
 
 @router.get("/v1/nexusmon/organism/worker/{wid}")
 async def get_single_worker(wid: str):
-    worker = next((w for w in _load_jsonl(_data_dir() / "workers.jsonl") if w["id"] == wid), None)
+    worker = _worker_journal().get(wid)
     if not worker:
         raise HTTPException(404, f"Worker {wid} not found")
     return {"ok": True, "worker": worker}
@@ -908,13 +1247,11 @@ async def get_single_worker(wid: str):
 
 @router.delete("/v1/nexusmon/organism/worker/{wid}")
 async def cancel(wid: str):
-    workers = _load_jsonl(_data_dir() / "workers.jsonl")
-    for w in workers:
-        if w["id"] == wid and w.get("status") in ("QUEUED", "PAUSED"):
-            w["status"] = "CANCELLED"
-            w["completed_at"] = _utc()
-            _rewrite_jsonl(_data_dir() / "workers.jsonl", workers)
-            return {"ok": True, "worker_id": wid, "status": "CANCELLED"}
+    journal = _worker_journal()
+    w = journal.get(wid)
+    if w and w.get("status") in ("QUEUED", "PAUSED"):
+        journal.set(wid, status="CANCELLED", completed_at=_utc())
+        return {"ok": True, "worker_id": wid, "status": "CANCELLED"}
     raise HTTPException(400, "Worker not cancellable")
 
 
@@ -1108,6 +1445,11 @@ async def infuse_pattern(req: InfusionRequest):
 
 # ── Fused Companion Logic Update for Rank N ———————————————————
 
+@router.get("/v1/nexusmon/organism/companion/cache")
+async def companion_cache_stats():
+    return {"ok": True, "cache": _companion_reply_cache.stats()}
+
+
 @router.post("/v1/nexusmon/organism/companion")
 async def fused_companion(request: Request):
     """
@@ -1119,7 +1461,8 @@ async def fused_companion(request: Request):
     if not text:
         return JSONResponse({"ok": False, "error": "Empty message"}, status_code=400)
 
-    cached = _cache_get(text)
+    operator_id = data.get("operator_id")
+    cached = _cache_get(text, operator_id)
     if cached:
         return JSONResponse(cached)
 
@@ -1132,7 +1475,7 @@ async def fused_companion(request: Request):
         reply = _compact_reply(result.get("reply", ""))
         ctx_record_message(reply, "nexusmon")
         payload = {"ok": True, "reply": reply, "source": result.get("source", "companion"), "fused": True}
-        _cache_set(text, payload)
+        _cache_set(text, payload, operator_id)
         return JSONResponse(payload)
     except Exception:
         pass
@@ -1266,7 +1609,7 @@ Respond as NEXUSMON. Direct. Tactical. Aware of operator history. Use reflection
 
         ctx_record_message(reply, "nexusmon")
         payload = {"ok": True, "reply": reply, "source": "nexusmon_fused"}
-        _cache_set(text, payload)
+        _cache_set(text, payload, operator_id)
         return JSONResponse(payload)
     except Exception as e:
         return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
@@ -82,12 +82,11 @@ async def cockpit_snapshot():
             evo_status,
             ctx_status,
             _load_jsonl,
-            _data_dir,
             _beliefs_path,
+            list_workers,
         )
-        from pathlib import Path
 
-        workers = _load_jsonl(_data_dir() / "workers.jsonl")
+        workers = list_workers()
         active = [w for w in workers if w.get("status") == "RUNNING"]
         beliefs = _load_jsonl(_beliefs_path())
         result["organism"] = {
@@ -0,0 +1,21 @@
+"""Build the compiled symbolic registry index (run at deploy time)."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def main() -> int:
+    from backend.symbolic_registry import build_compiled_index
+
+    target = build_compiled_index()
+    print(f"wrote {target.relative_to(PROJECT_ROOT)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,7 @@ from typing import Optional, List, Dict, Any
 
 from galileo.run import run_galileo
 from galileo.storage import ensure_storage
+from theorem_kb.query import search as search_theorems
 from swarmz_runtime.api.galileo_storage_shim import (
     read_hypotheses,
     read_experiments,
@@ -67,3 +68,12 @@ def galileo_run_get(run_id: str) -> Dict[str, Any]:
         if r.get("run_id") == run_id:
             return r
     raise HTTPException(status_code=404, detail="run_id not found")
+
+
+@router.get("/theorems")
+def galileo_theorems(
+    q: str, category: Optional[str] = None, k: int = 10
+) -> List[Dict[str, Any]]:
+    """BM25-ranked theorems for grounding a hypothesis or claim."""
+    k = max(1, min(k, 50))
+    return search_theorems(q, k=k, categories=[category] if category else None)
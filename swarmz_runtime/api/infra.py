@@ -57,7 +57,10 @@ def ingest_metrics(sample: InfraMetricSample):
 
 @router.get("/overview")
 def infra_overview(limit: int = 500):
-    """Return a coarse infra overview derived from recent metrics."""
+    """Return a coarse infra overview derived from recent metrics.
+
+    ``limit`` is the number of recent samples averaged per node.
+    """
 
     if not _infra_enabled():
         raise HTTPException(status_code=404, detail="infra orchestrator disabled")
@@ -66,6 +69,25 @@ def infra_overview(limit: int = 500):
     return overview
 
 
+@router.get("/series")
+def infra_series(node_id: str, field: str = "cpu", resolution: str = "1m"):
+    """Return min/max/avg/p95 rollups for one node metric."""
+
+    if not _infra_enabled():
+        raise HTTPException(status_code=404, detail="infra orchestrator disabled")
+
+    try:
+        buckets = infra_metrics.get_infra_series(node_id, field, resolution)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {
+        "node_id": node_id,
+        "field": field,
+        "resolution": resolution,
+        "buckets": buckets,
+    }
+
+
 @router.get("/events")
 def infra_events(limit: int = 100):
     """Return the tail of raw infra events for debugging/inspection."""
@@ -11,8 +11,9 @@ from pydantic import BaseModel, Field
 from swarmz_runtime.core.operational_runtime import (
     OperationalRuntime,
     _extract_event_id,
-    is_already_processed,
+    claim_event,
     mark_processed,
+    release_event,
     verify_webhook_signature,
 )
 
@@ -123,18 +124,22 @@ async def payment_webhook(request: Request):
         raise HTTPException(status_code=400, detail="Invalid webhook payload") from exc
 
     event_id = _extract_event_id(payload)
-    if is_already_processed(event_id):
+    if not claim_event(event_id):
         _log_security_event("webhook_replay", request, event_id=event_id)
         return {"status": "already_processed"}
 
-    order_id = payload.get("order_id")
-    event = payload.get("event")
-    if not isinstance(order_id, str) or not isinstance(event, str):
-        raise HTTPException(status_code=400, detail="Missing order_id or event")
-
-    result = _runtime.payment_webhook(order_id, event)
-    if "error" in result:
-        raise HTTPException(status_code=400, detail=result["error"])
+    try:
+        order_id = payload.get("order_id")
+        event = payload.get("event")
+        if not isinstance(order_id, str) or not isinstance(event, str):
+            raise HTTPException(status_code=400, detail="Missing order_id or event")
+
+        result = _runtime.payment_webhook(order_id, event)
+        if "error" in result:
+            raise HTTPException(status_code=400, detail=result["error"])
+    except BaseException:
+        release_event(event_id)
+        raise
     mark_processed(event_id)
     return result
 
@@ -8,6 +8,7 @@ import time
 from pathlib import Path
 from fastapi import APIRouter, Request, HTTPException
 
+from swarmz_runtime.core import telemetry
 from swarmz_runtime.verify import provenance
 
 router = APIRouter()
@@ -49,3 +50,14 @@ def perf_bench():
     with bench_file.open("a", encoding="utf-8") as f:
         f.write(str(row) + "\n")
     return row
+
+
+@router.get("/v1/perf/metrics")
+def perf_metrics():
+    """Rolling p50/p95/p99 latencies and event rates from the in-process registry."""
+    return {"ok": True, **telemetry.metrics_summary()}
+
+
+@router.get("/v1/perf/metrics/{name}")
+def perf_metric(name: str):
+    return {"ok": True, **telemetry.get_metrics_registry().duration_summary(name)}
@@ -25,6 +25,7 @@ from kernel_runtime.orchestrator import SwarmzOrchestrator
 from swarmz_runtime.api import admin, ecosystem, system
 from swarmz_runtime.core.engine import SwarmzEngine
 from swarmz_runtime.core.system_primitives import SystemPrimitivesRuntime
+from swarmz_runtime.storage.async_io import get_loop_lag_monitor
 
 from . import arena as arena_api
 from .admin import router as admin_router
@@ -69,8 +70,11 @@ async def lifespan(app: FastAPI):
     mounts = getattr(app.state, "active_mounts", [])
     active = mounts if mounts else ["none - cockpit offline"]
     logger.info("[NEXUSMON] Active mounts: %s", active)
+    lag_monitor = get_loop_lag_monitor()
+    lag_monitor.ensure_running()
     yield
     # shutdown: optional cleanup
+    lag_monitor.stop()
 
 
 def create_app() -> FastAPI:
@@ -901,6 +905,11 @@ def dispatch(req: DispatchRequest, request: Request):
     return {"created": created, "run": run, "contract": contract["validation"]}
 
 
+@app.get("/v1/runtime/loop_lag")
+def runtime_loop_lag():
+    return {"ok": True, "loop_lag": get_loop_lag_monitor().stats()}
+
+
 @app.get("/v1/audit/tail")
 def audit_tail(limit: int = 10):
     lim = max(1, min(limit, 500))
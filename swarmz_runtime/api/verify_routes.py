@@ -15,11 +15,11 @@ def _require_operator(request: Request):
 
 
 @router.post("/v1/verify/kernel")
-def verify_kernel(strict: bool = True, request: Request = None):
+def verify_kernel(strict: bool = True, full: bool = False, request: Request = None):
     """Validate kernel integrity with strict gate checking."""
     try:
         # Run comprehensive kernel validation
-        kernel_status = runner.verify_kernel_integrity(strict=strict)
+        kernel_status = runner.verify_kernel_integrity(strict=strict, full=full)
 
         if strict and not kernel_status.get("integrity_passed", False):
             raise HTTPException(
@@ -53,8 +53,9 @@ def verify_run():
 
 
 @router.post("/v1/verify/replay")
-def verify_replay():
-    return runner.replay_audit()
+def verify_replay(full: bool = False):
+    """Replay the audit log; ``full`` re-hashes the whole chain from genesis."""
+    return runner.replay_audit(full=full)
 
 
 @router.post("/v1/patchpacks/generate")
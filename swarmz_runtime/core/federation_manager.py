@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import heapq
 import json
 import secrets
+import threading
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 class FederationManager:
+    """Organism federation backed by append-only JSONL logs.
+
+    Reads are served from a materialized latest-state table with per-status
+    counters and running metric aggregates.  The table follows each log by
+    byte offset, so every call folds in only rows appended since the last
+    one (including rows written by other processes).
+    """
+
     def __init__(self, root_dir: Path):
         self._root_dir = root_dir
         self._base = root_dir / "data" / "federation"
@@ -19,6 +30,19 @@ class FederationManager:
         self._metrics = self._base / "organism_metrics.jsonl"
         self._insights = self._base / "global_insights.jsonl"
 
+        self._lock = threading.RLock()
+        self._offsets: Dict[Path, int] = {}
+        self._table: Dict[str, Dict[str, Any]] = {}
+        # organism_id -> (status, autonomy dial) as counted in the aggregates
+        self._contrib: Dict[str, Tuple[str, float]] = {}
+        self._status_counts: Counter = Counter()
+        self._autonomy_sum = 0.0
+        self._metric_events = 0
+        self._metric_successes = 0
+        self._metric_incidents = 0
+        self._metric_compliant = 0
+        self._latest_insight: Optional[Dict[str, Any]] = None
+
     @staticmethod
     def _now() -> str:
         return datetime.now(timezone.utc).isoformat()
@@ -29,31 +53,97 @@ class FederationManager:
         with path.open("a", encoding="utf-8") as fh:
             fh.write(json.dumps(record) + "\n")
 
-    @staticmethod
-    def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
-        if not path.exists():
-            return []
-        rows: List[Dict[str, Any]] = []
-        with path.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    rows.append(json.loads(line))
-                except Exception:
-                    continue
-        return rows
+    def _follow(self, path: Path, apply: Callable[[Dict[str, Any]], None]) -> bool:
+        """Fold rows appended to *path* since the last call into the table.
 
-    @staticmethod
-    def _latest_by_id(
-        rows: List[Dict[str, Any]], key: str = "id"
-    ) -> Dict[str, Dict[str, Any]]:
-        latest: Dict[str, Dict[str, Any]] = {}
-        for row in rows:
-            if key in row:
-                latest[row[key]] = row
-        return latest
+        Returns ``False`` if the log shrank (rewritten or truncated); the
+        caller must then rebuild from scratch.
+        """
+        offset = self._offsets.get(path, 0)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return offset == 0
+        if size < offset:
+            return False
+        if size == offset:
+            return True
+        with path.open("rb") as fh:
+            fh.seek(offset)
+            chunk = fh.read(size - offset)
+        end = chunk.rfind(b"\n")
+        if end == -1:
+            return True  # a writer is mid-line; pick it up next time
+        for line in chunk[: end + 1].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(row, dict):
+                apply(row)
+        self._offsets[path] = offset + end + 1
+        return True
+
+    def _apply_organism(self, row: Dict[str, Any]) -> None:
+        organism_id = row.get("id")
+        if organism_id is None:
+            return
+        previous = self._contrib.get(organism_id)
+        if previous is not None:
+            self._status_counts[previous[0]] -= 1
+            self._autonomy_sum -= previous[1]
+        status = str(row.get("status"))
+        autonomy = float((row.get("autonomy") or {}).get("dial", 0))
+        self._status_counts[status] += 1
+        self._autonomy_sum += autonomy
+        self._contrib[organism_id] = (status, autonomy)
+        self._table[organism_id] = row
+
+    def _apply_metric(self, row: Dict[str, Any]) -> None:
+        metrics = row.get("metrics_json") or {}
+        self._metric_events += 1
+        if metrics.get("mission_success"):
+            self._metric_successes += 1
+        if metrics.get("policy_compliance"):
+            self._metric_compliant += 1
+        try:
+            self._metric_incidents += int(metrics.get("incidents", 0) or 0)
+        except (TypeError, ValueError):
+            pass
+
+    def _apply_insight(self, row: Dict[str, Any]) -> None:
+        self._latest_insight = row
+
+    def _reset_organisms(self) -> None:
+        self._offsets.pop(self._organisms, None)
+        self._table.clear()
+        self._contrib.clear()
+        self._status_counts.clear()
+        self._autonomy_sum = 0.0
+
+    def _reset_metrics(self) -> None:
+        self._offsets.pop(self._metrics, None)
+        self._metric_events = 0
+        self._metric_successes = 0
+        self._metric_incidents = 0
+        self._metric_compliant = 0
+
+    def _reset_insights(self) -> None:
+        self._offsets.pop(self._insights, None)
+        self._latest_insight = None
+
+    def _refresh(self) -> None:
+        for path, apply, reset in (
+            (self._organisms, self._apply_organism, self._reset_organisms),
+            (self._metrics, self._apply_metric, self._reset_metrics),
+            (self._insights, self._apply_insight, self._reset_insights),
+        ):
+            if not self._follow(path, apply):
+                reset()
+                self._follow(path, apply)
 
     def create_organism(
         self, name: str, owner_id: str, config_json: Optional[Dict[str, Any]] = None
@@ -106,12 +196,20 @@ class FederationManager:
         }
 
     def get_organism(self, organism_id: str) -> Optional[Dict[str, Any]]:
-        latest = self._latest_by_id(self._read_jsonl(self._organisms))
-        return latest.get(organism_id)
+        with self._lock:
+            self._refresh()
+            row = self._table.get(organism_id)
+            return dict(row) if row is not None else None
 
     def list_organisms(self) -> List[Dict[str, Any]]:
-        latest = self._latest_by_id(self._read_jsonl(self._organisms))
-        return list(latest.values())
+        with self._lock:
+            self._refresh()
+            return [dict(row) for row in self._table.values()]
+
+    def status_counts(self) -> Dict[str, int]:
+        with self._lock:
+            self._refresh()
+            return {k: v for k, v in self._status_counts.items() if v}
 
     def pause_organism(
         self, organism_id: str, reason: str = "operator_command"
@@ -190,48 +288,47 @@ class FederationManager:
         return organism
 
     def aggregate_metrics(self) -> Dict[str, Any]:
-        organisms = self.list_organisms()
-        metrics = self._read_jsonl(self._metrics)
-
-        active = sum(1 for o in organisms if o.get("status") == "active")
-        paused = sum(1 for o in organisms if o.get("status") == "paused")
-        retired = sum(1 for o in organisms if o.get("status") == "retired")
-
-        avg_autonomy = 0.0
-        if organisms:
-            avg_autonomy = sum(
-                float(o.get("autonomy", {}).get("dial", 0)) for o in organisms
-            ) / len(organisms)
-
-        return {
-            "organism_count": len(organisms),
-            "active": active,
-            "paused": paused,
-            "retired": retired,
-            "average_autonomy_dial": round(avg_autonomy, 2),
-            "metric_events": len(metrics),
-        }
+        with self._lock:
+            self._refresh()
+            count = len(self._table)
+            events = self._metric_events
+            avg_autonomy = self._autonomy_sum / count if count else 0.0
+            return {
+                "organism_count": count,
+                "active": self._status_counts["active"],
+                "paused": self._status_counts["paused"],
+                "retired": self._status_counts["retired"],
+                "average_autonomy_dial": round(avg_autonomy, 2),
+                "metric_events": events,
+                "mission_success_rate": (
+                    round(self._metric_successes / events, 4) if events else 0.0
+                ),
+                "policy_compliance_rate": (
+                    round(self._metric_compliant / events, 4) if events else 0.0
+                ),
+                "incident_total": self._metric_incidents,
+            }
 
     def generate_nightly_insights(
         self, outcomes: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         rows = outcomes or []
-        winners = sorted(
+        winners = heapq.nlargest(
+            5,
             rows,
             key=lambda r: (
                 float(r.get("margin", 0.0)),
                 float(r.get("conversion", 0.0)),
             ),
-            reverse=True,
-        )[:5]
-        failures = sorted(
+        )
+        failures = heapq.nlargest(
+            5,
             rows,
             key=lambda r: (
                 float(r.get("refund_rate", 0.0)),
                 -float(r.get("sla_adherence", 0.0)),
             ),
-            reverse=True,
-        )[:5]
+        )
 
         insight = {
             "id": f"ins-{secrets.token_hex(4)}",
@@ -258,5 +355,6 @@ class FederationManager:
         return insight
 
     def latest_insights(self) -> Optional[Dict[str, Any]]:
-        rows = self._read_jsonl(self._insights)
-        return rows[-1] if rows else None
+        with self._lock:
+            self._refresh()
+            return self._latest_insight
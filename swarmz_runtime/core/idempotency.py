@@ -0,0 +1,354 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Idempotency stores for webhook event processing.
+
+Two backends share one interface:
+
+- ``JsonlIdempotencyStore`` keeps processed event ids in an in-memory hash
+  set behind a Bloom-filter pre-check, warmed once from the append-only
+  JSONL log.  Entries expire after a TTL: committed rows are queued in
+  log order, so expired ones leave memory as new commits arrive, and the
+  log is compacted once expired rows dominate it (or at least once per
+  TTL while any are present).  Atomicity is per process.
+- ``SqliteIdempotencyStore`` keeps ids in a SQLite table with the event id
+  as primary key, so several workers can share one store and
+  ``claim`` stays atomic across processes.
+
+Processing follows claim -> commit | release: ``claim`` reserves the id
+(returns ``False`` if it is processed or already being processed),
+``commit`` records it as processed, and ``release`` drops the reservation
+so a failed delivery can be retried.  Reservations that are never
+committed lapse after ``lease_sec``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_TTL_SEC = 30 * 24 * 3600.0
+DEFAULT_LEASE_SEC = 300.0
+COMPACT_MIN_DEAD = 1024
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over SHA-256."""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def _parse_ts(raw: object) -> float | None:
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    if isinstance(raw, str):
+        try:
+            return datetime.fromisoformat(raw).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class JsonlIdempotencyStore:
+    """Hash set + Bloom filter over an append-only JSONL log."""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        lease_sec: float = DEFAULT_LEASE_SEC,
+        bloom_capacity: int = 100_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.ttl_sec = ttl_sec
+        self.lease_sec = lease_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bloom_capacity = bloom_capacity
+        self._bloom = BloomFilter(bloom_capacity)
+        self._processed: dict[str, float] = {}
+        self._pending: dict[str, float] = {}
+        # (processed_at, event_id) for unexpired log rows, oldest first.
+        self._row_times: deque[tuple[float, str]] = deque()
+        self._log_rows = 0
+        self._last_compact = clock()
+        self._warm()
+
+    def _warm(self) -> None:
+        if not self.path.exists():
+            return
+        cutoff = self._clock() - self.ttl_sec
+        with self.path.open("r", encoding="utf-8") as stream:
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._log_rows += 1
+                event_id = entry.get("event_id")
+                ts = _parse_ts(entry.get("processed_at"))
+                if not event_id:
+                    continue
+                if ts is None:
+                    ts = self._clock()
+                if ts >= cutoff:
+                    self._processed[str(event_id)] = ts
+                    self._row_times.append((ts, str(event_id)))
+        self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        self._bloom = BloomFilter(max(self._bloom_capacity, 2 * len(self._processed)))
+        for event_id in self._processed:
+            self._bloom.add(event_id)
+
+    def _expire(self, now: float) -> None:
+        """Drop ids whose newest row is past the TTL from memory."""
+        cutoff = now - self.ttl_sec
+        rows = self._row_times
+        while rows and rows[0][0] < cutoff:
+            ts, event_id = rows.popleft()
+            if self._processed.get(event_id) == ts:
+                del self._processed[event_id]
+
+    def _is_processed(self, event_id: str, now: float) -> bool:
+        if event_id not in self._bloom:
+            return False
+        ts = self._processed.get(event_id)
+        if ts is None:
+            return False
+        if now - ts > self.ttl_sec:
+            del self._processed[event_id]
+            return False
+        return True
+
+    def is_processed(self, event_id: str) -> bool:
+        with self._lock:
+            return self._is_processed(event_id, self._clock())
+
+    def claim(self, event_id: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            if self._is_processed(event_id, now):
+                return False
+            leased = self._pending.get(event_id)
+            if leased is not None and now - leased < self.lease_sec:
+                return False
+            self._pending[event_id] = now
+            return True
+
+    def release(self, event_id: str) -> None:
+        with self._lock:
+            self._pending.pop(event_id, None)
+
+    def commit(self, event_id: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._pending.pop(event_id, None)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as stream:
+                json.dump(
+                    {
+                        "event_id": event_id,
+                        "processed_at": datetime.fromtimestamp(now, UTC).isoformat(),
+                    },
+                    stream,
+                )
+                stream.write("\n")
+            self._processed[event_id] = now
+            self._row_times.append((now, event_id))
+            self._bloom.add(event_id)
+            self._log_rows += 1
+            if len(self._processed) > self._bloom_capacity:
+                self._bloom_capacity *= 2
+                self._rebuild_bloom()
+            self._expire(now)
+            dead = self._log_rows - len(self._processed)
+            if dead >= max(COMPACT_MIN_DEAD, len(self._processed)) or (
+                dead and now - self._last_compact >= self.ttl_sec
+            ):
+                self._compact(now)
+
+    def _compact(self, now: float) -> int:
+        self._expire(now)
+        cutoff = now - self.ttl_sec
+        live = {k: v for k, v in self._processed.items() if v >= cutoff}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as stream:
+            for event_id, ts in live.items():
+                json.dump(
+                    {
+                        "event_id": event_id,
+                        "processed_at": datetime.fromtimestamp(ts, UTC).isoformat(),
+                    },
+                    stream,
+                )
+                stream.write("\n")
+        os.replace(str(tmp), str(self.path))
+        dropped = self._log_rows - len(live)
+        self._processed = live
+        self._row_times = deque(sorted((ts, k) for k, ts in live.items()))
+        self._log_rows = len(live)
+        self._last_compact = now
+        self._rebuild_bloom()
+        return dropped
+
+    def compact(self) -> int:
+        """Drop expired rows from memory and the log; return rows removed."""
+        with self._lock:
+            if not self.path.exists():
+                return 0
+            return self._compact(self._clock())
+
+    def stats(self) -> dict[str, int | str]:
+        with self._lock:
+            return {
+                "backend": "jsonl",
+                "processed": len(self._processed),
+                "pending": len(self._pending),
+                "log_rows": self._log_rows,
+            }
+
+
+class SqliteIdempotencyStore:
+    """SQLite-backed store shared by multiple workers."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        lease_sec: float = DEFAULT_LEASE_SEC,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.lease_sec = lease_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_events ("
+            " event_id TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def is_processed(self, event_id: str) -> bool:
+        cutoff = self._clock() - self.ttl_sec
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM processed_events"
+                " WHERE event_id = ? AND state = 'done' AND updated_at >= ?",
+                (event_id, cutoff),
+            ).fetchone()
+        return row is not None
+
+    def claim(self, event_id: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Drop the row if it has expired or its lease lapsed, then
+                # insert; the primary key makes the insert the arbiter.
+                self.conn.execute(
+                    "DELETE FROM processed_events WHERE event_id = ? AND ("
+                    " (state = 'done' AND updated_at < ?) OR"
+                    " (state = 'pending' AND updated_at < ?))",
+                    (event_id, now - self.ttl_sec, now - self.lease_sec),
+                )
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO processed_events VALUES (?, 'pending', ?)",
+                    (event_id, now),
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return cur.rowcount == 1
+
+    def release(self, event_id: str) -> None:
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM processed_events WHERE event_id = ? AND state = 'pending'",
+                (event_id,),
+            )
+
+    def commit(self, event_id: str) -> None:
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO processed_events VALUES (?, 'done', ?)",
+                (event_id, self._clock()),
+            )
+
+    def compact(self) -> int:
+        now = self._clock()
+        with self._lock:
+            cur = self.conn.execute(
+                "DELETE FROM processed_events WHERE"
+                " (state = 'done' AND updated_at < ?) OR"
+                " (state = 'pending' AND updated_at < ?)",
+                (now - self.ttl_sec, now - self.lease_sec),
+            )
+        return cur.rowcount
+
+    def stats(self) -> dict[str, int | str]:
+        with self._lock:
+            rows = dict(
+                self.conn.execute(
+                    "SELECT state, COUNT(*) FROM processed_events GROUP BY state"
+                ).fetchall()
+            )
+        return {
+            "backend": "sqlite",
+            "processed": rows.get("done", 0),
+            "pending": rows.get("pending", 0),
+        }
+
+
+IdempotencyStore = JsonlIdempotencyStore | SqliteIdempotencyStore
+
+
+def build_store(jsonl_path: Path) -> IdempotencyStore:
+    """Select a backend from ``SWARMZ_IDEMPOTENCY_BACKEND`` (jsonl|sqlite)."""
+    ttl = float(os.environ.get("SWARMZ_IDEMPOTENCY_TTL_SEC", DEFAULT_TTL_SEC))
+    backend = os.environ.get("SWARMZ_IDEMPOTENCY_BACKEND", "jsonl").strip().lower()
+    if backend == "sqlite":
+        db_path = os.environ.get("SWARMZ_IDEMPOTENCY_DB") or str(
+            Path(jsonl_path).with_suffix(".db")
+        )
+        return SqliteIdempotencyStore(Path(db_path), ttl_sec=ttl)
+    return JsonlIdempotencyStore(Path(jsonl_path), ttl_sec=ttl)
@@ -5,6 +5,8 @@
 
 This module is intentionally thin: it records infra metrics as events in the
 append-only infra log and can build a simple overview for API consumers.
+Overview queries are served from the bounded in-memory store in
+``infra_timeseries`` rather than by re-reading the log.
 
 It does not perform any orchestration on its own; higher layers translate
 these summaries into missions or external actions.
@@ -12,13 +14,13 @@ these summaries into missions or external actions.
 
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Any, Dict, List
 
-from swarmz_runtime.storage.infra_state import append_infra_event, load_infra_events
+from swarmz_runtime.core.infra_timeseries import METRIC_FIELDS, get_infra_store
+from swarmz_runtime.storage.infra_state import append_infra_event
 
-_METRIC_FIELDS = ("cpu", "memory", "gpu", "disk", "net_rx", "net_tx")
+_METRIC_FIELDS = METRIC_FIELDS
 
 
 def record_infra_metrics(sample: Dict[str, Any]) -> None:
@@ -54,47 +56,32 @@ def record_infra_metrics(sample: Dict[str, Any]) -> None:
     if extras:
         event["extras"] = extras
 
+    # Resolve the store first so a cold store is warmed from the log
+    # before this event is appended (and not counted twice).
+    store = get_infra_store()
     append_infra_event(event)
+    store.add_event(event)
 
 
 def build_infra_overview(limit: int = 500) -> Dict[str, Any]:
-    """Return a coarse infra overview from recent metrics events.
+    """Return a coarse infra overview from recent metrics samples.
 
-    The overview is intentionally simple and conservative: it computes
-    per-node averages across the metrics present in the last *limit*
-    events and reports a few high-level aggregates.
+    The overview is intentionally simple and conservative: it reports
+    per-node averages and a few high-level aggregates.
+
+    *limit* is a per-node sample window: each node is averaged over its
+    own last *limit* samples, capped at ``infra_timeseries.RAW_CAPACITY``.
+    (Before the time-series store it meant the last *limit* events across
+    all nodes.)  Cost is O(nodes * fields) for any *limit*, independent of
+    how many samples have been ingested.
     """
 
-    limit = max(1, min(limit, 5000))
-    events = load_infra_events(limit=limit)
-    metrics = [e for e in events if e.get("type") == "metrics"]
-    if not metrics:
-        return {"nodes": [], "total_nodes": 0, "last_ts": None}
-
-    per_node: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    last_ts: str | None = None
-    for ev in metrics:
-        node_id = str(ev.get("node_id") or "unknown")
-        payload = ev.get("payload") or {}
-        per_node[node_id].append(payload)
-        ts = ev.get("ts")
-        if isinstance(ts, str):
-            last_ts = ts if last_ts is None or ts > last_ts else last_ts
-
-    nodes_summary: List[Dict[str, Any]] = []
-    for node_id, samples in per_node.items():
-        agg: Dict[str, Any] = {"node_id": node_id, "samples": len(samples)}
-        for field in _METRIC_FIELDS:
-            values = [
-                s[field] for s in samples if isinstance(s.get(field), (int, float))
-            ]
-            if values:
-                agg[f"avg_{field}"] = sum(values) / len(values)
-        nodes_summary.append(agg)
-
-    nodes_summary.sort(key=lambda n: n["node_id"])
-    return {
-        "nodes": nodes_summary,
-        "total_nodes": len(nodes_summary),
-        "last_ts": last_ts,
-    }
+    return get_infra_store().overview(window=limit)
+
+
+def get_infra_series(
+    node_id: str, field: str, resolution: str = "1m"
+) -> List[Dict[str, Any]]:
+    """Return min/max/avg/p95 rollup buckets for one node metric."""
+
+    return get_infra_store().series(node_id, field, resolution)
@@ -0,0 +1,363 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Bounded in-memory time-series store for infra metrics.
+
+Samples recorded through ``infra_metrics.record_infra_metrics`` are folded
+into per-node, per-field series:
+
+- a raw ring buffer of the most recent ``RAW_CAPACITY`` samples, kept in
+  compact ``array('d')`` storage with a running sum and per-slot prefix
+  sums, so the average over any window up to the capacity is O(1);
+- rollups at 1m / 5m / 1h resolution (min / max / avg / p95 / count), each
+  with its own bucket retention.
+
+The JSONL infra log stays the source of truth; the store is warmed from its
+tail once on first use.  Memory is bounded by
+``nodes * fields * (RAW_CAPACITY + sum(retention))`` regardless of how many
+samples have ever been ingested.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+METRIC_FIELDS = ("cpu", "memory", "gpu", "disk", "net_rx", "net_tx")
+
+RAW_CAPACITY = 512
+
+# name -> (bucket width in seconds, buckets retained)
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "1m": (60, 360),  # 6 hours
+    "5m": (300, 288),  # 24 hours
+    "1h": (3600, 168),  # 7 days
+}
+
+# Values kept per open bucket for the p95 estimate (reservoir sampled).
+BUCKET_RESERVOIR = 256
+
+WARM_LIMIT = 5000
+
+
+def _parse_ts(ts: Any) -> float:
+    if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+        return float(ts)
+    if isinstance(ts, str):
+        try:
+            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.timestamp()
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc).timestamp()
+
+
+def _p95(values: List[float]) -> float:
+    ordered = sorted(values)
+    rank = max(1, math.ceil(0.95 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _RawRing:
+    """Fixed-capacity ring of (ts, value) with running and prefix sums."""
+
+    __slots__ = ("capacity", "ts", "values", "cum", "head", "size", "total")
+
+    def __init__(self, capacity: int = RAW_CAPACITY) -> None:
+        self.capacity = capacity
+        self.ts = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        # cum[i]: sum of the retained samples up to and including slot i.
+        self.cum = array("d", bytes(8 * capacity))
+        self.head = 0
+        self.size = 0
+        self.total = 0.0
+
+    def push(self, ts: float, value: float) -> None:
+        last = self.cum[(self.head - 1) % self.capacity] if self.size else 0.0
+        if self.size == self.capacity:
+            self.total -= self.values[self.head]
+        else:
+            self.size += 1
+        self.ts[self.head] = ts
+        self.values[self.head] = value
+        self.cum[self.head] = last + value
+        self.total += value
+        self.head = (self.head + 1) % self.capacity
+        if self.head == 0:
+            self._reanchor()
+
+    def _reanchor(self) -> None:
+        # Once per lap: restart the prefix sums at the oldest retained sample
+        # and recompute the running sum, shedding float drift.
+        start = (self.head - self.size) % self.capacity
+        running = 0.0
+        for k in range(self.size):
+            i = (start + k) % self.capacity
+            running += self.values[i]
+            self.cum[i] = running
+        self.total = math.fsum(self.values[: self.size])
+
+    def tail(self, n: int) -> List[float]:
+        n = min(n, self.size)
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return list(self.values[start : start + n])
+        return list(self.values[start:]) + list(self.values[: self.head])
+
+    def mean(self, window: Optional[int] = None) -> Optional[float]:
+        if self.size == 0:
+            return None
+        if window is None or window >= self.size:
+            return self.total / self.size
+        latest = self.cum[(self.head - 1) % self.capacity]
+        before = self.cum[(self.head - 1 - window) % self.capacity]
+        return (latest - before) / window
+
+
+class _Rollup:
+    """Closed buckets for one resolution plus the currently open bucket."""
+
+    __slots__ = (
+        "width",
+        "retention",
+        "start",
+        "min",
+        "max",
+        "avg",
+        "p95",
+        "count",
+        "head",
+        "size",
+        "_open_start",
+        "_open_min",
+        "_open_max",
+        "_open_sum",
+        "_open_count",
+        "_open_values",
+        "_rng",
+    )
+
+    def __init__(self, width: int, retention: int, rng: random.Random) -> None:
+        self.width = width
+        self.retention = retention
+        self.start = array("q", bytes(8 * retention))
+        self.min = array("d", bytes(8 * retention))
+        self.max = array("d", bytes(8 * retention))
+        self.avg = array("d", bytes(8 * retention))
+        self.p95 = array("d", bytes(8 * retention))
+        self.count = array("q", bytes(8 * retention))
+        self.head = 0
+        self.size = 0
+        self._open_start: Optional[int] = None
+        self._open_values: List[float] = []
+        self._rng = rng
+        self._reset_open(None)
+
+    def _reset_open(self, start: Optional[int]) -> None:
+        self._open_start = start
+        self._open_min = math.inf
+        self._open_max = -math.inf
+        self._open_sum = 0.0
+        self._open_count = 0
+        self._open_values = []
+
+    def _close(self) -> None:
+        if self._open_start is None or self._open_count == 0:
+            return
+        i = self.head
+        self.start[i] = self._open_start
+        self.min[i] = self._open_min
+        self.max[i] = self._open_max
+        self.avg[i] = self._open_sum / self._open_count
+        self.p95[i] = _p95(self._open_values)
+        self.count[i] = self._open_count
+        self.head = (self.head + 1) % self.retention
+        self.size = min(self.size + 1, self.retention)
+
+    def add(self, ts: float, value: float) -> None:
+        bucket = int(ts // self.width) * self.width
+        if self._open_start is None:
+            self._reset_open(bucket)
+        elif bucket > self._open_start:
+            self._close()
+            self._reset_open(bucket)
+        # Late samples (bucket < open start) are folded into the open bucket.
+        self._open_min = min(self._open_min, value)
+        self._open_max = max(self._open_max, value)
+        self._open_sum += value
+        self._open_count += 1
+        if len(self._open_values) < BUCKET_RESERVOIR:
+            self._open_values.append(value)
+        else:
+            j = self._rng.randrange(self._open_count)
+            if j < BUCKET_RESERVOIR:
+                self._open_values[j] = value
+
+    def buckets(self, include_open: bool = True) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        first = (self.head - self.size) % self.retention
+        for k in range(self.size):
+            i = (first + k) % self.retention
+            out.append(
+                {
+                    "start": self.start[i],
+                    "min": self.min[i],
+                    "max": self.max[i],
+                    "avg": self.avg[i],
+                    "p95": self.p95[i],
+                    "count": self.count[i],
+                    "partial": False,
+                }
+            )
+        if include_open and self._open_count:
+            out.append(
+                {
+                    "start": self._open_start,
+                    "min": self._open_min,
+                    "max": self._open_max,
+                    "avg": self._open_sum / self._open_count,
+                    "p95": _p95(self._open_values),
+                    "count": self._open_count,
+                    "partial": True,
+                }
+            )
+        return out
+
+
+class _Series:
+    __slots__ = ("raw", "rollups")
+
+    def __init__(self, rng: random.Random) -> None:
+        self.raw = _RawRing()
+        self.rollups = {
+            name: _Rollup(width, retention, rng)
+            for name, (width, retention) in RESOLUTIONS.items()
+        }
+
+    def add(self, ts: float, value: float) -> None:
+        self.raw.push(ts, value)
+        for rollup in self.rollups.values():
+            rollup.add(ts, value)
+
+
+class InfraMetricsStore:
+    """Per-node, per-field ring buffers and rollups for infra metrics."""
+
+    def __init__(self, seed: int = 0) -> None:
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._node_events: Dict[str, int] = {}
+        self._last_ts: Optional[str] = None
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """Fold one ``type == "metrics"`` infra event into the store."""
+
+        if event.get("type") != "metrics":
+            return
+        node_id = str(event.get("node_id") or "unknown")
+        ts_raw = event.get("ts")
+        ts = _parse_ts(ts_raw)
+        payload = event.get("payload") or {}
+        with self._lock:
+            self._node_events[node_id] = self._node_events.get(node_id, 0) + 1
+            if isinstance(ts_raw, str) and (
+                self._last_ts is None or ts_raw > self._last_ts
+            ):
+                self._last_ts = ts_raw
+            for field in METRIC_FIELDS:
+                value = payload.get(field)
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                key = (node_id, field)
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _Series(self._rng)
+                series.add(ts, float(value))
+
+    def warm(self, events: Iterable[Dict[str, Any]]) -> None:
+        for event in events:
+            self.add_event(event)
+
+    def overview(self, window: Optional[int] = None) -> Dict[str, Any]:
+        """Per-node averages over the last ``window`` samples of each node.
+
+        ``window`` is capped at ``RAW_CAPACITY``; ``None`` uses the whole
+        ring.  Either way the cost is O(nodes * fields), answered from the
+        running and prefix sums.
+        """
+
+        if window is not None:
+            window = max(1, min(window, RAW_CAPACITY))
+        with self._lock:
+            if not self._node_events:
+                return {"nodes": [], "total_nodes": 0, "last_ts": None}
+            nodes_summary: List[Dict[str, Any]] = []
+            for node_id in sorted(self._node_events):
+                seen = self._node_events[node_id]
+                cap = RAW_CAPACITY if window is None else window
+                agg: Dict[str, Any] = {"node_id": node_id, "samples": min(seen, cap)}
+                for field in METRIC_FIELDS:
+                    series = self._series.get((node_id, field))
+                    if series is None:
+                        continue
+                    mean = series.raw.mean(window)
+                    if mean is not None:
+                        agg[f"avg_{field}"] = mean
+                nodes_summary.append(agg)
+            return {
+                "nodes": nodes_summary,
+                "total_nodes": len(nodes_summary),
+                "last_ts": self._last_ts,
+            }
+
+    def series(
+        self, node_id: str, field: str, resolution: str = "1m"
+    ) -> List[Dict[str, Any]]:
+        """Return rollup buckets for one node/field, oldest first."""
+
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"unknown resolution: {resolution}")
+        with self._lock:
+            series = self._series.get((node_id, field))
+            if series is None:
+                return []
+            return series.rollups[resolution].buckets()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "nodes": len(self._node_events),
+                "series": len(self._series),
+                "raw_capacity": RAW_CAPACITY,
+                "resolutions": {
+                    name: {"width_sec": width, "retention": retention}
+                    for name, (width, retention) in RESOLUTIONS.items()
+                },
+            }
+
+
+_store: InfraMetricsStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_infra_store() -> InfraMetricsStore:
+    """Return the process-wide store, warmed from the infra log tail."""
+
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from swarmz_runtime.storage.infra_state import load_infra_events
+
+                store = InfraMetricsStore()
+                store.warm(load_infra_events(limit=WARM_LIMIT))
+                _store = store
+    return _store
@@ -0,0 +1,364 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""In-process runtime metrics registry.
+
+``telemetry.record_duration`` / ``record_event`` feed this registry so that
+latency and rate queries never scan the JSONL logs:
+
+- per-name rolling duration histograms (log-linear, HDR-style buckets with
+  ~3% relative error) over a sliding window made of fixed time slots, plus a
+  lifetime histogram;
+- per-name event counters over the same window, giving rates;
+- last-event pointers (global and per name) and a short tail of raw
+  durations for exact recent means.
+
+The registry is periodically snapshotted to disk and restored on start, so
+``last_event`` and lifetime percentiles survive restarts.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+# Histogram resolution: values are tracked in microseconds with 16 linear
+# sub-buckets per power of two above 32us (exact below).
+_SUB_BITS = 5
+_EXACT = 1 << _SUB_BITS  # 32
+_HALF = _EXACT >> 1  # 16
+
+RECENT_SAMPLES = 100
+DEFAULT_WINDOW_SEC = 300.0
+DEFAULT_SLOTS = 10
+DEFAULT_SNAPSHOT_INTERVAL_SEC = 60.0
+PERCENTILES = (50.0, 95.0, 99.0)
+
+
+def _bucket_key(value_ms: float) -> int:
+    units = int(value_ms * 1000.0)
+    if units < _EXACT:
+        return max(units, 0)
+    shift = units.bit_length() - _SUB_BITS
+    mantissa = units >> shift
+    return _EXACT + (shift - 1) * _HALF + (mantissa - _HALF)
+
+
+def _bucket_value(key: int) -> float:
+    """Midpoint of bucket ``key`` in milliseconds."""
+    if key < _EXACT:
+        return key / 1000.0
+    shift = (key - _EXACT) // _HALF + 1
+    mantissa = (key - _EXACT) % _HALF + _HALF
+    low = mantissa << shift
+    return (low + (1 << shift) / 2.0) / 1000.0
+
+
+class DurationHistogram:
+    """Sparse log-linear histogram of durations in milliseconds."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value_ms: float) -> None:
+        key = _bucket_key(value_ms)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other: "DurationHistogram") -> None:
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        target = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= target:
+                return min(_bucket_value(key), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "count": self.count,
+            "mean_ms": (self.total / self.count) if self.count else None,
+            "max_ms": self.max if self.count else None,
+        }
+        for pct in PERCENTILES:
+            out[f"p{int(pct)}_ms"] = self.percentile(pct)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": {str(k): v for k, v in self.counts.items()},
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "DurationHistogram":
+        hist = cls()
+        hist.counts = {int(k): int(v) for k, v in (raw.get("counts") or {}).items()}
+        hist.count = int(raw.get("count", sum(hist.counts.values())))
+        hist.total = float(raw.get("total", 0.0))
+        hist.max = float(raw.get("max", 0.0))
+        return hist
+
+
+class _Window:
+    """Sliding window of per-slot histograms and counters."""
+
+    def __init__(self, window_sec: float, slots: int) -> None:
+        self.slot_sec = window_sec / slots
+        self.slots = slots
+        self._ring: Deque[Tuple[int, Dict[str, DurationHistogram], Dict[str, int]]] = (
+            deque()
+        )
+
+    def _slot(self, now: float) -> Tuple[Dict[str, DurationHistogram], Dict[str, int]]:
+        sid = int(now // self.slot_sec)
+        if not self._ring or self._ring[-1][0] != sid:
+            self._ring.append((sid, {}, {}))
+        self._expire(sid)
+        return self._ring[-1][1], self._ring[-1][2]
+
+    def _expire(self, sid: int) -> None:
+        while self._ring and self._ring[0][0] <= sid - self.slots:
+            self._ring.popleft()
+
+    def add_duration(self, name: str, value_ms: float, now: float) -> None:
+        hists, _ = self._slot(now)
+        hist = hists.get(name)
+        if hist is None:
+            hist = hists[name] = DurationHistogram()
+        hist.record(value_ms)
+
+    def add_event(self, name: str, now: float) -> None:
+        _, counts = self._slot(now)
+        counts[name] = counts.get(name, 0) + 1
+
+    def histogram(self, name: str, now: float) -> DurationHistogram:
+        self._expire(int(now // self.slot_sec))
+        merged = DurationHistogram()
+        for _, hists, _ in self._ring:
+            hist = hists.get(name)
+            if hist is not None:
+                merged.merge(hist)
+        return merged
+
+    def event_count(self, name: str, now: float) -> int:
+        self._expire(int(now // self.slot_sec))
+        return sum(counts.get(name, 0) for _, _, counts in self._ring)
+
+    def names(self) -> Iterable[str]:
+        seen = set()
+        for _, hists, counts in self._ring:
+            seen.update(hists)
+            seen.update(counts)
+        return seen
+
+
+class MetricsRegistry:
+    """Rolling duration histograms, event rates and last-event pointers."""
+
+    def __init__(
+        self,
+        window_sec: float = DEFAULT_WINDOW_SEC,
+        slots: int = DEFAULT_SLOTS,
+        snapshot_path: Optional[Path] = None,
+        snapshot_interval_sec: float = DEFAULT_SNAPSHOT_INTERVAL_SEC,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.window_sec = window_sec
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval_sec = snapshot_interval_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window = _Window(window_sec, slots)
+        self._lifetime: Dict[str, DurationHistogram] = {}
+        self._recent: Dict[str, Deque[float]] = {}
+        self._event_totals: Dict[str, int] = {}
+        self._last_events: Dict[str, Dict[str, Any]] = {}
+        self._last_event: Optional[Dict[str, Any]] = None
+        self._live_events = False
+        self._started = clock()
+        self._last_snapshot = self._started
+        if self.snapshot_path is not None:
+            self.load_snapshot(self.snapshot_path)
+
+    # -- ingestion ---------------------------------------------------------
+
+    def record_duration(self, name: str, duration_ms: float) -> None:
+        now = self._clock()
+        value = max(float(duration_ms), 0.0)
+        with self._lock:
+            self._window.add_duration(name, value, now)
+            hist = self._lifetime.get(name)
+            if hist is None:
+                hist = self._lifetime[name] = DurationHistogram()
+            hist.record(value)
+            recent = self._recent.get(name)
+            if recent is None:
+                recent = self._recent[name] = deque(maxlen=RECENT_SAMPLES)
+            recent.append(value)
+        self.maybe_snapshot(now)
+
+    def record_event(self, name: str, event: Dict[str, Any]) -> None:
+        now = self._clock()
+        with self._lock:
+            self._window.add_event(name, now)
+            self._event_totals[name] = self._event_totals.get(name, 0) + 1
+            self._last_events[name] = event
+            self._last_event = event
+            self._live_events = True
+        self.maybe_snapshot(now)
+
+    # -- queries -----------------------------------------------------------
+
+    def last_event(
+        self, name: Optional[str] = None, live_only: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Newest event, overall or for ``name``.
+
+        With ``live_only``, returns None until this process has recorded an
+        event: a restored snapshot can lag the log by a snapshot interval.
+        """
+        with self._lock:
+            if live_only and not self._live_events:
+                return None
+            if name is None:
+                return self._last_event
+            return self._last_events.get(name)
+
+    def recent_mean(self, name: str, max_samples: int = RECENT_SAMPLES) -> Optional[float]:
+        """Mean of the newest ``max_samples`` durations recorded for ``name``."""
+        with self._lock:
+            recent = self._recent.get(name)
+            if not recent:
+                return None
+            values = list(recent)[-max_samples:] if max_samples > 0 else list(recent)
+        return sum(values) / len(values)
+
+    def duration_summary(self, name: str) -> Dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            window = self._window.histogram(name, now).summary()
+            lifetime = self._lifetime.get(name, DurationHistogram()).summary()
+            events = self._window.event_count(name, now)
+        elapsed = max(min(self.window_sec, now - self._started), 1.0)
+        window["rate_per_sec"] = window["count"] / elapsed
+        return {
+            "name": name,
+            "window_sec": self.window_sec,
+            "window": window,
+            "lifetime": lifetime,
+            "events_in_window": events,
+            "event_rate_per_sec": events / elapsed,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            names = sorted(
+                set(self._lifetime) | set(self._event_totals) | set(self._window.names())
+            )
+        durations = {}
+        events = {}
+        now = self._clock()
+        elapsed = max(min(self.window_sec, now - self._started), 1.0)
+        for name in names:
+            if name in self._lifetime:
+                durations[name] = self.duration_summary(name)
+            with self._lock:
+                in_window = self._window.event_count(name, now)
+                total = self._event_totals.get(name, 0)
+            if total or in_window:
+                events[name] = {
+                    "total": total,
+                    "in_window": in_window,
+                    "rate_per_sec": in_window / elapsed,
+                }
+        return {
+            "window_sec": self.window_sec,
+            "durations": durations,
+            "events": events,
+            "last_event": self.last_event(),
+        }
+
+    # -- persistence -------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ts": self._clock(),
+                "lifetime": {n: h.to_dict() for n, h in self._lifetime.items()},
+                "recent": {n: list(d) for n, d in self._recent.items()},
+                "event_totals": dict(self._event_totals),
+                "last_events": dict(self._last_events),
+                "last_event": self._last_event,
+            }
+
+    def save_snapshot(self, path: Optional[Path] = None) -> None:
+        path = Path(path) if path else self.snapshot_path
+        if path is None:
+            return
+        data = self.snapshot()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":"), default=str), encoding="utf-8")
+        os.replace(str(tmp), str(path))
+
+    def load_snapshot(self, path: Path) -> bool:
+        try:
+            raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(raw, dict):
+            return False
+        with self._lock:
+            for name, hist in (raw.get("lifetime") or {}).items():
+                self._lifetime[name] = DurationHistogram.from_dict(hist)
+            for name, values in (raw.get("recent") or {}).items():
+                self._recent[name] = deque(
+                    (float(v) for v in values), maxlen=RECENT_SAMPLES
+                )
+            for name, total in (raw.get("event_totals") or {}).items():
+                self._event_totals[name] = int(total)
+            self._last_events.update(raw.get("last_events") or {})
+            if self._last_event is None:
+                self._last_event = raw.get("last_event")
+        return True
+
+    def maybe_snapshot(self, now: Optional[float] = None) -> bool:
+        if self.snapshot_path is None:
+            return False
+        now = self._clock() if now is None else now
+        with self._lock:
+            if now - self._last_snapshot < self.snapshot_interval_sec:
+                return False
+            self._last_snapshot = now
+        try:
+            self.save_snapshot()
+        except OSError:
+            return False
+        return True
+
@@ -5,11 +5,14 @@ import hmac
 import json
 import os
 import secrets
+import threading
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from swarmz_runtime.core.idempotency import IdempotencyStore, build_store
+
 
 @dataclass
 class RuleResult:
@@ -40,34 +43,37 @@ def _extract_event_id(payload: dict[str, Any]) -> str:
     return hashlib.sha256(fallback_key.encode()).hexdigest()[:32]
 
 
+_store: IdempotencyStore | None = None
+_store_path: Path | None = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Return the webhook idempotency store for ``PROCESSED_EVENTS_PATH``."""
+    global _store, _store_path
+    with _store_lock:
+        if _store is None or _store_path != PROCESSED_EVENTS_PATH:
+            _store = build_store(PROCESSED_EVENTS_PATH)
+            _store_path = PROCESSED_EVENTS_PATH
+        return _store
+
+
 def is_already_processed(event_id: str) -> bool:
-    if not PROCESSED_EVENTS_PATH.exists():
-        return False
-    with PROCESSED_EVENTS_PATH.open("r", encoding="utf-8") as stream:
-        for line in stream:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if entry.get("event_id") == event_id:
-                return True
-    return False
+    return get_idempotency_store().is_processed(event_id)
+
+
+def claim_event(event_id: str) -> bool:
+    """Atomically reserve *event_id*; ``False`` if processed or in flight."""
+    return get_idempotency_store().claim(event_id)
+
+
+def release_event(event_id: str) -> None:
+    """Drop a reservation so a failed delivery can be retried."""
+    get_idempotency_store().release(event_id)
 
 
 def mark_processed(event_id: str) -> None:
-    PROCESSED_EVENTS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with PROCESSED_EVENTS_PATH.open("a", encoding="utf-8") as stream:
-        json.dump(
-            {
-                "event_id": event_id,
-                "processed_at": datetime.now(UTC).isoformat(),
-            },
-            stream,
-        )
-        stream.write("\n")
+    get_idempotency_store().commit(event_id)
 
 
 class PolicyEngine:
@@ -6,16 +6,33 @@ import os
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional
+
+from swarmz_runtime.core.metrics_registry import MetricsRegistry
 
 DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 TELEMETRY_FILE = DATA_DIR / "telemetry.jsonl"
 RUNTIME_METRICS_FILE = DATA_DIR / "runtime_metrics.jsonl"
+METRICS_SNAPSHOT_FILE = DATA_DIR / "runtime_metrics_snapshot.json"
 
 _verbose = os.getenv("SWARMZ_VERBOSE", "0") not in {"0", "false", "False", None}
 _lock = threading.Lock()
+_registry: MetricsRegistry | None = None
+_registry_lock = threading.Lock()
+
+_TAIL_CHUNK = 4096
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry, restored from its snapshot."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry(snapshot_path=METRICS_SNAPSHOT_FILE)
+    return _registry
 
 
 def set_verbose(enabled: bool) -> None:
@@ -43,6 +60,7 @@ def record_event(name: str, payload: Optional[Dict[str, Any]] = None) -> None:
         "payload": payload or {},
     }
     _append(TELEMETRY_FILE, evt)
+    get_metrics_registry().record_event(name, evt)
     verbose_log("event", name, payload)
 
 
@@ -56,6 +74,7 @@ def record_duration(
         "context": context or {},
     }
     _append(RUNTIME_METRICS_FILE, evt)
+    get_metrics_registry().record_duration(name, duration_ms)
     verbose_log("duration", name, f"{duration_ms:.3f}ms", context)
 
 
@@ -69,47 +88,51 @@ def record_failure(
         "context": context or {},
     }
     _append(TELEMETRY_FILE, evt)
+    get_metrics_registry().record_event(name, evt)
     verbose_log("failure", name, error, context)
 
 
+def _tail_line(path: Path) -> Optional[str]:
+    """Return the last non-empty line of *path*, reading backwards."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b""
+        while pos > 0:
+            step = min(_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            stripped = buf.rstrip()
+            nl = stripped.rfind(b"\n")
+            if nl != -1:
+                return stripped[nl + 1 :].decode("utf-8")
+        stripped = buf.strip()
+        return stripped.decode("utf-8") if stripped else None
+
+
 def last_event() -> Optional[Dict[str, Any]]:
-    if not TELEMETRY_FILE.exists():
-        return None
-    try:
-        with TELEMETRY_FILE.open("r", encoding="utf-8") as f:
-            # Read last few lines efficiently instead of byte-by-byte
-            lines = f.readlines()
-            if not lines:
-                return None
-            # Get the last non-empty line
-            for line in reversed(lines):
-                line = line.strip()
-                if line:
-                    return json.loads(line)
-            return None
-    except Exception:
-        return None
+    registry = get_metrics_registry()
+    evt = registry.last_event(live_only=True)
+    if evt is not None:
+        return evt
+    # Nothing recorded in this process yet.  The restored snapshot may miss
+    # events logged after it was saved, so prefer the log tail.
+    if TELEMETRY_FILE.exists():
+        try:
+            line = _tail_line(TELEMETRY_FILE)
+            if line:
+                return json.loads(line)
+        except Exception:
+            pass
+    return registry.last_event()
 
 
 def avg_duration(name: str, max_samples: int = 100) -> Optional[float]:
-    if not RUNTIME_METRICS_FILE.exists():
-        return None
-    durations: List[float] = []
-    try:
-        with RUNTIME_METRICS_FILE.open("r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    obj = json.loads(line)
-                    if obj.get("type") == name and "duration_ms" in obj:
-                        durations.append(float(obj["duration_ms"]))
-                except Exception:
-                    continue
-                if len(durations) >= max_samples:
-                    break
-        if durations:
-            return sum(durations) / len(durations)
-    except Exception:
-        return None
-    return None
+    """Mean of the newest *max_samples* durations recorded for *name*."""
+    return get_metrics_registry().recent_mean(name, max_samples)
+
+
+def metrics_summary() -> Dict[str, Any]:
+    """p50/p95/p99, rates and last events from the in-process registry."""
+    return get_metrics_registry().summary()
@@ -0,0 +1,259 @@
+"""
+async_io.py – Off-event-loop file I/O for async route handlers.
+
+``AsyncStorage`` runs blocking reads and writes on a dedicated I/O thread
+pool so ``async def`` handlers never touch the disk on the event loop:
+
+  * writes to the same file are serialized by a per-path lock, held on
+    the worker thread, so appends and rewrites from concurrent requests
+    never interleave;
+  * rewrites go to a temp file in the same directory and are swapped in
+    with ``os.replace``, so readers see the old or the new file, never a
+    truncated one;
+  * ``update_jsonl`` does read-modify-rewrite under the path lock, so two
+    requests updating the same log cannot lose each other's change.
+
+``LoopLagMonitor`` measures how late the event loop wakes from a short
+sleep.  Any lag is time the loop spent blocked, which makes stalls caused
+by synchronous handlers visible in ``/v1/runtime/loop_lag``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from swarmz_runtime.core.metrics_registry import DurationHistogram
+from swarmz_runtime.storage.jsonl_utils import read_jsonl
+
+T = TypeVar("T")
+
+DEFAULT_IO_THREADS = 4
+DEFAULT_LAG_INTERVAL_SEC = 0.1
+DEFAULT_STALL_MS = 100.0
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _jsonl_text(records: Iterable[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(rec, default=str) + "\n" for rec in records)
+
+
+class AsyncStorage:
+    """Awaitable JSONL/JSON/text storage backed by an I/O thread pool."""
+
+    def __init__(self, max_workers: int = DEFAULT_IO_THREADS) -> None:
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="swarmz-io"
+        )
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._ops = 0
+        self._in_flight = 0
+        self._counter_lock = threading.Lock()
+
+    def _lock_for(self, path: Path) -> threading.Lock:
+        key = Path(path).absolute()
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the I/O pool and await its result."""
+
+        def _call() -> T:
+            with self._counter_lock:
+                self._in_flight += 1
+            try:
+                return fn(*args)
+            finally:
+                with self._counter_lock:
+                    self._in_flight -= 1
+                    self._ops += 1
+
+        return await asyncio.get_running_loop().run_in_executor(self._pool, _call)
+
+    def _locked(self, path: Path, fn: Callable[[], T]) -> T:
+        with self._lock_for(path):
+            return fn()
+
+    # -- reads -------------------------------------------------------------
+
+    async def read_jsonl(self, path: str | Path) -> List[Dict[str, Any]]:
+        return await self.run(read_jsonl, Path(path))
+
+    async def read_text(self, path: str | Path) -> str:
+        return await self.run(Path(path).read_text, "utf-8")
+
+    async def read_bytes(self, path: str | Path) -> bytes:
+        return await self.run(Path(path).read_bytes)
+
+    # -- writes ------------------------------------------------------------
+
+    async def append_jsonl(self, path: str | Path, record: Dict[str, Any]) -> None:
+        path = Path(path)
+        line = json.dumps(record, default=str) + "\n"
+
+        def _append() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+
+        await self.run(self._locked, path, _append)
+
+    async def rewrite_jsonl(
+        self, path: str | Path, records: Iterable[Dict[str, Any]]
+    ) -> None:
+        path = Path(path)
+        text = _jsonl_text(records)
+        await self.run(self._locked, path, lambda: _atomic_write_text(path, text))
+
+    async def write_json(self, path: str | Path, obj: Any, indent: int = 2) -> None:
+        path = Path(path)
+        text = json.dumps(obj, indent=indent, default=str)
+        await self.run(self._locked, path, lambda: _atomic_write_text(path, text))
+
+    async def update_jsonl(
+        self,
+        path: str | Path,
+        fn: Callable[[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        """Read all records, let ``fn`` edit them, and atomically rewrite.
+
+        ``fn`` may mutate the list in place or return a new one; returning
+        ``None`` after leaving the list untouched skips the write.
+        """
+        path = Path(path)
+
+        def _update() -> List[Dict[str, Any]]:
+            records = read_jsonl(path)
+            before = _jsonl_text(records)
+            result = fn(records)
+            records = records if result is None else result
+            text = _jsonl_text(records)
+            if text != before:
+                _atomic_write_text(path, text)
+            return records
+
+        return await self.run(self._locked, path, _update)
+
+    def stats(self) -> Dict[str, int]:
+        with self._counter_lock:
+            return {
+                "completed": self._ops,
+                "in_flight": self._in_flight,
+                "workers": self._pool._max_workers,
+                "tracked_files": len(self._locks),
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+class LoopLagMonitor:
+    """Sample event-loop scheduling lag from a background task."""
+
+    def __init__(
+        self,
+        interval_sec: float = DEFAULT_LAG_INTERVAL_SEC,
+        stall_ms: float = DEFAULT_STALL_MS,
+    ) -> None:
+        self.interval_sec = interval_sec
+        self.stall_ms = stall_ms
+        self._task: Optional[asyncio.Task] = None
+        self._hist = DurationHistogram()
+        self.last_ms = 0.0
+        self.stalls = 0
+        self.last_stall: Optional[Dict[str, float]] = None
+
+    def ensure_running(self) -> None:
+        """Start sampling on the running loop unless already active on it."""
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval_sec
+            await asyncio.sleep(self.interval_sec)
+            self.record(max(0.0, (time.perf_counter() - expected) * 1000.0))
+
+    def record(self, lag_ms: float) -> None:
+        self.last_ms = lag_ms
+        self._hist.record(lag_ms)
+        if lag_ms >= self.stall_ms:
+            self.stalls += 1
+            self.last_stall = {"at": time.time(), "lag_ms": round(lag_ms, 3)}
+
+    def stats(self) -> Dict[str, Any]:
+        summary = self._hist.summary()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_sec": self.interval_sec,
+            "stall_threshold_ms": self.stall_ms,
+            "samples": summary["count"],
+            "last_ms": round(self.last_ms, 3),
+            "max_ms": summary["max_ms"],
+            "p50_ms": summary["p50_ms"],
+            "p95_ms": summary["p95_ms"],
+            "p99_ms": summary["p99_ms"],
+            "stalls": self.stalls,
+            "last_stall": self.last_stall,
+        }
+
+
+_storage: Optional[AsyncStorage] = None
+_storage_lock = threading.Lock()
+_lag_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_async_storage() -> AsyncStorage:
+    """Process-wide storage facade; pool size from ``SWARMZ_IO_THREADS``."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = AsyncStorage(
+                    int(os.environ.get("SWARMZ_IO_THREADS", DEFAULT_IO_THREADS))
+                )
+    return _storage
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor:
+    global _lag_monitor
+    if _lag_monitor is None:
+        _lag_monitor = LoopLagMonitor(
+            stall_ms=float(os.environ.get("SWARMZ_LOOP_STALL_MS", DEFAULT_STALL_MS))
+        )
+    return _lag_monitor
@@ -0,0 +1,267 @@
+"""
+jsonl_pages.py – Cursor pagination over append-only JSONL files.
+
+Pages are read by seeking to a byte offset instead of parsing the whole
+file.  Cursors are opaque url-safe tokens carrying:
+
+  * the byte offset where the next page starts (forward pages) or where
+    the previous page began (backward, newest-first pages), and
+  * a CRC32 of up to 64 bytes next to that offset, so a cursor into a
+    file that has since been rewritten is rejected with ``CursorError``
+    instead of silently landing mid-record.
+
+Blank lines are skipped and malformed lines are counted (``skipped_empty``
+and ``quarantined``), never raised.
+A trailing line without a newline is treated as still being written and
+left for a later read.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+_ANCHOR_BYTES = 64
+_BLOCK = 64 * 1024
+
+
+class CursorError(ValueError):
+    """Cursor is malformed or no longer matches the file."""
+
+
+@dataclass
+class JsonlPage:
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    scanned: int = 0
+    skipped_empty: int = 0
+    quarantined: int = 0
+
+
+def file_signature(path: str | Path) -> Optional[Tuple[int, int, int]]:
+    """``(inode, size, mtime_ns)`` of *path*, or ``None`` if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def etag_for(path: str | Path, *parts: Any) -> str:
+    """Weak ETag for a view of *path* selected by *parts* (cursor, filters...)."""
+    raw = json.dumps([file_signature(path), parts], default=str)
+    return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def _anchor(fh, offset: int, direction: str) -> int:
+    if direction == "f":
+        start = max(0, offset - _ANCHOR_BYTES)
+        fh.seek(start)
+        data = fh.read(offset - start)
+    else:
+        fh.seek(offset)
+        data = fh.read(_ANCHOR_BYTES)
+    return zlib.crc32(data)
+
+
+def encode_cursor(offset: int, anchor: int, direction: str) -> str:
+    raw = json.dumps({"o": offset, "a": anchor, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, direction: str) -> Tuple[int, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset, anchor, kind = int(raw["o"]), int(raw["a"]), raw["d"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise CursorError("malformed cursor") from None
+    if kind != direction or offset < 0:
+        raise CursorError("cursor does not belong to this listing")
+    return offset, anchor
+
+
+def _seek_cursor(fh, size: int, cursor: Optional[str], direction: str) -> int:
+    if not cursor:
+        return 0 if direction == "f" else size
+    offset, anchor = decode_cursor(cursor, direction)
+    if offset > size or _anchor(fh, offset, direction) != anchor:
+        raise CursorError("cursor expired; the log was rewritten")
+    return offset
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        row = json.loads(line)
+    except (json.JSONDecodeError, ValueError):
+        return None
+    return row if isinstance(row, dict) else None
+
+
+def read_forward(
+    path: str | Path,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    predicate: Optional[Predicate] = None,
+) -> JsonlPage:
+    """Oldest-first page of up to *limit* records matching *predicate*."""
+    page = JsonlPage()
+    path = Path(path)
+    try:
+        fh = open(path, "rb")
+    except OSError:
+        if cursor:
+            decode_cursor(cursor, "f")
+        return page
+    with fh:
+        size = os.fstat(fh.fileno()).st_size
+        fh.seek(_seek_cursor(fh, size, cursor, "f"))
+        while len(page.records) < limit:
+            line = fh.readline()
+            if not line or not line.endswith(b"\n"):
+                break
+            if not line.strip():
+                page.skipped_empty += 1
+                continue
+            page.scanned += 1
+            row = _parse(line)
+            if row is None:
+                page.quarantined += 1
+            elif predicate is None or predicate(row):
+                page.records.append(row)
+        offset = fh.tell()
+        if len(page.records) >= limit and offset < size:
+            page.next_cursor = encode_cursor(offset, _anchor(fh, offset, "f"), "f")
+    return page
+
+
+def read_backward(
+    path: str | Path,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    predicate: Optional[Predicate] = None,
+) -> JsonlPage:
+    """Newest-first page of up to *limit* records, reading blocks from the end."""
+    page = JsonlPage()
+    path = Path(path)
+    try:
+        fh = open(path, "rb")
+    except OSError:
+        if cursor:
+            decode_cursor(cursor, "b")
+        return page
+    with fh:
+        size = os.fstat(fh.fileno()).st_size
+        pos = _seek_cursor(fh, size, cursor, "b")
+        carry = b""
+        first = True
+        last_start = pos
+        while pos > 0 and len(page.records) < limit:
+            start = max(0, pos - _BLOCK)
+            fh.seek(start)
+            chunk = fh.read(pos - start) + carry
+            lines = chunk.split(b"\n")
+            if first:
+                if len(lines) == 1 and start > 0:
+                    # No newline yet: the unfinished write reaches back into
+                    # the previous block, so carry all of it along.
+                    carry = chunk
+                    pos = start
+                    continue
+                # Everything after the last newline is an unfinished write.
+                lines.pop()
+                first = False
+            carry = lines.pop(0) if start > 0 else b""
+            line_start = start + (len(carry) + 1 if start > 0 else 0)
+            starts = []
+            for line in lines:
+                starts.append(line_start)
+                line_start += len(line) + 1
+            for line, line_pos in zip(reversed(lines), reversed(starts)):
+                if len(page.records) >= limit:
+                    break
+                last_start = line_pos
+                if not line.strip():
+                    page.skipped_empty += 1
+                    continue
+                page.scanned += 1
+                row = _parse(line)
+                if row is None:
+                    page.quarantined += 1
+                elif predicate is None or predicate(row):
+                    page.records.append(row)
+            pos = start
+        if len(page.records) >= limit and last_start > 0:
+            page.next_cursor = encode_cursor(
+                last_start, _anchor(fh, last_start, "b"), "b"
+            )
+    return page
+
+
+def iter_forward(
+    path: str | Path,
+    cursor: Optional[str] = None,
+    predicate: Optional[Predicate] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream every record from *cursor* to the current end of file."""
+    path = Path(path)
+    try:
+        fh = open(path, "rb")
+    except OSError:
+        if cursor:
+            decode_cursor(cursor, "f")
+        return
+    with fh:
+        size = os.fstat(fh.fileno()).st_size
+        fh.seek(_seek_cursor(fh, size, cursor, "f"))
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            if not line.strip():
+                continue
+            row = _parse(line)
+            if row is not None and (predicate is None or predicate(row)):
+                yield row
+
+
+class FieldCounter:
+    """Total and per-value counts of one field, cached per file signature.
+
+    Writers may rewrite the file in place, so any signature change triggers
+    a full recount; unchanged files are answered from memory.
+    """
+
+    def __init__(self, path: str | Path, field_name: str, default: str = "UNKNOWN"):
+        self.path = Path(path)
+        self.field_name = field_name
+        self.default = default
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._total = 0
+        self._counts: Counter = Counter()
+        self.recounts = 0
+
+    def counts(self) -> Tuple[int, Dict[str, int]]:
+        signature = file_signature(self.path)
+        with self._lock:
+            if signature != self._signature:
+                total = 0
+                counts: Counter = Counter()
+                for row in iter_forward(self.path):
+                    total += 1
+                    counts[str(row.get(self.field_name, self.default))] += 1
+                self._signature = signature
+                self._total, self._counts = total, counts
+                self.recounts += 1
+            return self._total, dict(self._counts)
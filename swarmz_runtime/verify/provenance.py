@@ -4,28 +4,195 @@
 import json
 import hashlib
 import os
+import threading
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import fcntl as _fcntl
+except ImportError:  # Windows: thread lock only, single writer process
+    _fcntl = None
 
 AUDIT_FILE = Path(__file__).resolve().parents[2] / "data" / "audit.jsonl"
 SEAL_KEY_ENV = "SWARMZ_SEAL_KEY"
+GENESIS_HASH = "0" * 64
+
+_TAIL_CHUNK = 4096
+
+
+@dataclass(frozen=True)
+class ChainHead:
+    """Position in the audit chain: entry count, last hash and byte offset.
+
+    Used both as the writer's cached chain head and as a verification
+    checkpoint.  ``offset`` is the byte size of the log up to and including
+    entry ``index - 1``; ``None`` means "unknown, skip by line count".
+    """
+
+    index: int = 0
+    hash: str = GENESIS_HASH
+    offset: Optional[int] = 0
+
+
+_HEADS: Dict[str, ChainHead] = {}
+_THREAD_LOCKS: Dict[str, threading.Lock] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _head_path(path: Path) -> Path:
+    return path.with_name(path.name + ".head")
+
+
+def _lock_path(path: Path) -> Path:
+    return path.with_name(path.name + ".lock")
+
+
+def _checkpoint_path(path: Path) -> Path:
+    return path.with_name(path.name + ".verified")
+
+
+def _thread_lock(path: Path) -> threading.Lock:
+    key = str(path)
+    with _REGISTRY_LOCK:
+        lock = _THREAD_LOCKS.get(key)
+        if lock is None:
+            lock = _THREAD_LOCKS[key] = threading.Lock()
+        return lock
+
+
+class _ChainLock:
+    """Serialize appends across threads (in-process) and processes (flock)."""
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._tlock = _thread_lock(path)
+        self._fd = None
+
+    def __enter__(self) -> "_ChainLock":
+        self._tlock.acquire()
+        try:
+            if _fcntl is not None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = open(_lock_path(self._path), "a")
+                _fcntl.flock(self._fd, _fcntl.LOCK_EX)
+        except Exception:
+            self._tlock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            if self._fd is not None:
+                try:
+                    _fcntl.flock(self._fd, _fcntl.LOCK_UN)
+                finally:
+                    self._fd.close()
+                    self._fd = None
+        finally:
+            self._tlock.release()
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def _write_json_atomic(path: Path, obj: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj, separators=(",", ":")), encoding="utf-8")
+    os.replace(str(tmp), str(path))
+
+
+def _head_from_dict(raw: Optional[Dict[str, Any]]) -> Optional[ChainHead]:
+    if not isinstance(raw, dict):
+        return None
+    try:
+        offset = raw.get("offset")
+        return ChainHead(
+            index=int(raw["index"]),
+            hash=str(raw["hash"]),
+            offset=None if offset is None else int(offset),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _tail_line(f, end: int) -> Optional[bytes]:
+    """Return the last non-empty line in ``f`` ending at or before ``end``."""
+    pos = end
+    buf = b""
+    while pos > 0:
+        step = min(_TAIL_CHUNK, pos)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step) + buf
+        stripped = buf.rstrip(b"\r\n \t")
+        nl = stripped.rfind(b"\n")
+        if nl != -1:
+            return stripped[nl + 1 :]
+    stripped = buf.strip()
+    return stripped or None
+
+
+def _scan_head(path: Path) -> ChainHead:
+    """Rebuild the chain head by reading the whole log (recovery path)."""
+    index = 0
+    last = GENESIS_HASH
+    with path.open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                last = json.loads(line).get("hash", last)
+            except Exception:
+                pass
+            index += 1
+        offset = f.tell()
+    return ChainHead(index=index, hash=last, offset=offset)
+
+
+def _current_head(path: Path) -> ChainHead:
+    """Resolve the chain head without reading the log when possible.
+
+    The in-memory head is trusted while the log size matches its offset;
+    otherwise the sidecar written by the last appender (possibly another
+    process) is consulted, and only a stale or missing sidecar forces a
+    full rescan.
+    """
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return ChainHead()
+    key = str(path)
+    cached = _HEADS.get(key)
+    if cached is not None and cached.offset == size:
+        return cached
+    head = _head_from_dict(_read_json(_head_path(path)))
+    if head is None or head.offset != size:
+        head = _scan_head(path)
+        try:
+            _write_json_atomic(_head_path(path), asdict(head))
+        except OSError:
+            pass
+    _HEADS[key] = head
+    return head
+
+
+def chain_head(path: Path = AUDIT_FILE) -> ChainHead:
+    """Return the current chain head (index, hash, offset) for ``path``."""
+    return _current_head(path)
 
 
 def _last_hash(path: Path = AUDIT_FILE) -> str:
     if not path.exists():
-        return "0" * 64
+        return GENESIS_HASH
     try:
-        with path.open("r", encoding="utf-8") as f:
-            last = None
-            for line in f:
-                if line.strip():
-                    last = line
-            if not last:
-                return "0" * 64
-            obj = json.loads(last)
-            return obj.get("hash", "0" * 64)
+        return _current_head(path).hash
     except Exception:
-        return "0" * 64
+        return GENESIS_HASH
 
 
 def _hash_entry(entry: Dict[str, Any], prev_hash: str) -> str:
@@ -40,32 +207,76 @@ def append_audit(
 ) -> Dict[str, Any]:
     details = details or {}
     path.parent.mkdir(parents=True, exist_ok=True)
-    prev = _last_hash(path)
-    entry = {
-        "event": event,
-        "details": details,
-    }
-    h = _hash_entry(entry, prev)
-    seal_key = os.getenv(SEAL_KEY_ENV)
-    if seal_key:
-        entry["seal"] = hashlib.sha256((seal_key + h).encode("utf-8")).hexdigest()
-    entry["prev_hash"] = prev
-    entry["hash"] = h
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    with _ChainLock(path):
+        head = _current_head(path)
+        prev = head.hash
+        entry = {
+            "event": event,
+            "details": details,
+        }
+        h = _hash_entry(entry, prev)
+        seal_key = os.getenv(SEAL_KEY_ENV)
+        if seal_key:
+            entry["seal"] = hashlib.sha256((seal_key + h).encode("utf-8")).hexdigest()
+        entry["prev_hash"] = prev
+        entry["hash"] = h
+        data = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        with path.open("ab") as f:
+            f.write(data)
+            f.flush()
+            offset = f.tell()
+        new_head = ChainHead(index=head.index + 1, hash=h, offset=offset)
+        _HEADS[str(path)] = new_head
+        _write_json_atomic(_head_path(path), asdict(new_head))
     return entry
 
 
-def verify_chain(path: Path = AUDIT_FILE) -> Tuple[bool, int]:
+def _iter_entries(f, start: ChainHead) -> Iterator[Tuple[bytes, int]]:
+    """Yield ``(line, end_offset)`` for non-empty lines after ``start``."""
+    if start.offset is not None:
+        f.seek(start.offset)
+    else:
+        skipped = 0
+        while skipped < start.index:
+            line = f.readline()
+            if not line:
+                return
+            if line.strip():
+                skipped += 1
+    while True:
+        line = f.readline()
+        if not line:
+            return
+        if line.strip():
+            yield line, f.tell()
+
+
+def verify_from(
+    path: Path = AUDIT_FILE, checkpoint: ChainHead | None = None
+) -> Tuple[bool, ChainHead]:
+    """Verify the chain from ``checkpoint`` to the end of the log.
+
+    Only entries after the checkpoint are hashed.  Returns ``(ok, head)``
+    where ``head`` is the last verified position, suitable as the next
+    checkpoint.  A checkpoint whose offset lies beyond the end of the log,
+    or whose hash does not match the entry preceding it, fails verification.
+    """
+    start = checkpoint or ChainHead()
     if not path.exists():
-        return True, 0
-    count = 0
-    prev = "0" * 64
+        return start.index == 0, ChainHead()
+    prev = start.hash
+    count = start.index
+    offset = start.offset
     try:
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
+        with path.open("rb") as f:
+            if start.index and start.offset is not None:
+                f.seek(0, os.SEEK_END)
+                if start.offset > f.tell():
+                    return False, ChainHead()
+                tail = _tail_line(f, start.offset)
+                if tail is None or json.loads(tail).get("hash") != start.hash:
+                    return False, ChainHead()
+            for line, end in _iter_entries(f, start):
                 obj = json.loads(line)
                 expected = _hash_entry(
                     {
@@ -76,9 +287,43 @@ def verify_chain(path: Path = AUDIT_FILE) -> Tuple[bool, int]:
                     prev,
                 )
                 if obj.get("hash") != expected or obj.get("prev_hash") != prev:
-                    return False, count
+                    return False, ChainHead(index=count, hash=prev, offset=offset)
                 prev = obj.get("hash", prev)
                 count += 1
+                offset = end
     except Exception:
-        return False, count
-    return True, count
+        return False, ChainHead(index=count, hash=prev, offset=offset)
+    return True, ChainHead(index=count, hash=prev, offset=offset)
+
+
+def verify_chain(
+    path: Path = AUDIT_FILE, checkpoint: ChainHead | None = None
+) -> Tuple[bool, int]:
+    ok, head = verify_from(path, checkpoint)
+    return ok, head.index
+
+
+def load_checkpoint(path: Path = AUDIT_FILE) -> Optional[ChainHead]:
+    """Return the last saved verification checkpoint for ``path``, if any."""
+    return _head_from_dict(_read_json(_checkpoint_path(path)))
+
+
+def save_checkpoint(head: ChainHead, path: Path = AUDIT_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_json_atomic(_checkpoint_path(path), asdict(head))
+
+
+def verify_incremental(path: Path = AUDIT_FILE) -> Tuple[bool, int]:
+    """Verify only entries appended since the last successful run.
+
+    On success the new head is stored as the checkpoint.  A checkpoint that
+    no longer matches the log (truncation, rewrite) triggers a full
+    verification from genesis before giving up.
+    """
+    checkpoint = load_checkpoint(path)
+    ok, head = verify_from(path, checkpoint)
+    if not ok and checkpoint is not None:
+        ok, head = verify_from(path, None)
+    if ok:
+        save_checkpoint(head, path)
+    return ok, head.index
@@ -1,6 +1,7 @@
 # SWARMZ Source Available License
 # Commercial use, hosting, and resale prohibited.
 # See LICENSE file for details.
+import hashlib
 import json
 import time
 from pathlib import Path
@@ -27,23 +28,51 @@ def _read_jsonl(path: Path) -> list:
     return rows
 
 
-def replay_audit(audit_path: Path | None = None) -> Dict[str, Any]:
+def _check_chain(audit_path: Path, full: bool) -> tuple:
+    """Chain check: incremental from the saved checkpoint unless ``full``."""
+    if full:
+        return provenance.verify_chain(audit_path)
+    return provenance.verify_incremental(audit_path)
+
+
+def replay_audit(
+    audit_path: Path | None = None,
+    full: bool = False,
+    hash_ok: bool | None = None,
+) -> Dict[str, Any]:
+    """Replay the audit log into mission ids and a content digest.
+
+    The chain check is incremental (only entries appended since the last
+    verified checkpoint are hashed) unless ``full`` is set, and is skipped
+    when the caller already has the result in ``hash_ok``.
+    """
     audit_path = audit_path or (DATA_DIR / "audit.jsonl")
-    entries = _read_jsonl(audit_path)
-    state = {
-        "mission_ids": set(),
-        "events": len(entries),
-        "hash_ok": provenance.verify_chain(audit_path)[0],
+    if hash_ok is None:
+        hash_ok = _check_chain(audit_path, full)[0]
+    mission_ids = set()
+    events = 0
+    digest = hashlib.sha256()
+    if audit_path.exists():
+        with audit_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    e = json.loads(line)
+                except Exception:
+                    continue
+                events += 1
+                digest.update(json.dumps(e, sort_keys=True).encode("utf-8"))
+                mid = e.get("details", {}).get("mission_id") or e.get("mission_id")
+                if mid:
+                    mission_ids.add(mid)
+    return {
+        "mission_ids": sorted(mission_ids),
+        "events": events,
+        "hash_ok": hash_ok,
+        "mission_count": len(mission_ids),
+        "replay_hash": digest.hexdigest(),
     }
-    for e in entries:
-        mid = e.get("details", {}).get("mission_id") or e.get("mission_id")
-        if mid:
-            state["mission_ids"].add(mid)
-    state["mission_ids"] = sorted(state["mission_ids"])
-    state["mission_count"] = len(state["mission_ids"])
-    state["events"] = len(entries)
-    state["replay_hash"] = hash(json.dumps(entries, sort_keys=True))
-    return state
 
 
 def verify_invariants(data_dir: Path = DATA_DIR) -> Dict[str, Any]:
@@ -71,9 +100,9 @@ def verify_invariants(data_dir: Path = DATA_DIR) -> Dict[str, Any]:
 
 def run_verify() -> Dict[str, Any]:
     started = time.time()
-    replay_state = replay_audit()
+    chain_ok, chain_count = provenance.verify_incremental()
+    replay_state = replay_audit(hash_ok=chain_ok)
     invariants = verify_invariants()
-    chain_ok, chain_count = provenance.verify_chain()
     report = {
         "started": started,
         "duration_sec": round(time.time() - started, 3),
@@ -91,7 +120,7 @@ def run_verify() -> Dict[str, Any]:
 
 
 def run_status() -> Dict[str, Any]:
-    chain_ok, count = provenance.verify_chain()
+    chain_ok, count = provenance.verify_incremental()
     latest_report = None
     reports = sorted(VERIFY_DIR.glob("report-*.json"))
     if reports:
@@ -103,14 +132,18 @@ def run_status() -> Dict[str, Any]:
     }
 
 
-def verify_kernel_integrity(strict: bool = True) -> Dict[str, Any]:
-    """Perform strict kernel integrity validation."""
+def verify_kernel_integrity(strict: bool = True, full: bool = False) -> Dict[str, Any]:
+    """Perform strict kernel integrity validation.
+
+    The audit chain is checked from the last verified checkpoint; pass
+    ``full=True`` to re-hash it from genesis.
+    """
     started = time.time()
     issues = []
     checks = []
 
     # Check 1: Audit chain integrity
-    chain_ok, chain_count = provenance.verify_chain()
+    chain_ok, chain_count = _check_chain(provenance.AUDIT_FILE, full)
     checks.append("audit_chain_integrity")
     if not chain_ok:
         issues.append("Audit chain integrity compromised")
@@ -9,6 +9,8 @@ A FastAPI-based web server that exposes SWARMZ capabilities via REST API
 and serves a Progressive Web App for mobile-friendly access.
 """
 
+import asyncio
+import itertools
 import os
 import socket
 import json
@@ -20,13 +22,30 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 from fastapi import Depends, FastAPI, HTTPException, Request, WebSocket
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, RedirectResponse
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
-from jsonl_utils import read_jsonl, write_jsonl
+from swarmz_runtime.storage.async_io import get_async_storage, get_loop_lag_monitor
+from swarmz_runtime.storage.jsonl_pages import (
+    CursorError,
+    FieldCounter,
+    etag_for,
+    iter_forward,
+    read_backward,
+    read_forward,
+)
 from core.activity_stream import record_event
+from core.health_snapshot import HealthSnapshot
+from core.state_hub import get_state_hub, publish_state
 from addons.auth_gate import LANAuthMiddleware
 from addons.rate_limiter import RateLimitMiddleware
 from addons.security import (
@@ -594,7 +613,8 @@ async def create_mission(req: MissionCreateRequest):
         "status": "PENDING",
         "created_at": created_at,
     }
-    write_jsonl(missions_file, mission)
+    storage = get_async_storage()
+    await storage.append_jsonl(missions_file, mission)
     audit_event = {
         "event": "mission_created",
         "mission_id": mission_id,
@@ -602,7 +622,12 @@ async def create_mission(req: MissionCreateRequest):
         "goal": req.goal,
         "category": req.category,
     }
-    write_jsonl(audit_file, audit_event)
+    await storage.append_jsonl(audit_file, audit_event)
+    publish_state(
+        "missions",
+        {mission_id: {"status": "PENDING", "category": req.category, "updated_at": created_at}},
+    )
+    publish_state("audit", {"last_event": audit_event})
     return {
         "ok": True,
         "mission_id": mission_id,
@@ -613,21 +638,101 @@ async def create_mission(req: MissionCreateRequest):
     }
 
 
+MISSION_PAGE_DEFAULT = 200
+MISSION_PAGE_MAX = 1000
+
+
+def _field_filter(**wanted: Optional[str]) -> Optional[Any]:
+    """Predicate matching records whose fields are in comma-separated lists."""
+    active = {
+        key: {v.strip().lower() for v in raw.split(",") if v.strip()}
+        for key, raw in wanted.items()
+        if raw
+    }
+    if not active:
+        return None
+    return lambda row: all(
+        str(row.get(key, "")).lower() in values for key, values in active.items()
+    )
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def _with_updated_at(mission: Dict[str, Any], now: str) -> Dict[str, Any]:
+    if "updated_at" not in mission:
+        mission["updated_at"] = mission.get("created_at", now)
+    return mission
+
+
 @app.get("/v1/missions/list")
-async def list_missions():
-    """List all missions."""
+async def list_missions(
+    request: Request,
+    response: Response,
+    limit: int = MISSION_PAGE_DEFAULT,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    format: str = "json",
+    order: str = "newest",
+):
+    """List missions one cursor page at a time, newest first by default.
+
+    ``order=oldest`` pages from the start of the log instead.  ``status``
+    and ``category`` take comma-separated values.  Pass the returned
+    ``next_cursor`` back as ``cursor`` (with the same ``order``) for the
+    following page; ``format=ndjson`` streams every matching mission,
+    oldest first, from a forward ``cursor`` on.
+    """
     missions_file = Path("data/missions.jsonl")
-    missions, skipped, quarantined = read_jsonl(missions_file)
+    limit = max(1, min(limit, MISSION_PAGE_MAX))
+    predicate = _field_filter(status=status, category=category)
+    newest_first = order != "oldest"
+    etag = etag_for(
+        missions_file, "missions", limit, cursor, status, category, format, newest_first
+    )
+    cached = _not_modified(request, etag)
+    if cached is not None:
+        return cached
     now = _utc_now_iso_z()
-    for m in missions:
-        if "updated_at" not in m:
-            m["updated_at"] = m.get("created_at", now)
+
+    try:
+        if format == "ndjson":
+            rows = iter_forward(missions_file, cursor, predicate)
+            first = await get_async_storage().run(next, rows, None)
+
+            def _stream():
+                if first is None:
+                    return
+                for mission in itertools.chain((first,), rows):
+                    yield json.dumps(_with_updated_at(mission, now), default=str) + "\n"
+
+            return StreamingResponse(
+                _stream(), media_type="application/x-ndjson", headers={"ETag": etag}
+            )
+        page = await get_async_storage().run(
+            read_backward if newest_first else read_forward,
+            missions_file,
+            cursor,
+            limit,
+            predicate,
+        )
+    except CursorError as exc:
+        return JSONResponse(status_code=410, content={"ok": False, "error": str(exc)})
+
+    missions = [_with_updated_at(m, now) for m in page.records]
+    response.headers["ETag"] = etag
     return {
         "ok": True,
         "missions": missions,
         "count": len(missions),
-        "skipped_empty": skipped,
-        "quarantined": quarantined,
+        "next_cursor": page.next_cursor,
+        "has_more": page.next_cursor is not None,
+        "skipped_empty": page.skipped_empty,
+        "quarantined": page.quarantined,
     }
 
 
@@ -637,29 +742,45 @@ async def run_mission(mission_id: str = None):
     if not mission_id:
         return {"ok": False, "error": "mission_id required"}
     missions_file = Path("data/missions.jsonl")
-    missions, _, _ = read_jsonl(missions_file)
-    mission = next((m for m in missions if m.get("mission_id") == mission_id), None)
-    if not mission:
-        return {"ok": False, "error": f"mission_id {mission_id} not found"}
+    storage = get_async_storage()
     started_at = _utc_now_iso_z()
-    mission["status"] = "RUNNING"
-    mission["started_at"] = started_at
+    found: Dict[str, Any] = {}
+
+    def _mark_running(missions: list) -> None:
+        mission = next((m for m in missions if m.get("mission_id") == mission_id), None)
+        if mission is not None:
+            mission["status"] = "RUNNING"
+            mission["started_at"] = started_at
+            found.update(mission)
+
+    # Read-modify-rewrite under the file's write lock, swapped in atomically.
+    await storage.update_jsonl(missions_file, _mark_running)
+    if not found:
+        return {"ok": False, "error": f"mission_id {mission_id} not found"}
     try:
         from nexusmon_organism import ctx_record_mission
 
-        ctx_record_mission(mission_id, mission.get("category", "unknown"), "RUNNING")
+        ctx_record_mission(mission_id, found.get("category", "unknown"), "RUNNING")
     except Exception:
         pass
-    missions_file.write_text("")
-    for m in missions:
-        write_jsonl(missions_file, m)
     audit_file = Path("data/audit.jsonl")
     audit_event = {
         "event": "mission_run",
         "mission_id": mission_id,
         "timestamp": started_at,
     }
-    write_jsonl(audit_file, audit_event)
+    await storage.append_jsonl(audit_file, audit_event)
+    publish_state(
+        "missions",
+        {
+            mission_id: {
+                "status": "RUNNING",
+                "category": found.get("category"),
+                "updated_at": started_at,
+            }
+        },
+    )
+    publish_state("audit", {"last_event": audit_event})
     return {
         "ok": True,
         "mission_id": mission_id,
@@ -684,24 +805,30 @@ def compute_phase(total_missions: int, success_count: int) -> str:
     return "SOVEREIGN"
 
 
+_status_counters: Dict[Path, FieldCounter] = {}
+
+
+def _mission_status_counts(missions_file: Path) -> tuple[int, Dict[str, int]]:
+    """Mission totals by status, recounted only when the file changes."""
+    key = missions_file.resolve()
+    counter = _status_counters.get(key)
+    if counter is None:
+        counter = _status_counters[key] = FieldCounter(key, "status")
+    return counter.counts()
+
+
 @app.get("/v1/ui/state")
 async def ui_state():
     """Get UI state including server, missions, and phase."""
     missions_file = Path("data/missions.jsonl")
     audit_file = Path("data/audit.jsonl")
-    missions, _, _ = read_jsonl(missions_file)
-    audit_events, _, _ = read_jsonl(audit_file)
-
-    status_counts = {}
-    success_count = 0
-    for m in missions:
-        status = m.get("status", "UNKNOWN")
-        status_counts[status] = status_counts.get(status, 0) + 1
-        if status == "SUCCESS":
-            success_count += 1
-
-    last_events = audit_events[-10:] if audit_events else []
-    phase = compute_phase(len(missions), success_count)
+    storage = get_async_storage()
+    total_missions, status_counts = await storage.run(
+        _mission_status_counts, missions_file
+    )
+    last_page = await storage.run(read_backward, audit_file, None, 10)
+    last_events = last_page.records[::-1]
+    phase = compute_phase(total_missions, status_counts.get("SUCCESS", 0))
 
     organism_stage = None
     try:
@@ -720,13 +847,73 @@ async def ui_state():
             "lan_url": f"http://{LAN_IP}:{SERVER_PORT}",
             "local_url": f"http://127.0.0.1:{SERVER_PORT}",
         },
-        "missions": {"count_total": len(missions), "count_by_status": status_counts},
+        "missions": {"count_total": total_missions, "count_by_status": status_counts},
         "last_events": last_events,
         "phase": phase,
         "organism_stage": organism_stage,
     }
 
 
+@app.on_event("startup")
+async def _start_loop_lag_monitor():
+    get_loop_lag_monitor().ensure_running()
+
+
+@app.get("/v1/runtime/loop_lag", tags=["agent-runtime"], operation_id="runtime_loop_lag")
+async def runtime_loop_lag():
+    """Event-loop lag samples and I/O pool counters."""
+    monitor = get_loop_lag_monitor()
+    monitor.ensure_running()
+    return {
+        "ok": True,
+        "loop_lag": monitor.stats(),
+        "io_pool": get_async_storage().stats(),
+    }
+
+
+STREAM_HEARTBEAT_SEC = 15.0
+
+
+@app.get("/v1/stream/state", tags=["cockpit-stream"], operation_id="cockpit_state_stream")
+async def cockpit_state_stream(
+    request: Request,
+    topics: Optional[str] = None,
+    last_event_id: Optional[int] = None,
+):
+    """Server-sent events carrying mission, audit, organism, health and companion deltas.
+
+    The first event is a ``snapshot`` of current state unless the
+    ``Last-Event-ID`` header (or ``last_event_id``) can be resumed from
+    the hub's replay ring.  ``resync`` events replace a backlog the client
+    was too slow to drain.
+    """
+    header_id = request.headers.get("last-event-id")
+    if header_id and header_id.strip().isdigit():
+        last_event_id = int(header_id)
+    wanted = [t.strip() for t in topics.split(",") if t.strip()] if topics else None
+    sub = get_state_hub().subscribe(wanted, last_event_id)
+
+    async def _events():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await sub.get(timeout=STREAM_HEARTBEAT_SEC)
+                yield ": ping\n\n" if event is None else event.encode()
+        finally:
+            sub.close()
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/v1/stream/state/stats", tags=["cockpit-stream"], operation_id="cockpit_state_stream_stats")
+async def cockpit_state_stream_stats():
+    return {"ok": True, "hub": get_state_hub().stats()}
+
+
 @app.get("/v1/debug/traceback_last")
 async def traceback_last():
     """Get the last exception traceback."""
@@ -1422,43 +1609,117 @@ async def canonical_health():
     }
 
 
-@app.get("/v1/runtime/health", tags=["agent-runtime"], operation_id="runtime_health")
-async def runtime_health():
+_SCHEDULER_LANES = {
+    "lastDiaryRunISO": "diary",
+    "lastAwakeningLoopRunISO": "awakening",
+    "lastBreathRunISO": "breath",
+    "lastHeartRunISO": "heart",
+    "lastCosmicRunISO": "cosmic",
+}
+
+_health_snapshot: Optional[HealthSnapshot] = None
+
+
+def _get_health_snapshot() -> HealthSnapshot:
+    """Health fields shared by the runtime, scheduler and prepared-action probes.
+
+    Refresh cadence and the staleness bound come from
+    ``SWARMZ_HEALTH_REFRESH_SEC`` and ``SWARMZ_HEALTH_MAX_STALE_SEC``.
+    """
+    global _health_snapshot
+    if _health_snapshot is not None:
+        return _health_snapshot
     root = _repo_root()
-    manifests_total, manifests_unregistered = _manifest_totals(root)
-    cockpit_modes_total, cockpit_modes_broken = _cockpit_mode_stats(root)
-    tests_total = len(list((root / "tests").rglob("test_*.py")))
-    observatory_root = root / "observatory"
-    observatory_size_mb = _observatory_size_mb(observatory_root) if observatory_root.exists() else 0.0
-    diary_dir = observatory_root / "diary"
-    scheduler_dir = observatory_root / "scheduler"
+    obs = root / "observatory"
+    snap = HealthSnapshot(
+        refresh_sec=float(os.environ.get("SWARMZ_HEALTH_REFRESH_SEC", 15)),
+        max_stale_sec=float(os.environ.get("SWARMZ_HEALTH_MAX_STALE_SEC", 60)),
+        on_change=lambda name, value: publish_state("health", {name: value}),
+    )
     legacy_paths = [root / "ui", root / "web", root / "web_ui", root / "organism"]
+    snap.register(
+        "manifestsTotal",
+        lambda: _manifest_totals(root)[0],
+        watch=[root / "core" / "manifests" / "registry.json"],
+    )
+    snap.register(
+        "cockpitModes",
+        lambda: _cockpit_mode_stats(root),
+        watch=[root / "cockpit" / "modes" / "registry.json", root / "cockpit" / "modes"],
+    )
+    snap.register(
+        "testsTotal",
+        lambda: len(list((root / "tests").rglob("test_*.py"))),
+        watch=[root / "tests"],
+    )
+    snap.register(
+        "observatorySizeMB",
+        lambda: _observatory_size_mb(obs) if obs.exists() else 0.0,
+        watch=[obs],
+    )
+    snap.register(
+        "lastDiaryWriteISO", lambda: _latest_mtime_iso(obs / "diary"), watch=[obs / "diary"]
+    )
+    snap.register(
+        "lastSchedulerRunISO",
+        lambda: _latest_mtime_iso(obs / "scheduler"),
+        watch=[obs / "scheduler"],
+    )
+    snap.register(
+        "legacyArtifactsFound",
+        lambda: any(path.exists() for path in legacy_paths),
+        watch=[root],
+    )
+    for key, lane in _SCHEDULER_LANES.items():
+        lane_dir = obs / "scheduler" / lane
+        snap.register(key, lambda d=lane_dir: _latest_mtime_iso(d), watch=[lane_dir])
+    snap.register(
+        "preparedActions",
+        lambda: _prepared_actions_metrics(root),
+        watch=[root / "prepared_actions"],
+    )
+    snap.start()
+    _health_snapshot = snap
+    return snap
+
+
+@app.get("/v1/runtime/health", tags=["agent-runtime"], operation_id="runtime_health")
+async def runtime_health():
+    values, computed = await _get_health_snapshot().read_async(
+        [
+            "manifestsTotal",
+            "cockpitModes",
+            "testsTotal",
+            "observatorySizeMB",
+            "lastDiaryWriteISO",
+            "lastSchedulerRunISO",
+            "legacyArtifactsFound",
+        ]
+    )
+    cockpit_modes_total, cockpit_modes_broken = values["cockpitModes"] or (0, 0)
+    computed["cockpitModesTotal"] = computed["cockpitModesBroken"] = computed.pop(
+        "cockpitModes"
+    )
     return {
-        "manifestsTotal": manifests_total,
-        "manifestsUnregistered": manifests_unregistered,
+        "manifestsTotal": values["manifestsTotal"],
+        "manifestsUnregistered": 0,
         "hooksMissing": 0,
         "cockpitModesTotal": cockpit_modes_total,
         "cockpitModesBroken": cockpit_modes_broken,
-        "testsTotal": tests_total,
+        "testsTotal": values["testsTotal"],
         "testsFailed": 0,
-        "observatorySizeMB": observatory_size_mb,
-        "lastDiaryWriteISO": _latest_mtime_iso(diary_dir),
-        "lastSchedulerRunISO": _latest_mtime_iso(scheduler_dir),
-        "legacyArtifactsFound": any(path.exists() for path in legacy_paths),
+        "observatorySizeMB": values["observatorySizeMB"],
+        "lastDiaryWriteISO": values["lastDiaryWriteISO"],
+        "lastSchedulerRunISO": values["lastSchedulerRunISO"],
+        "legacyArtifactsFound": values["legacyArtifactsFound"],
+        "computedAt": computed,
     }
 
 
 @app.get("/v1/scheduler/status", tags=["agent-runtime"], operation_id="scheduler_status")
 async def scheduler_status():
-    root = _repo_root()
-    obs = root / "observatory" / "scheduler"
-    return {
-        "lastDiaryRunISO": _latest_mtime_iso(obs / "diary"),
-        "lastAwakeningLoopRunISO": _latest_mtime_iso(obs / "awakening"),
-        "lastBreathRunISO": _latest_mtime_iso(obs / "breath"),
-        "lastHeartRunISO": _latest_mtime_iso(obs / "heart"),
-        "lastCosmicRunISO": _latest_mtime_iso(obs / "cosmic"),
-    }
+    values, computed = await _get_health_snapshot().read_async(_SCHEDULER_LANES)
+    return {**values, "computedAt": computed}
 
 
 @app.get(
@@ -1467,7 +1728,8 @@ async def scheduler_status():
     operation_id="prepared_actions_status",
 )
 async def prepared_actions_status():
-    return _prepared_actions_metrics(_repo_root())
+    values, computed = await _get_health_snapshot().read_async(["preparedActions"])
+    return {**values["preparedActions"], "computedAt": computed["preparedActions"]}
 
 
 @app.get("/v1/avatar/matrix", tags=["avatar-matrix"], operation_id="avatar_matrix_state")
@@ -1779,63 +2041,79 @@ async def get_audit_log():
 
 
 @app.get("/v1/sysmon")
-async def get_sysmon():
-    """Get system monitoring information."""
-    try:
-        import psutil
-        import platform
-        import socket
+async def get_sysmon(history: int = 0, per_core: bool = False):
+    """Get system monitoring information.
 
-        # Get system info
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage("/")
-
-        # Get network info
-        try:
-            hostname = socket.gethostname()
-            ip_address = socket.gethostbyname(hostname)
-        except:
-            hostname = "unknown"
-            ip_address = "unknown"
-
-        return {
+    Served from the background sampler; ``history`` adds up to that many
+    recent samples and ``per_core`` adds per-CPU utilisation.
+    """
+    try:
+        from core.system_sampler import get_system_sampler
+
+        sampler = get_system_sampler()
+        if not sampler.available:
+            return {"ok": False, "error": "psutil not installed"}
+        sample = sampler.latest()
+        if sample is None:
+            sample = await asyncio.to_thread(sampler.sample_now)
+        if sample is None:
+            return {"ok": False, "error": sampler.last_error or "no sample yet"}
+
+        identity = sampler.identity()
+        system = {
+            "platform": identity["platform"],
+            "hostname": identity["hostname"],
+            "ip_address": identity["ip_address"],
+            "cpu_cores": len(sample["per_core"]),
+        }
+        system.update(
+            {k: v for k, v in sample.items() if k not in ("ts", "per_core")}
+        )
+        out: Dict[str, Any] = {
             "ok": True,
-            "system": {
-                "platform": platform.platform(),
-                "hostname": hostname,
-                "ip_address": ip_address,
-                "cpu_cores": psutil.cpu_count(),
-                "cpu_percent": cpu_percent,
-                "memory_total": memory.total,
-                "memory_used": memory.used,
-                "memory_percent": memory.percent,
-                "disk_total": disk.total,
-                "disk_used": disk.used,
-                "disk_percent": (disk.used / disk.total) * 100,
-            },
+            "sampled_at": sample["ts"],
+            "system": system,
+            "sampler": sampler.stats(),
         }
+        if per_core:
+            out["per_core"] = sample["per_core"]
+        if history > 0:
+            out["history"] = sampler.history(history)
+        return out
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
 
 @app.get("/v1/audit/events")
-async def get_audit_events():
-    """Get recent audit events."""
+async def get_audit_events(
+    request: Request,
+    response: Response,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    event: Optional[str] = None,
+):
+    """Get audit events, newest first, one cursor page at a time."""
+    audit_file = Path("data/audit.jsonl")
+    limit = max(1, min(limit, MISSION_PAGE_MAX))
+    etag = etag_for(audit_file, "audit", limit, cursor, event)
+    cached = _not_modified(request, etag)
+    if cached is not None:
+        return cached
     try:
-        # Try to load from audit.jsonl if it exists
-        audit_file = Path("data/audit.jsonl")
-        if audit_file.exists():
-            events, _, _ = read_jsonl(audit_file)
-            # Sort by timestamp and take last 50
-            events.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-            recent_events = events[:50]
-        else:
-            recent_events = []
-
-        return {"ok": True, "events": recent_events, "count": len(recent_events)}
+        page = await get_async_storage().run(
+            read_backward, audit_file, cursor, limit, _field_filter(event=event)
+        )
+    except CursorError as exc:
+        return JSONResponse(status_code=410, content={"ok": False, "error": str(exc)})
     except Exception as e:
         return {"ok": False, "error": str(e)}
+    response.headers["ETag"] = etag
+    return {
+        "ok": True,
+        "events": page.records,
+        "count": len(page.records),
+        "next_cursor": page.next_cursor,
+    }
 
 
 @app.get("/v1/dependencies")
@@ -1843,21 +2121,18 @@ async def get_dependencies():
     """Get module dependency graph."""
     try:
         # Get installed plugins
-        plugins_file = Path("data/plugins.jsonl")
-        if plugins_file.exists():
-            plugins, _, _ = read_jsonl(plugins_file)
-        else:
-            plugins = []
+        storage = get_async_storage()
+        plugins = await storage.read_jsonl(Path("data/plugins.jsonl"))
 
         # Get requirements
         requirements_file = Path("requirements.txt")
         if requirements_file.exists():
-            with open(requirements_file, "r") as f:
-                requirements = [
-                    line.strip()
-                    for line in f
-                    if line.strip() and not line.startswith("#")
-                ]
+            text = await storage.read_text(requirements_file)
+            requirements = [
+                line.strip()
+                for line in text.splitlines()
+                if line.strip() and not line.startswith("#")
+            ]
         else:
             requirements = []
 
@@ -1900,7 +2175,7 @@ async def get_full_evolution():
 
         # Load organism data
         missions_file = Path("data/missions.jsonl")
-        missions, _, _ = read_jsonl(missions_file)
+        missions = await get_async_storage().read_jsonl(missions_file)
 
         # Calculate stats
         total_missions = len(missions)
@@ -2305,6 +2580,14 @@ async def companion_message(request: Request):
                 resp["model"] = result["model"]
             if result.get("latencyMs"):
                 resp["latencyMs"] = result["latencyMs"]
+            publish_state(
+                "companion",
+                {
+                    "last_reply_at": _utc_now_iso_z(),
+                    "source": resp["source"],
+                    "provider": resp.get("provider"),
+                },
+            )
             return JSONResponse(resp)
         except Exception as companion_err:
             # Try fused AI companion before keyword fallback
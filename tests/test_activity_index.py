@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+from core.activity_index import ActivityIndex
+
+
+def _touch(path: Path, age_hours: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x", encoding="utf-8")
+    ts = time.time() - age_hours * 3600
+    os.utime(path, (ts, ts))
+
+
+def test_window_counts_and_incremental_rescans(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    _touch(root / "a" / "fresh.txt", 1)
+    _touch(root / "a" / "old.txt", 30)
+    _touch(root / "b" / "c" / "mid.txt", 5)
+
+    index = ActivityIndex([root, tmp_path / "missing"])
+    index.refresh()
+    assert index.file_count() == 3
+    assert index.touched_within(24) == 2
+    assert index.touched_within(2) == 1
+    assert sum(h["files"] for h in index.hourly(24)) == 2
+
+    rescanned = index.stats()["dirs_rescanned"]
+    index.refresh()
+    assert index.stats()["dirs_rescanned"] == rescanned  # nothing changed
+
+    _touch(root / "b" / "c" / "new.txt", 0)
+    os.remove(root / "a" / "old.txt")
+    index.refresh()
+    assert index.stats()["dirs_rescanned"] == rescanned + 2
+    assert index.file_count() == 3
+    assert index.touched_within(24) == 3
+
+    shutil.rmtree(root / "b")
+    index.refresh()
+    assert index.file_count() == 1
+    assert index.stats()["dirs"] == 2
+
+
+def test_symlinked_directory_loop_is_not_followed(tmp_path: Path) -> None:
+    root = tmp_path / "prepared_actions"
+    _touch(root / "a" / "b" / "action.json", 1)
+    os.symlink(root / "a", root / "a" / "b" / "loop", target_is_directory=True)
+
+    index = ActivityIndex([root])
+    index.refresh(force=True)
+    assert index.file_count() == 1
+    assert index.stats()["dirs"] == 3
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import time
+
+from swarmz_runtime.storage.async_io import AsyncStorage, LoopLagMonitor
+
+
+def test_concurrent_appends_and_updates_are_serialized(tmp_path):
+    log = tmp_path / "data" / "missions.jsonl"
+    storage = AsyncStorage(max_workers=8)
+
+    async def scenario():
+        await asyncio.gather(
+            *(storage.append_jsonl(log, {"mission_id": i, "n": 0}) for i in range(50))
+        )
+
+        def bump(rows):
+            for row in rows:
+                row["n"] += 1
+
+        await asyncio.gather(*(storage.update_jsonl(log, bump) for _ in range(20)))
+        return await storage.read_jsonl(log)
+
+    rows = asyncio.run(scenario())
+    storage.shutdown()
+    assert sorted(r["mission_id"] for r in rows) == list(range(50))
+    assert {r["n"] for r in rows} == {20}
+    assert not [p for p in log.parent.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_rewrite_and_write_json_are_atomic(tmp_path):
+    storage = AsyncStorage()
+    path = tmp_path / "state.json"
+
+    async def scenario():
+        await storage.write_json(path, {"a": 1})
+        await storage.rewrite_jsonl(tmp_path / "x.jsonl", [{"i": 1}, {"i": 2}])
+        untouched = await storage.update_jsonl(tmp_path / "x.jsonl", lambda rows: None)
+        return untouched
+
+    untouched = asyncio.run(scenario())
+    assert json.loads(path.read_text()) == {"a": 1}
+    assert (tmp_path / "x.jsonl").read_text() == '{"i": 1}\n{"i": 2}\n'
+    assert len(untouched) == 2
+    assert storage.stats()["completed"] == 3
+
+
+def test_loop_lag_monitor_detects_blocking():
+    monitor = LoopLagMonitor(interval_sec=0.01, stall_ms=50)
+
+    async def scenario():
+        monitor.ensure_running()
+        await asyncio.sleep(0.05)
+        time.sleep(0.12)  # block the loop on purpose
+        await asyncio.sleep(0.05)
+        monitor.stop()
+
+    asyncio.run(scenario())
+    stats = monitor.stats()
+    assert stats["samples"] >= 3
+    assert stats["stalls"] >= 1
+    assert stats["max_ms"] >= 50
+
+
+def test_server_io_stays_off_loop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from fastapi.testclient import TestClient
+    from swarmz_server import app
+
+    with TestClient(app) as client:
+        created = client.post("/v1/missions/create", json={"goal": "g", "category": "c"})
+        mission_id = created.json()["mission_id"]
+        run = client.post(f"/v1/missions/run?mission_id={mission_id}").json()
+        assert run["status"] == "RUNNING"
+        listed = client.get("/v1/missions/list").json()["missions"]
+        assert listed[0]["status"] == "RUNNING"
+        assert client.post("/v1/missions/run?mission_id=nope").json()["ok"] is False
+        lag = client.get("/v1/runtime/loop_lag").json()
+    assert lag["loop_lag"]["running"] is True
+    assert lag["io_pool"]["completed"] >= 4
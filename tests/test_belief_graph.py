@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+cog = pytest.importorskip("matrix.core.nexusmon_cognition")
+
+
+@pytest.fixture
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "nexusmon.db"))
+    monkeypatch.setattr(cog, "_graph", None)
+    return tmp_path
+
+
+def test_cascade_is_multi_hop_damped_and_cycle_safe(isolated) -> None:
+    for bid in ("a", "b", "c", "d"):
+        cog.bdg_add_node(bid, f"claim {bid}", 0.8)
+    # b depends on a, c on b, d on c, and a on d (cycle)
+    cog.bdg_add_dependency("b", "a", 1.0)
+    cog.bdg_add_dependency("c", "b", 0.8)
+    cog.bdg_add_dependency("d", "c", 0.5)
+    cog.bdg_add_dependency("a", "d", 1.0)
+    cog.bdg_add_dependency("b", "a", 1.0)  # duplicate is a no-op
+
+    affected = cog.bdg_cascade("a", 0.8, 0.4, damping=0.5, threshold=0.01)
+    by_id = {row["belief_id"]: row for row in affected}
+
+    assert set(by_id) == {"b", "c", "d"}
+    assert by_id["b"]["implied_delta"] == pytest.approx(-0.4)
+    assert by_id["c"]["implied_delta"] == pytest.approx(-0.4 * 0.8 * 0.5)
+    assert by_id["d"]["implied_delta"] == pytest.approx(-0.16 * 0.5 * 0.5)
+    assert by_id["d"]["hops"] == 3 and by_id["d"]["via"] == "c"
+
+    cut = cog.bdg_cascade("a", 0.8, 0.4, damping=0.5, threshold=0.1)
+    assert {row["belief_id"] for row in cut} == {"b", "c"}
+    assert [r["belief_id"] for r in cog.bdg_cascade("a", 0.8, 0.4, max_depth=1)] == ["b"]
+    assert cog._belief_graph().counts() == {"nodes": 4, "edges": 4}
+
+
+def test_graph_replays_wal_and_snapshots(isolated, monkeypatch) -> None:
+    monkeypatch.setattr(cog, "_BDG_SNAPSHOT_EVERY", 4)
+    cog.bdg_add_node("x", "claim x", 0.9)
+    cog.bdg_add_node("y", "claim y", 0.6)
+    cog.bdg_add_dependency("y", "x", 0.5)
+    assert not (isolated / "belief_graph.json").exists()
+
+    cog.bdg_add_node("z", "claim z", 0.3)
+    snapshot = json.loads((isolated / "belief_graph.json").read_text())
+    assert set(snapshot["nodes"]) == {"x", "y", "z"}
+    assert (isolated / "belief_graph.wal.jsonl").read_text() == ""
+
+    cog.bdg_add_dependency("z", "y", 1.0)
+    monkeypatch.setattr(cog, "_graph", None)
+    graph = cog._load_graph()
+    assert len(graph["edges"]) == 2
+    affected = cog.bdg_cascade("x", 0.9, 0.5)
+    assert [row["belief_id"] for row in affected] == ["y", "z"]
@@ -154,3 +154,26 @@ def test_detect_conflicts_for_singletons() -> None:
     conflicts = CapabilityRouter(registry).detect_conflicts(["engine_a", "engine_b"])
     assert conflicts
     assert "mission.execute" in conflicts[0]
+
+
+def test_route_uses_capability_index_and_tracks_hot_reload() -> None:
+    registry = ManifestRegistry()
+    for i in range(2000):
+        registry.register(
+            _manifest(f"filler{i}", [f"cap.{i}"], trust=0.5, memory_mb=256, cpu_pct=25)
+        )
+    registry.register(_manifest("reader", ["data.read"], trust=0.9, memory_mb=128, cpu_pct=10))
+    registry.register(
+        _manifest("writer", ["data.read", "data.write"], trust=0.6, memory_mb=512, cpu_pct=50)
+    )
+    router = CapabilityRouter(registry)
+
+    assert registry.candidates(["data.read", "data.write"]) == {"reader", "writer"}
+    ranked = [c.agent_id for c in router.route(["data.read", "data.write"])]
+    assert ranked == ["writer", "reader"]
+    assert [c.agent_id for c in router.top_k(["data.read", "data.write"], 1)] == ["writer"]
+    assert router.route(["data.read"], frozenset({"data.read"}))[0].agent_id == "reader"
+
+    registry.replace(_manifest("writer", ["data.write"], trust=0.6, memory_mb=512, cpu_pct=50))
+    assert [c.agent_id for c in router.route(["data.read"])] == ["reader"]
+    assert registry.query("data.read")[0].id == "reader"
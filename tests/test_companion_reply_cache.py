@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+org = pytest.importorskip("matrix.core.nexusmon_organism")
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = org._ReplyCache(max_entries=3, ttl_sec=60, threshold=0.8)
+    monkeypatch.setattr(org, "_companion_reply_cache", cache)
+    return cache
+
+
+def test_exact_and_near_duplicate_hits(cache) -> None:
+    org._cache_set("Show me the mission status", {"reply": "all green"})
+
+    assert org._cache_get("show me the mission status ") == {"reply": "all green"}
+    assert org._cache_get("mission status?") == {"reply": "all green"}
+    assert org._cache_get("status mission") == {"reply": "all green"}
+    assert org._cache_get("status of mission 7") is None
+    assert org._cache_get("how are you") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["near_hits"], stats["misses"]) == (1, 2, 2)
+
+
+def test_namespaces_lru_eviction_and_ttl(cache, monkeypatch) -> None:
+    org._cache_set("status", {"reply": "a"}, operator_id="alice")
+    assert org._cache_get("status", operator_id="bob") is None
+
+    org._cache_set("one", {"reply": 1})
+    org._cache_set("two", {"reply": 2})
+    assert org._cache_get("status", operator_id="alice")  # refresh recency
+    org._cache_set("three", {"reply": 3})
+
+    assert org._cache_get("one") is None
+    assert org._cache_get("status", operator_id="alice") == {"reply": "a"}
+    assert cache.stats()["evictions"] == 1
+
+    now = org.time.time()
+    monkeypatch.setattr(org.time, "time", lambda: now + 120)
+    assert org._cache_get("three") is None
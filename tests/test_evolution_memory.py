@@ -0,0 +1,91 @@
+import json
+from datetime import datetime, timezone
+
+from core import evolution_memory
+from core.evolution_memory import EvolutionMemory
+
+ANCHOR = {"operator_private_key": "k" * 64, "operator_public_key": "p" * 64}
+
+
+def _append(evo, inputs_hash, strategy, score, success=True):
+    evo.append_record(
+        timestamp=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        mission_type="test",
+        inputs_hash=inputs_hash,
+        strategy_used=strategy,
+        total_runtime_ms=100.0,
+        success_bool=success,
+        cost_estimate=0.0,
+        score=score,
+    )
+
+
+def test_running_aggregates_per_hash_and_strategy(tmp_path, monkeypatch):
+    monkeypatch.setattr(evolution_memory, "STRATEGY_WINDOW", 2)
+    evo = EvolutionMemory(str(tmp_path), anchor=ANCHOR)
+    _append(evo, "h1", "baseline", 0.2, success=False)
+    _append(evo, "h1", "baseline", 0.4)
+    _append(evo, "h1", "baseline", 0.9)
+    _append(evo, "h1", "fast", 1.0)
+    _append(evo, "h2", "baseline", 0.0)
+
+    stats = evo._aggregate_by_strategy("h1")
+    assert set(stats) == {"baseline", "fast"}
+    assert stats["baseline"]["count"] == 3
+    assert round(stats["baseline"]["avg_score"], 4) == 0.5
+    assert round(stats["baseline"]["success_rate"], 4) == round(2 / 3, 4)
+    assert round(stats["baseline"]["window_avg"], 4) == 0.65
+    assert evo.strategy_average("h1", "fast") == 1.0
+    assert sorted(evo.candidate_strategies("h1")) == ["baseline", "fast"]
+    assert evo.candidate_strategies("h2") == ["baseline"]
+    assert evo.record_count == 5
+
+
+def test_reload_resumes_from_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(evolution_memory, "CHECKPOINT_EVERY", 3)
+    evo = EvolutionMemory(str(tmp_path), anchor=ANCHOR)
+    for i in range(4):
+        _append(evo, "h", "baseline", i / 10)
+    cp = json.loads((tmp_path / "evolution_checkpoint.json").read_text())
+    assert cp["records"] == 3
+
+    verified = []
+    real = evolution_memory.compute_record_hash
+
+    def counting(payload, previous_hash):
+        verified.append(1)
+        return real(payload, previous_hash)
+
+    monkeypatch.setattr(evolution_memory, "compute_record_hash", counting)
+    again = EvolutionMemory(str(tmp_path), anchor=ANCHOR)
+    assert again.chain_valid
+    assert len(verified) == 1  # only the record after the checkpoint
+    assert again.record_count == 4
+    assert again._aggregate_by_strategy("h")["baseline"]["count"] == 4
+    assert [r["score"] for r in again.history_tail(2)] == [0.2, 0.3]
+
+    # New appends chain from the restored head.
+    _append(again, "h", "baseline", 0.5)
+    assert EvolutionMemory(str(tmp_path), anchor=ANCHOR).verify_chain(full=True)
+
+
+def test_rewritten_log_invalidates_checkpoint(tmp_path):
+    evo = EvolutionMemory(str(tmp_path), anchor=ANCHOR)
+    for i in range(3):
+        _append(evo, "h", "baseline", 0.5)
+    evo._write_checkpoint()
+
+    history = tmp_path / "evolution_history.jsonl"
+    rows = history.read_text().splitlines()
+    history.write_text("\n".join(rows[:2]) + "\n")
+    reloaded = EvolutionMemory(str(tmp_path), anchor=ANCHOR)
+    assert reloaded.chain_valid
+    assert reloaded.record_count == 2
+
+    # A same-length edit inside the checkpointed prefix needs a full pass.
+    tampered = json.loads(rows[0])
+    tampered["score"] = 1.0
+    line = json.dumps(tampered, separators=(",", ":"))
+    assert len(line) == len(rows[0])
+    history.write_text(line + "\n" + rows[1] + "\n")
+    assert not EvolutionMemory(str(tmp_path), anchor=ANCHOR).verify_chain(full=True)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import time
+
+from backend.agent.mission_planner import build_setup_context
+from backend.intelligence.feature_store import (
+    Feature,
+    FeatureStore,
+    get_feature,
+    get_feature_store,
+    prefetch_features_batch,
+    set_feature,
+)
+
+
+def test_sqlite_store_read_through_and_catalog_ttl(tmp_path) -> None:
+    store = FeatureStore(tmp_path / "features.db", cache_size=2)
+    set_feature("t1", Feature(name="open_ports", value=[22, 443], target_id="t1"), store)
+    set_feature("t2", Feature(name="custom", value={"a": 1}, target_id="t2", ttl_hours=1), store)
+
+    feat = get_feature("t1", "open_ports", store)
+    assert feat is not None and feat.value == [22, 443]
+    assert feat.ttl_hours == 12 and feat.source == "nmap"
+
+    reopened = FeatureStore(tmp_path / "features.db")
+    assert get_feature("t2", "custom", reopened).value == {"a": 1}
+    assert reopened.stats()["misses"] == 1
+    assert get_feature("t2", "custom", reopened) is not None
+    assert reopened.stats()["hits"] == 1
+
+
+def test_expired_features_are_skipped_and_purged(tmp_path) -> None:
+    store = FeatureStore(tmp_path / "features.db")
+    stale = Feature(
+        name="cves_known", value=[], target_id="t1", computed_at=time.time() - 7 * 3600
+    )
+    set_feature("t1", stale, store)
+    assert get_feature("t1", "cves_known", store) is None
+    assert store.purge_expired() == 1
+    assert store.stats()["rows"] == 0
+
+
+def test_prefetch_batch_loads_many_targets(tmp_path) -> None:
+    store = FeatureStore(tmp_path / "features.db")
+    for i in range(5):
+        set_feature(f"t{i}", Feature(name="tech_stack", value=f"v{i}", target_id=f"t{i}"), store)
+
+    fresh = FeatureStore(tmp_path / "features.db")
+    batch = prefetch_features_batch([f"t{i}" for i in range(6)], fresh)
+    assert batch["t5"] == {}
+    assert batch["t3"]["tech_stack"].value == "v3"
+    assert get_feature("t4", "tech_stack", fresh) is not None
+    assert (fresh.stats()["hits"], fresh.stats()["misses"]) == (1, 6)
+
+    queries: list[str] = []
+    fresh.conn.set_trace_callback(queries.append)
+    again = prefetch_features_batch(["t3", "t5"], fresh)
+    fresh.conn.set_trace_callback(None)
+    assert again["t3"]["tech_stack"].value == "v3" and again["t5"] == {}
+    assert fresh.stats()["hits"] == 3
+    assert queries == []
+
+
+def test_build_setup_context_reuses_prefetched_target(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("SWARMZ_FEATURE_DB", str(tmp_path / "features.db"))
+    store = get_feature_store()
+    build_setup_context("t1", autonomy=50, protectiveness=50, patience=60, curiosity=60)
+    before = store.stats()
+
+    queries: list[str] = []
+    store.conn.set_trace_callback(queries.append)
+    context = build_setup_context(
+        "t1", autonomy=50, protectiveness=50, patience=60, curiosity=60
+    )
+    store.conn.set_trace_callback(None)
+    after = store.stats()
+    assert context["prefetched_features"] == ["osint_enriched"]
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+    assert queries == []
+
+
+def test_set_does_not_mutate_the_callers_feature(tmp_path) -> None:
+    store = FeatureStore(tmp_path / "features.db")
+    feat = Feature(name="open_ports", value=[80], target_id="other")
+    set_feature("t1", feat, store)
+
+    assert (feat.target_id, feat.ttl_hours, feat.source) == ("other", 24.0, "")
+    stored = get_feature("t1", "open_ports", store)
+    assert (stored.target_id, stored.ttl_hours, stored.source) == ("t1", 12, "nmap")
@@ -227,3 +227,32 @@ def test_charter_operating_matrix_eval(client):
     )
     assert ok.status_code == 200
     assert ok.json()["decision"]["allowed"] is True
+
+
+def test_federation_table_tracks_appends_incrementally(tmp_path):
+    from swarmz_runtime.core.federation_manager import FederationManager
+
+    manager = FederationManager(Path(tmp_path))
+    ids = [manager.create_organism(f"o{i}", "op")["organism"]["id"] for i in range(4)]
+    manager.evolve_organism(ids[0], True, 0, True)
+    manager.evolve_organism(ids[1], False, 2, True)
+    manager.pause_organism(ids[2])
+    manager.retire_organism(ids[3])
+
+    metrics = manager.aggregate_metrics()
+    assert metrics["organism_count"] == 4
+    assert (metrics["active"], metrics["paused"], metrics["retired"]) == (2, 1, 1)
+    assert metrics["average_autonomy_dial"] == 10.0
+    assert metrics["metric_events"] == 2
+    assert metrics["mission_success_rate"] == 0.5
+    assert metrics["incident_total"] == 2
+
+    # A second manager (another worker) appends; the first folds in the tail.
+    other = FederationManager(Path(tmp_path))
+    other.pause_organism(ids[0])
+    assert manager.get_organism(ids[0])["status"] == "paused"
+    assert manager.status_counts() == {"active": 1, "paused": 2, "retired": 1}
+
+    # Mutating a returned row must not leak into the table.
+    manager.get_organism(ids[1])["status"] = "bogus"
+    assert manager.get_organism(ids[1])["status"] == "active"
@@ -0,0 +1,80 @@
+import asyncio
+
+from core.health_snapshot import HealthSnapshot
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fields_served_from_memory_until_due(tmp_path):
+    clock = _Clock()
+    calls = []
+    watched = tmp_path / "watched"
+    watched.mkdir()
+
+    def count_files():
+        calls.append(1)
+        return len(list(watched.iterdir()))
+
+    snap = HealthSnapshot(refresh_sec=10, max_stale_sec=30, clock=clock)
+    snap.register("files", count_files, watch=[watched])
+
+    values, computed = snap.read(["files"])
+    assert values == {"files": 0}
+    assert computed["files"].startswith("1970-01-01T00:16:40")
+    assert snap.refresh_due() == 0
+
+    snap.read(["files"])
+    assert len(calls) == 1
+
+    # A new directory entry changes the watched mtime.
+    (watched / "a.txt").write_text("x")
+    assert snap.refresh_due() == 1
+    assert snap.read(["files"])[0]["files"] == 1
+
+    clock.now += 11
+    assert snap.refresh_due() == 1
+    assert len(calls) == 3
+
+
+def test_stale_field_recomputed_on_read_and_errors_keep_last_value():
+    clock = _Clock()
+    state = {"value": 1, "fail": False}
+
+    def compute():
+        if state["fail"]:
+            raise RuntimeError("boom")
+        return state["value"]
+
+    snap = HealthSnapshot(refresh_sec=10, max_stale_sec=30, clock=clock)
+    snap.register("v", compute)
+    assert asyncio.run(snap.read_async(["v"]))[0]["v"] == 1
+
+    state["value"] = 2
+    clock.now += 20
+    assert snap.read(["v"])[0]["v"] == 1  # due, but within the staleness bound
+    clock.now += 20
+    assert asyncio.run(snap.read_async(["v"]))[0]["v"] == 2
+
+    state["fail"] = True
+    clock.now += 40
+    assert snap.read(["v"])[0]["v"] == 2
+    assert snap.stats()["fields"]["v"]["error"] == "boom"
+
+
+def test_runtime_health_reports_computed_at():
+    from fastapi.testclient import TestClient
+    from swarmz_server import app
+
+    with TestClient(app) as client:
+        payload = client.get("/v1/runtime/health").json()
+        status = client.get("/v1/prepared_actions/status").json()
+    assert "testsTotal" in payload["computedAt"]
+    assert "cockpitModesBroken" in payload["computedAt"]
+    assert payload["testsTotal"] > 0
+    assert "computedAt" in status
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from swarmz_runtime.core.idempotency import (
+    BloomFilter,
+    JsonlIdempotencyStore,
+    SqliteIdempotencyStore,
+)
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _stores(tmp_path: Path, clock: _Clock):
+    return [
+        JsonlIdempotencyStore(tmp_path / "events.jsonl", ttl_sec=100, clock=clock),
+        SqliteIdempotencyStore(tmp_path / "events.db", ttl_sec=100, clock=clock),
+    ]
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000)
+    keys = [f"evt_{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_hits = sum(f"other_{i}" in bloom for i in range(1000))
+    assert false_hits < 20
+
+
+@pytest.mark.parametrize("backend", [0, 1])
+def test_claim_commit_release_cycle(tmp_path: Path, backend: int) -> None:
+    clock = _Clock()
+    store = _stores(tmp_path, clock)[backend]
+
+    assert store.claim("evt_1") is True
+    assert store.claim("evt_1") is False  # in flight
+    store.release("evt_1")
+    assert store.claim("evt_1") is True
+    store.commit("evt_1")
+    assert store.is_processed("evt_1")
+    assert store.claim("evt_1") is False
+
+    clock.now += 101
+    assert not store.is_processed("evt_1")
+    assert store.claim("evt_1") is True
+
+
+@pytest.mark.parametrize("backend", [0, 1])
+def test_concurrent_claims_admit_exactly_one(tmp_path: Path, backend: int) -> None:
+    store = _stores(tmp_path, _Clock())[backend]
+    wins = []
+    barrier = threading.Barrier(8)
+
+    def _deliver() -> None:
+        barrier.wait()
+        wins.append(store.claim("evt_dup"))
+
+    threads = [threading.Thread(target=_deliver) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert wins.count(True) == 1
+
+
+def test_jsonl_store_warms_from_log_and_compacts(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    clock = _Clock()
+    store = JsonlIdempotencyStore(path, ttl_sec=100, clock=clock)
+    store.commit("old")
+    clock.now += 50
+    store.commit("new")
+
+    warmed = JsonlIdempotencyStore(path, ttl_sec=100, clock=clock)
+    assert warmed.is_processed("old") and warmed.is_processed("new")
+
+    clock.now += 60
+    assert warmed.compact() == 1
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["event_id"] for r in rows] == ["new"]
+    assert warmed.stats()["processed"] == 1
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path: Path) -> None:
+    clock = _Clock()
+    first = SqliteIdempotencyStore(tmp_path / "shared.db", clock=clock)
+    second = SqliteIdempotencyStore(tmp_path / "shared.db", clock=clock)
+    assert first.claim("evt") is True
+    assert second.claim("evt") is False
+    first.commit("evt")
+    assert second.is_processed("evt")
+
+
+def test_jsonl_store_expires_and_compacts_under_unique_traffic(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    clock = _Clock()
+    store = JsonlIdempotencyStore(path, ttl_sec=10, clock=clock)
+    for i in range(5000):
+        store.commit(f"evt_{i}")
+        clock.now += 0.01  # 100 commits per second, 1000 live at any time
+
+    stats = store.stats()
+    assert stats["processed"] <= 1001
+    assert stats["log_rows"] <= 2 * 1001 + 1024
+    assert len(path.read_text(encoding="utf-8").splitlines()) == stats["log_rows"]
+    assert store.is_processed("evt_4999")
+    assert not store.is_processed("evt_0")
+
+    # A quiet store still compacts once the clock moves past the TTL.
+    clock.now += 11
+    store.commit("evt_late")
+    assert store.stats() == {
+        "backend": "jsonl",
+        "processed": 1,
+        "pending": 0,
+        "log_rows": 1,
+    }
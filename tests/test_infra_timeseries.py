@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from swarmz_runtime.core import infra_timeseries
+from swarmz_runtime.core.infra_autoscale import compute_autoscale_recommendations
+from swarmz_runtime.core.infra_timeseries import InfraMetricsStore
+
+
+def _event(node: str, ts: float, **payload: float) -> dict:
+    return {"type": "metrics", "ts": ts, "node_id": node, "payload": payload}
+
+
+def test_overview_matches_window_averages() -> None:
+    store = InfraMetricsStore()
+    for i in range(10):
+        store.add_event(_event("a", 1000 + i, cpu=i / 10, memory=0.5))
+    store.add_event(_event("b", 1000, cpu=0.9))
+    store.add_event({"type": "heartbeat", "node_id": "c"})
+
+    overview = store.overview()
+    assert overview["total_nodes"] == 2
+    node_a, node_b = overview["nodes"]
+    assert node_a["node_id"] == "a"
+    assert node_a["samples"] == 10
+    assert abs(node_a["avg_cpu"] - 0.45) < 1e-9
+    assert node_a["avg_memory"] == 0.5
+    assert node_b["avg_cpu"] == 0.9
+
+    recent = store.overview(window=2)
+    assert abs(recent["nodes"][0]["avg_cpu"] - 0.85) < 1e-9
+
+    plan = compute_autoscale_recommendations(overview)
+    assert plan["summary"]["hot_nodes"] == 1
+
+
+def test_raw_ring_is_bounded() -> None:
+    store = InfraMetricsStore()
+    cap = infra_timeseries.RAW_CAPACITY
+    for i in range(cap * 3):
+        store.add_event(_event("n", float(i), cpu=1.0 if i >= cap * 2 else 0.0))
+    node = store.overview()["nodes"][0]
+    assert node["samples"] == cap
+    assert node["avg_cpu"] == 1.0
+
+
+def test_rollups_report_min_max_avg_p95() -> None:
+    store = InfraMetricsStore()
+    for i in range(100):
+        store.add_event(_event("n", 60.0 + i, cpu=float(i)))
+
+    buckets = store.series("n", "cpu", "1m")
+    assert [b["partial"] for b in buckets] == [False, True]
+    first = buckets[0]
+    assert first["count"] == 60
+    assert (first["min"], first["max"]) == (0.0, 59.0)
+    assert first["avg"] == 29.5
+    assert first["p95"] == 56.0
+
+    hourly = store.series("n", "cpu", "1h")
+    assert len(hourly) == 1 and hourly[0]["count"] == 100
+
+
+def test_rollup_retention_is_bounded() -> None:
+    store = InfraMetricsStore()
+    width, retention = infra_timeseries.RESOLUTIONS["1h"]
+    for i in range(retention + 20):
+        store.add_event(_event("n", float(i * width), cpu=0.1))
+    closed = [b for b in store.series("n", "cpu", "1h") if not b["partial"]]
+    assert len(closed) == retention
+    assert closed[0]["start"] == 19 * width
+
+
+def test_window_average_uses_prefix_sums_across_laps(monkeypatch) -> None:
+    cap = infra_timeseries.RAW_CAPACITY
+    ring = infra_timeseries._RawRing()
+    values = [float((i * 7) % 13) for i in range(cap * 2 + 37)]
+    for i, v in enumerate(values):
+        ring.push(float(i), v)
+
+    def _no_tail(self, n):
+        raise AssertionError("window mean should not copy the ring")
+
+    monkeypatch.setattr(infra_timeseries._RawRing, "tail", _no_tail)
+    for window in (1, 2, 100, 500, cap - 1):
+        expected = sum(values[-window:]) / window
+        assert abs(ring.mean(window) - expected) < 1e-9
+    assert abs(ring.mean() - sum(values[-cap:]) / cap) < 1e-9
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from core import companion
+from core.intent_matcher import KeywordMatcher
+
+
+def _naive(rules, text):
+    for label, keywords in rules:
+        if any(k in text for k in keywords):
+            return label
+    return None
+
+
+def test_priority_and_overlapping_keywords():
+    matcher = KeywordMatcher(
+        [
+            ("long", ("what are you thinking",)),
+            ("short", ("what are you", "hi ")),
+            ("sub", ("are",)),
+        ]
+    )
+    assert matcher.match("so what are you thinking") == "long"
+    assert matcher.match("what are you") == "short"
+    assert matcher.match("where are we") == "sub"
+    assert matcher.match("nothing here") is None
+    assert matcher.rank("hi there") == 1
+    with pytest.raises(ValueError):
+        KeywordMatcher([("bad", ("",))])
+
+
+def test_companion_tables_agree_with_naive_scan():
+    rng = random.Random(7)
+    keywords = [k for _, ks in companion._INTENT_RULES for k in ks]
+    for _ in range(3000):
+        parts = [
+            rng.choice(keywords) if rng.random() < 0.4
+            else "".join(rng.choice("abdehilmorstuy' ") for _ in range(rng.randint(1, 9)))
+            for _ in range(rng.randint(0, 5))
+        ]
+        text = " ".join(parts)[rng.randint(0, 2):]
+        assert companion._INTENT_MATCHER.match(text) == _naive(companion._INTENT_RULES, text)
+        assert companion._TOPIC_MATCHER.match(text) == _naive(companion._TOPIC_RULES, text)
+
+
+def test_outcome_stats_roll_with_pruning(tmp_path, monkeypatch):
+    monkeypatch.setattr(companion, "_memory_path", lambda: tmp_path / "memory.json")
+    monkeypatch.setattr(companion, "MAX_OUTCOMES", 3)
+    for i, status in enumerate(["SUCCESS", "FAILURE", "SUCCESS", "SUCCESS", "FAILURE"]):
+        companion.record_mission_outcome(f"m{i}", "scan", status)
+    mem = companion.load_memory()
+    assert mem["outcome_stats"] == {"total": 3, "success": 2}
+
+    # Stats missing or out of step with the outcome list are recounted.
+    mem["outcome_stats"] = {"total": 99, "success": 0}
+    assert companion._outcome_stats(mem) == (3, 2)
@@ -0,0 +1,170 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from swarmz_runtime.storage.jsonl_pages import (
+    CursorError,
+    FieldCounter,
+    iter_forward,
+    read_backward,
+    read_forward,
+)
+
+
+def _write(path, rows, tail=""):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows) + tail, encoding="utf-8")
+
+
+def test_forward_pages_cover_file_once(tmp_path):
+    log = tmp_path / "m.jsonl"
+    rows = [{"i": i, "status": "DONE" if i % 3 else "PENDING"} for i in range(10)]
+    _write(log, rows, tail='\n{bad json}\n{"i": 99')
+
+    seen, cursor = [], None
+    while True:
+        page = read_forward(log, cursor, limit=4)
+        seen.extend(r["i"] for r in page.records)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == list(range(10))
+    assert page.quarantined == 1
+    assert page.skipped_empty == 1
+
+    pending = read_forward(log, None, 10, lambda r: r["status"] == "PENDING")
+    assert [r["i"] for r in pending.records] == [0, 3, 6, 9]
+    assert [r["i"] for r in iter_forward(log, read_forward(log, None, 8).next_cursor)] == [8, 9]
+
+
+def test_backward_pages_newest_first_across_blocks(tmp_path, monkeypatch):
+    import swarmz_runtime.storage.jsonl_pages as pages
+
+    monkeypatch.setattr(pages, "_BLOCK", 16)
+    log = tmp_path / "a.jsonl"
+    _write(log, [{"n": i} for i in range(25)], tail='{"n": "partial"')
+
+    seen, cursor = [], None
+    while True:
+        page = read_backward(log, cursor, limit=7)
+        seen.extend(r["n"] for r in page.records)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == list(range(24, -1, -1))
+
+
+def test_backward_skips_partial_line_longer_than_a_block(tmp_path):
+    log = tmp_path / "a.jsonl"
+    _write(log, [{"n": 0}, {"n": 1}], tail='\n{"n": "' + "x" * 70_000)
+
+    page = read_backward(log, None, limit=5)
+    assert [r["n"] for r in page.records] == [1, 0]
+    assert page.skipped_empty == 1
+    assert read_backward(tmp_path / "a.jsonl", None, limit=1).next_cursor is not None
+
+    (tmp_path / "b.jsonl").write_text('{"n": "' + "x" * 70_000, encoding="utf-8")
+    assert read_backward(tmp_path / "b.jsonl").records == []
+
+
+def test_cursor_rejected_after_rewrite(tmp_path):
+    log = tmp_path / "m.jsonl"
+    _write(log, [{"i": i} for i in range(5)])
+    cursor = read_forward(log, None, 2).next_cursor
+    _write(log, [{"i": i, "pad": "x" * 10} for i in range(5)])
+    with pytest.raises(CursorError):
+        read_forward(log, cursor, 2)
+    with pytest.raises(CursorError):
+        read_forward(log, "not-a-cursor", 2)
+
+
+def test_field_counter_recounts_only_on_change(tmp_path):
+    log = tmp_path / "m.jsonl"
+    _write(log, [{"status": "SUCCESS"}, {"status": "PENDING"}, {}])
+    counter = FieldCounter(log, "status")
+    assert counter.counts() == (3, {"SUCCESS": 1, "PENDING": 1, "UNKNOWN": 1})
+    counter.counts()
+    assert counter.recounts == 1
+    with log.open("a") as fh:
+        fh.write(json.dumps({"status": "SUCCESS"}) + "\n")
+    assert counter.counts()[1]["SUCCESS"] == 2
+    assert counter.recounts == 2
+
+
+def test_mission_list_pagination_filters_and_etag(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from swarmz_server import app
+
+    client = TestClient(app)
+    for i in range(5):
+        client.post(
+            "/v1/missions/create",
+            json={"goal": f"g{i}", "category": "build" if i % 2 else "test"},
+        )
+
+    first = client.get("/v1/missions/list", params={"limit": 2, "order": "oldest"})
+    body = first.json()
+    assert [m["goal"] for m in body["missions"]] == ["g0", "g1"]
+    assert body["has_more"] is True
+    etag = first.headers["etag"]
+    again = client.get(
+        "/v1/missions/list",
+        params={"limit": 2, "order": "oldest"},
+        headers={"If-None-Match": etag},
+    )
+    assert again.status_code == 304
+
+    rest = client.get(
+        "/v1/missions/list",
+        params={"limit": 10, "cursor": body["next_cursor"], "order": "oldest"},
+    ).json()
+    assert [m["goal"] for m in rest["missions"]] == ["g2", "g3", "g4"]
+    assert rest["next_cursor"] is None
+
+    newest = client.get("/v1/missions/list", params={"limit": 2}).json()
+    assert [m["goal"] for m in newest["missions"]] == ["g4", "g3"]
+    older = client.get(
+        "/v1/missions/list", params={"cursor": newest["next_cursor"]}
+    ).json()
+    assert [m["goal"] for m in older["missions"]] == ["g2", "g1", "g0"]
+
+    built = client.get("/v1/missions/list", params={"category": "build"}).json()
+    assert [m["goal"] for m in built["missions"]] == ["g3", "g1"]
+
+    stream = client.get("/v1/missions/list", params={"format": "ndjson", "status": "pending"})
+    assert stream.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in stream.text.splitlines()]
+    assert len(lines) == 5 and all("updated_at" in m for m in lines)
+
+    gone = client.get("/v1/missions/list", params={"cursor": "garbage"})
+    assert gone.status_code == 410
+
+    events = client.get("/v1/audit/events", params={"limit": 3}).json()
+    assert [e["goal"] for e in events["events"]] == ["g4", "g3", "g2"]
+    assert events["next_cursor"]
+
+    state = client.get("/v1/ui/state").json()
+    assert state["missions"]["count_total"] == 5
+    assert state["missions"]["count_by_status"] == {"PENDING": 5}
+    assert len(state["last_events"]) == 5
+
+
+def test_mission_list_default_page_shows_newest_past_page_size(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from swarmz_server import MISSION_PAGE_DEFAULT, app
+
+    (tmp_path / "data").mkdir()
+    _write(
+        tmp_path / "data" / "missions.jsonl",
+        [
+            {"mission_id": f"old{i}", "goal": f"old{i}", "status": "PENDING"}
+            for i in range(MISSION_PAGE_DEFAULT + 50)
+        ],
+    )
+    client = TestClient(app)
+    client.post("/v1/missions/create", json={"goal": "newest", "category": "test"})
+
+    listed = client.get("/v1/missions/list").json()
+    assert listed["count"] == MISSION_PAGE_DEFAULT
+    assert listed["missions"][0]["goal"] == "newest"
+    assert listed["has_more"] is True
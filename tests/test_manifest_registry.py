@@ -89,3 +89,34 @@ def test_contains_protocol() -> None:
     registry.register(AgentManifest.from_dict(_manifest("helper1", ["data.read"])))
     assert "helper1" in registry
     assert "missing" not in registry
+
+
+def test_follow_mirrors_hot_updates_and_removals() -> None:
+    from core.registry import ManifestRegistry as V1Registry
+
+    source = V1Registry()
+    routing = ManifestRegistry()
+    routing.follow(source)
+    payload = {
+        "id": "reader@1.0.0",
+        "version": "1.0.0",
+        "capabilities": ["data.read"],
+        "inputs": {"query": {"type": "string"}},
+        "outputs": {"result": {"type": "object"}},
+        "spawn_policy": "manual",
+        "constraints": {},
+        "error_modes": {},
+        "feature_flags": {"enabled": True, "rollout_policy": {}},
+        "extensions": {},
+    }
+
+    assert source.apply_update("reader@1.0.0", payload, enforce_ci_gate=False)[0]
+    assert [m.id for m in routing.query("data.read")] == ["reader@1.0.0"]
+
+    payload["capabilities"] = ["data.write"]
+    assert source.apply_update("reader@1.0.0", payload, enforce_ci_gate=False)[0]
+    assert routing.query("data.read") == []
+    assert routing.candidates(["data.write"]) == {"reader@1.0.0"}
+
+    assert source.remove("reader@1.0.0")
+    assert "reader@1.0.0" not in routing
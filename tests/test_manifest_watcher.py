@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import json
+import shutil
+import time
 from pathlib import Path
 
 from core.manifest_watcher import ManifestWatcher, attach_registry_hot_reload
@@ -73,3 +75,94 @@ def test_watcher_does_not_apply_invalid_manifest(tmp_path: Path) -> None:
     watcher.poll_once()
 
     assert registry.get("invalid-test@1.0.0") is None
+
+
+def test_watcher_applies_debounced_batch_and_reports_latency(tmp_path: Path) -> None:
+    registry.clear()
+
+    manifests_dir = tmp_path / "manifests"
+    manifests_dir.mkdir(parents=True, exist_ok=True)
+    status_path = tmp_path / "manifest-validation-status.json"
+    status_path.write_text(json.dumps({"status": "pass", "sha": ""}), encoding="utf-8")
+
+    batches: list[list[str]] = []
+    watcher = ManifestWatcher(
+        manifests_path=str(manifests_dir),
+        poll_seconds=0.05,
+        ci_status_path=str(status_path),
+        debounce_seconds=0.1,
+    )
+    attach_registry_hot_reload(watcher)
+    watcher.add_batch_listener(lambda batch: batches.append([mid for mid, _ in batch]))
+    watcher.start()
+    try:
+        for name in ("batch-a", "batch-b", "batch-c"):
+            (manifests_dir / f"{name}.json").write_text(
+                json.dumps(_manifest(f"{name}@1.0.0")), encoding="utf-8"
+            )
+        deadline = time.time() + 5
+        while time.time() < deadline and registry.get("batch-c@1.0.0") is None:
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+
+    assert all(registry.get(f"{n}@1.0.0") is not None for n in ("batch-a", "batch-b", "batch-c"))
+    assert sorted(mid for batch in batches for mid in batch) == [
+        "batch-a@1.0.0",
+        "batch-b@1.0.0",
+        "batch-c@1.0.0",
+    ]
+    metrics = watcher.metrics()
+    assert metrics["files_reloaded"] == 3
+    assert metrics["latency_ms"]["max"] is not None
+
+
+def test_watcher_rewatches_recreated_directory(tmp_path: Path) -> None:
+    registry.clear()
+
+    manifests_dir = tmp_path / "manifests"
+    manifests_dir.mkdir(parents=True, exist_ok=True)
+    (manifests_dir / "old.json").write_text(
+        json.dumps(_manifest("old@1.0.0")), encoding="utf-8"
+    )
+    status_path = tmp_path / "manifest-validation-status.json"
+    status_path.write_text(json.dumps({"status": "pass", "sha": ""}), encoding="utf-8")
+
+    watcher = ManifestWatcher(
+        manifests_path=str(manifests_dir),
+        poll_seconds=30,
+        ci_status_path=str(status_path),
+        debounce_seconds=0.05,
+    )
+    attach_registry_hot_reload(watcher)
+    watcher.start()
+    try:
+        if watcher.metrics()["mode"] != "inotify":
+            return
+        shutil.rmtree(manifests_dir)
+        time.sleep(0.3)
+        manifests_dir.mkdir(parents=True, exist_ok=True)
+        time.sleep(0.3)
+        (manifests_dir / "fresh.json").write_text(
+            json.dumps(_manifest("fresh@1.0.0")), encoding="utf-8"
+        )
+        deadline = time.time() + 5
+        while time.time() < deadline and registry.get("fresh@1.0.0") is None:
+            time.sleep(0.02)
+        mode = watcher.metrics()["mode"]
+    finally:
+        watcher.stop()
+
+    assert registry.get("fresh@1.0.0") is not None
+    assert mode == "inotify"
+
+
+def test_registry_apply_batch_is_gated_once(tmp_path: Path) -> None:
+    registry.clear()
+    results = registry.apply_batch(
+        [("one@1.0.0", _manifest("one@1.0.0")), ("two@1.0.0", _manifest("mismatch@1.0.0"))],
+        ci_status_path=str(tmp_path / "missing.json"),
+    )
+    assert results["one@1.0.0"] == (False, "ci_gate_blocked")
+    assert results["two@1.0.0"] == (False, "manifest_id mismatch")
+    assert registry.get("one@1.0.0") is None
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from swarmz_runtime.core import telemetry
+from swarmz_runtime.core.metrics_registry import DurationHistogram, MetricsRegistry
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_histogram_percentiles_within_bucket_error() -> None:
+    hist = DurationHistogram()
+    for v in range(1, 1001):
+        hist.record(float(v))
+    assert abs(hist.percentile(50) - 500) / 500 < 0.04
+    assert abs(hist.percentile(95) - 950) / 950 < 0.04
+    assert abs(hist.percentile(99) - 990) / 990 < 0.04
+    assert hist.percentile(100) <= 1000.0
+
+
+def test_recent_mean_uses_newest_samples() -> None:
+    reg = MetricsRegistry(clock=_Clock())
+    for v in range(200):
+        reg.record_duration("tick", float(v))
+    assert reg.recent_mean("tick", 100) == sum(range(100, 200)) / 100
+    assert reg.recent_mean("tick", 10) == sum(range(190, 200)) / 10
+    assert reg.recent_mean("missing") is None
+
+
+def test_window_expires_old_slots_and_reports_rates() -> None:
+    clock = _Clock()
+    reg = MetricsRegistry(window_sec=60.0, slots=6, clock=clock)
+    for _ in range(30):
+        reg.record_duration("run", 500.0)
+    clock.now += 120.0
+    for _ in range(10):
+        reg.record_duration("run", 5.0)
+        reg.record_event("mission", {"type": "mission"})
+
+    summary = reg.duration_summary("run")
+    assert summary["window"]["count"] == 10
+    assert abs(summary["window"]["p99_ms"] - 5.0) < 0.2
+    assert summary["lifetime"]["count"] == 40
+    assert summary["window"]["rate_per_sec"] == 10 / 60.0
+
+    events = reg.summary()["events"]["mission"]
+    assert events == {"total": 10, "in_window": 10, "rate_per_sec": 10 / 60.0}
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "snap.json"
+    clock = _Clock()
+    reg = MetricsRegistry(snapshot_path=path, snapshot_interval_sec=30.0, clock=clock)
+    reg.record_duration("run", 12.0)
+    reg.record_event("boot", {"type": "boot", "payload": {}})
+    assert not path.exists()
+    clock.now += 31.0
+    reg.record_duration("run", 14.0)
+    assert path.exists()
+
+    restored = MetricsRegistry(snapshot_path=path, clock=clock)
+    assert restored.last_event() == {"type": "boot", "payload": {}}
+    assert restored.recent_mean("run") == 13.0
+    assert restored.duration_summary("run")["lifetime"]["count"] == 2
+
+
+def test_last_event_after_restart_prefers_the_log(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(telemetry, "TELEMETRY_FILE", tmp_path / "telemetry.jsonl")
+    monkeypatch.setattr(telemetry, "METRICS_SNAPSHOT_FILE", tmp_path / "snap.json")
+    monkeypatch.setattr(telemetry, "_registry", None)
+    telemetry.record_event("saved")
+    telemetry.get_metrics_registry().save_snapshot()
+    telemetry.record_event("unsaved")
+
+    # Restart: the snapshot predates the last logged event.
+    monkeypatch.setattr(telemetry, "_registry", None)
+    assert telemetry.get_metrics_registry().last_event()["type"] == "saved"
+    assert telemetry.last_event()["type"] == "unsaved"
+
+    telemetry.record_event("live")
+    assert telemetry.last_event()["type"] == "live"
@@ -0,0 +1,70 @@
+import json
+
+from backend.simulation_layer import simulate_proposal
+from core.counterfactual_engine import CounterfactualEngine
+from core.monte_carlo import shutdown_pool, simulate_strategies
+
+SAMPLES = {"fast": [0.2, 0.4, 0.9], "safe": [0.5, 0.6], "new": [0.3]}
+
+
+def test_seeded_runs_match_across_batching_and_workers():
+    inline = simulate_strategies(SAMPLES, "safe", trials=600, seed=7, batch_size=200)
+    pooled = simulate_strategies(
+        SAMPLES, "safe", trials=600, seed=7, batch_size=200, workers=2
+    )
+    shutdown_pool()
+    assert inline == pooled
+    assert inline["trials"] == 600
+    assert 0.5 <= inline["projected_score"]["mean"] <= 0.6
+    assert inline["regret"]["low"] == 0.0
+    assert sum(inline["p_best"].values()) == 1.0
+    assert simulate_strategies(SAMPLES, "safe", trials=600, seed=8) != inline
+
+
+def test_regret_is_zero_when_selected_dominates():
+    result = simulate_strategies({"a": [0.9, 1.0], "b": [0.1, 0.2]}, "a", seed=1)
+    assert result["regret"] == {"mean": 0.0, "low": 0.0, "high": 0.0}
+    assert result["p_best"] == {"a": 1.0, "b": 0.0}
+
+
+class _Evolution:
+    def strategy_samples(self, inputs_hash, strategy):
+        return {"fast": [0.2, 0.9], "safe": [0.6]}.get(strategy, [])
+
+    def strategy_average(self, inputs_hash, strategy):
+        return 0.0
+
+    def update_reliability(self, *args):
+        pass
+
+    def bump_exploration_bias(self, delta):
+        pass
+
+    def bump_confidence(self, delta):
+        pass
+
+    def update_uncertainty(self, value):
+        pass
+
+
+def test_counterfactual_evaluate_logs_intervals(tmp_path):
+    engine = CounterfactualEngine(str(tmp_path), _Evolution(), trials=500, seed=3)
+    engine.evaluate("m1", "h", "safe", ["fast", "safe"], 0.6, True, 0.0)
+    engine.evaluate("m1", "h", "safe", ["fast", "safe"], 0.6, True, 0.0)
+    rows = [json.loads(line) for line in engine.cf_log_file.read_text().splitlines()]
+    mc = rows[0]["monte_carlo"]
+    assert mc == rows[1]["monte_carlo"]
+    assert mc["trials"] == 500
+    assert mc["projected_score"] == {"mean": 0.6, "low": 0.6, "high": 0.6}
+    assert 0.0 < mc["regret"]["mean"] < 0.3
+    assert mc["regret"]["high"] == 0.3
+
+
+def test_simulate_proposal_projection_is_reproducible():
+    proposal = {"id": "p-0001", "type": "test", "risk": "low", "rationale": "ensure"}
+    first = simulate_proposal(proposal, trials=1000)
+    assert first == simulate_proposal(proposal, trials=1000)
+    projection = first["projection"]
+    assert projection["projected_score"]["low"] < projection["projected_score"]["high"]
+    assert abs(sum(projection["band_probability"].values()) - 1.0) < 1e-3
+    assert first["impacts"] == ["Improves regression coverage."]
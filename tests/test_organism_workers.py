@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+org = pytest.importorskip("matrix.core.nexusmon_organism")
+
+
+@pytest.fixture
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", str(tmp_path / "nexusmon.db"))
+    monkeypatch.setattr(org, "_journal", None)
+    monkeypatch.setattr(org, "_STEP_REGISTRY", dict(org._STEP_REGISTRY))
+    monkeypatch.setattr(org, "_STEP_SPECS", dict(org._STEP_SPECS))
+    return tmp_path
+
+
+def test_blocking_steps_run_off_loop_with_concurrency_limit(isolated) -> None:
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def _slow(ctx, params):
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        return {"thread": threading.current_thread().name}
+
+    org.step("slow", blocking=True, timeout=5, concurrency=2)(_slow)
+
+    async def _main():
+        workers = [org.spawn_worker("x", steps=[{"type": "slow", "params": {}}]) for _ in range(6)]
+        ticks = 0
+        while any(org._worker_journal().get(w["id"])["status"] != "COMPLETED" for w in workers):
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return workers, ticks
+
+    workers, ticks = asyncio.run(_main())
+    assert max(peak) == 2
+    assert ticks > 5  # the loop kept turning while steps ran
+    out = org._worker_journal().get(workers[0]["id"])["output"]
+    assert out["thread"].startswith("nexusmon-worker")
+
+
+def test_step_timeout_marks_step_failed(isolated) -> None:
+    org.step("hang", blocking=True, timeout=0.05)(lambda ctx, params: time.sleep(0.3))
+
+    async def _main():
+        worker = org.spawn_worker("x", steps=[{"type": "hang", "params": {}}])
+        while org._worker_journal().get(worker["id"])["status"] in ("QUEUED", "RUNNING"):
+            await asyncio.sleep(0.01)
+        return org._worker_journal().get(worker["id"])
+
+    worker = asyncio.run(_main())
+    assert worker["steps"][0]["status"] == "FAILED"
+    assert "timed out" in worker["steps"][0]["error"]
+
+
+def test_timed_out_blocking_step_holds_its_slot_until_it_returns(isolated) -> None:
+    spans = {}
+
+    def _task(ctx, params):
+        began = time.monotonic()
+        time.sleep(params["sleep"])
+        spans[params["name"]] = (began, time.monotonic())
+        return {"name": params["name"]}
+
+    org.step("single", blocking=True, timeout=0.1, concurrency=1)(_task)
+
+    async def _main():
+        pending = [
+            org.spawn_worker("x", steps=[{"type": "single", "params": {"name": n, "sleep": s}}])["id"]
+            for n, s in (("stuck", 0.4), ("quick", 0.05))
+        ]
+        while any(org._worker_journal().get(w)["status"] in ("QUEUED", "RUNNING") for w in pending):
+            await asyncio.sleep(0.01)
+        return [org._worker_journal().get(w) for w in pending]
+
+    stuck, quick = asyncio.run(_main())
+    assert "timed out" in stuck["steps"][0]["error"]
+    # The second step waited for the stuck thread, and that wait did not
+    # count against its own timeout.
+    assert spans["quick"][0] >= spans["stuck"][1]
+    assert quick["steps"][0]["status"] == "COMPLETED"
+
+
+def test_journal_is_append_only_and_reloads(isolated) -> None:
+    org.step("noop")(_noop)
+    worker = org.spawn_worker("x", steps=[{"type": "noop", "params": {}}] * 3)
+    journal_path = isolated / "worker_journal.jsonl"
+    rows = journal_path.read_text().splitlines()
+    # put + RUNNING + 3 steps + COMPLETED
+    assert len(rows) == 6
+
+    reloaded = org._WorkerJournal(isolated)
+    stored = reloaded.get(worker["id"])
+    assert stored["status"] == "COMPLETED"
+    assert [s["status"] for s in stored["steps"]] == ["COMPLETED"] * 3
+    assert len(stored["step_log"]) == 3
+
+    reloaded.compact()
+    assert len(journal_path.read_text().splitlines()) == 1
+    assert org._WorkerJournal(isolated).get(worker["id"])["status"] == "COMPLETED"
+
+
+async def _noop(ctx, params):
+    return {"ok": True}
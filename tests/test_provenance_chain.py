@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from swarmz_runtime.verify import provenance
+
+
+def test_append_tracks_head_without_rescanning(tmp_path: Path, monkeypatch) -> None:
+    audit = tmp_path / "audit.jsonl"
+    first = provenance.append_audit("a", {"n": 1}, path=audit)
+
+    def _no_scan(path):
+        raise AssertionError("full scan on hot path")
+
+    monkeypatch.setattr(provenance, "_scan_head", _no_scan)
+    second = provenance.append_audit("b", {"n": 2}, path=audit)
+
+    assert second["prev_hash"] == first["hash"]
+    head = provenance.chain_head(audit)
+    assert head.index == 2
+    assert head.hash == second["hash"]
+    assert head.offset == audit.stat().st_size
+    assert provenance.verify_chain(audit) == (True, 2)
+
+
+def test_stale_sidecar_is_rebuilt(tmp_path: Path) -> None:
+    audit = tmp_path / "audit.jsonl"
+    provenance.append_audit("a", path=audit)
+    provenance._HEADS.clear()
+    (tmp_path / "audit.jsonl.head").unlink()
+
+    entry = provenance.append_audit("b", path=audit)
+
+    assert provenance.verify_chain(audit) == (True, 2)
+    sidecar = json.loads((tmp_path / "audit.jsonl.head").read_text())
+    assert sidecar["hash"] == entry["hash"]
+
+
+def test_concurrent_appends_do_not_fork_chain(tmp_path: Path) -> None:
+    audit = tmp_path / "audit.jsonl"
+
+    def _writer(tag: int) -> None:
+        for i in range(25):
+            provenance.append_audit("evt", {"w": tag, "i": i}, path=audit)
+
+    threads = [threading.Thread(target=_writer, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert provenance.verify_chain(audit) == (True, 100)
+
+
+def test_verify_from_checkpoint_hashes_only_new_entries(tmp_path: Path, monkeypatch) -> None:
+    audit = tmp_path / "audit.jsonl"
+    for i in range(5):
+        provenance.append_audit("evt", {"i": i}, path=audit)
+    ok, checkpoint = provenance.verify_from(audit)
+    assert ok and checkpoint.index == 5
+
+    for i in range(3):
+        provenance.append_audit("evt", {"i": 5 + i}, path=audit)
+
+    calls = []
+    real_hash = provenance._hash_entry
+    monkeypatch.setattr(
+        provenance, "_hash_entry", lambda e, p: calls.append(1) or real_hash(e, p)
+    )
+    ok, head = provenance.verify_from(audit, checkpoint)
+    assert ok
+    assert head.index == 8
+    assert len(calls) == 3
+
+
+def test_checkpoint_without_offset_and_mismatch(tmp_path: Path) -> None:
+    audit = tmp_path / "audit.jsonl"
+    for i in range(4):
+        provenance.append_audit("evt", {"i": i}, path=audit)
+    _, head = provenance.verify_from(audit)
+
+    lines = audit.read_text().splitlines()
+    second_hash = json.loads(lines[1])["hash"]
+
+    ok, count = provenance.verify_chain(
+        audit, provenance.ChainHead(index=2, hash=second_hash, offset=None)
+    )
+    assert (ok, count) == (True, 4)
+
+    bad = provenance.ChainHead(index=head.index, hash="f" * 64, offset=head.offset)
+    assert provenance.verify_from(audit, bad)[0] is False
+
+
+def test_verify_incremental_detects_tampering_after_checkpoint(tmp_path: Path) -> None:
+    audit = tmp_path / "audit.jsonl"
+    for i in range(3):
+        provenance.append_audit("evt", {"i": i}, path=audit)
+    assert provenance.verify_incremental(audit) == (True, 3)
+    assert provenance.load_checkpoint(audit).index == 3
+
+    provenance.append_audit("evt", {"i": 3}, path=audit)
+    lines = audit.read_text().splitlines()
+    tampered = json.loads(lines[-1])
+    tampered["details"]["i"] = 99
+    lines[-1] = json.dumps(tampered, separators=(",", ":"))
+    audit.write_text("\n".join(lines) + "\n")
+
+    ok, _ = provenance.verify_incremental(audit)
+    assert ok is False
+    assert provenance.load_checkpoint(audit).index == 3
+
+
+def test_verify_runner_uses_checkpoint_unless_full(tmp_path: Path, monkeypatch) -> None:
+    from swarmz_runtime.verify import runner
+
+    audit = tmp_path / "audit.jsonl"
+    provenance.append_audit("a", {"mission_id": "m1"}, path=audit)
+    provenance.append_audit("b", {"mission_id": "m2"}, path=audit)
+    assert provenance.verify_incremental(audit) == (True, 2)
+
+    full_checks = []
+    real_verify_chain = provenance.verify_chain
+    monkeypatch.setattr(
+        provenance,
+        "verify_chain",
+        lambda *a, **k: full_checks.append(a) or real_verify_chain(*a, **k),
+    )
+    state = runner.replay_audit(audit)
+    assert full_checks == []
+    assert state["hash_ok"] is True
+    assert state["mission_ids"] == ["m1", "m2"]
+    assert state["replay_hash"] == runner.replay_audit(audit, hash_ok=True)["replay_hash"]
+
+    assert runner.replay_audit(audit, full=True)["hash_ok"] is True
+    assert len(full_checks) == 1
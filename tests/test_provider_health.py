@@ -0,0 +1,125 @@
+from core.provider_health import CLOSED, HALF_OPEN, OPEN, ProviderHealth
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _tracker(clock, **kwargs):
+    kwargs.setdefault("tick_sec", 3600)
+    return ProviderHealth(
+        ttl_sec=30, failure_threshold=2, base_backoff_sec=1, max_backoff_sec=8,
+        clock=clock, **kwargs,
+    )
+
+
+def test_probe_result_is_cached_until_ttl():
+    clock = _Clock()
+    calls = []
+    health = _tracker(clock)
+    health.register_probe("ollama", lambda: calls.append(1) or True)
+
+    assert health.is_available("ollama")
+    assert health.is_available("ollama")
+    assert len(calls) == 1
+    assert health.probe_due() == 0
+
+    clock.now += 31
+    assert health.probe_due() == 1
+    assert len(calls) == 2
+    health.stop()
+
+
+def test_failing_probe_opens_circuit_and_backs_off():
+    clock = _Clock()
+    up = {"value": False}
+
+    def probe():
+        if not up["value"]:
+            raise OSError("connection refused")
+        return True
+
+    health = _tracker(clock)
+    health.register_probe("ollama", probe)
+
+    assert not health.is_available("ollama")
+    assert health.state("ollama")["state"] == CLOSED
+
+    clock.now += 1
+    assert health.probe_due() == 1
+    state = health.state("ollama")
+    assert state["state"] == OPEN
+    assert state["retryInSec"] == 1
+    assert "connection refused" in state["lastError"]
+    assert not health.allow("ollama")
+
+    clock.now += 1
+    health.probe_due()
+    assert health.state("ollama")["backoffSec"] == 2
+    clock.now += 1
+    assert health.probe_due() == 0  # still backing off
+
+    up["value"] = True
+    clock.now += 1
+    health.probe_due()
+    assert health.state("ollama")["state"] == CLOSED
+    assert health.is_available("ollama")
+    health.stop()
+
+
+def test_unprobed_provider_half_opens_for_one_trial_call():
+    clock = _Clock()
+    health = _tracker(clock)
+    for _ in range(2):
+        assert health.allow("anthropic")
+        health.record_failure("anthropic", "HTTP 529")
+    assert not health.is_available("anthropic")
+    assert not health.allow("anthropic")
+
+    clock.now += 1
+    assert health.is_available("anthropic")
+    assert health.allow("anthropic")
+    assert health.state("anthropic")["state"] == HALF_OPEN
+    assert not health.allow("anthropic")
+
+    health.record_failure("anthropic", "HTTP 529")
+    assert health.state("anthropic")["state"] == OPEN
+    assert health.state("anthropic")["backoffSec"] == 2
+
+    clock.now += 2
+    assert health.allow("anthropic")
+    health.record_success("anthropic")
+    state = health.state("anthropic")
+    assert state["state"] == CLOSED and state["consecutiveFailures"] == 0
+    assert state["shortCircuited"] == 3
+    health.stop()
+
+
+def test_router_skips_provider_while_circuit_open(monkeypatch):
+    from core import model_router, provider_health
+
+    health = _tracker(_Clock())
+    monkeypatch.setattr(provider_health, "_health", health)
+    monkeypatch.setattr(model_router, "get_provider_health", lambda: health)
+    monkeypatch.setattr(model_router, "is_offline", lambda: False)
+    monkeypatch.setattr(
+        model_router,
+        "get_model_config",
+        lambda: {"provider": "ollama", "ollama": {"model": "m"}},
+    )
+    calls = []
+
+    def fake_ollama(*args):
+        calls.append(1)
+        return model_router._err_response("Ollama error: refused", "ollama", "m", 0)
+
+    monkeypatch.setattr(model_router, "_call_ollama", fake_ollama)
+    for _ in range(3):
+        result = model_router.call([{"role": "user", "content": "hi"}])
+    assert len(calls) == 2
+    assert "circuit open" in result["error"]
+    assert model_router.get_status()["breaker"]["state"] == OPEN
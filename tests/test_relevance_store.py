@@ -0,0 +1,124 @@
+import gzip
+import json
+
+from core.relevance_engine import RelevanceEngine
+from core.relevance_store import BlockStore, IndexedLog
+
+
+def test_indexed_log_counts_tails_and_catches_up(tmp_path):
+    log = IndexedLog(tmp_path / "warm.jsonl")
+    for i in range(5):
+        log.append({"i": i})
+    assert len(log) == 5
+    assert [r["i"] for r in log.tail(2)] == [3, 4]
+
+    # Rows written behind the index's back are picked up on reopen.
+    with open(tmp_path / "warm.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps({"i": 5}) + "\n")
+    reopened = IndexedLog(tmp_path / "warm.jsonl")
+    assert len(reopened) == 6
+    assert reopened.tail(1) == [{"i": 5}]
+
+    # An index that no longer fits the log is rebuilt.
+    (tmp_path / "warm.jsonl").write_text(json.dumps({"i": 0}) + "\n", encoding="utf-8")
+    assert len(IndexedLog(tmp_path / "warm.jsonl")) == 1
+
+
+def test_block_store_seals_blocks_and_reopens_from_footer(tmp_path):
+    path = tmp_path / "cold.blocks"
+    store = BlockStore(path, block_rows=4)
+    store.extend({"i": i} for i in range(10))
+    assert (store.blocks, len(store)) == (2, 10)
+    assert [r["i"] for r in store.tail(7)] == [3, 4, 5, 6, 7, 8, 9]
+
+    reopened = BlockStore(path, block_rows=4)
+    assert (reopened.blocks, len(reopened)) == (2, 10)
+    assert [r["i"] for r in reopened.tail(3)] == [7, 8, 9]
+
+    path.write_bytes(b"not a block file")
+    fresh = BlockStore(path, block_rows=4)
+    assert fresh.blocks == 0
+    assert list(tmp_path.glob("cold.blocks.corrupt-*"))
+
+
+def test_block_store_survives_a_torn_seal_and_compacts(tmp_path):
+    path = tmp_path / "cold.blocks"
+    store = BlockStore(path, block_rows=2)
+    store.extend({"i": i} for i in range(4))
+    committed = path.stat().st_size
+    store.extend({"i": i} for i in range(4, 6))
+    # Crash part-way through the third seal: only some of its bytes landed.
+    with open(path, "r+b") as f:
+        f.truncate(committed + 10)
+
+    reopened = BlockStore(path, block_rows=2)
+    assert (reopened.blocks, len(reopened)) == (2, 4)
+    assert not list(tmp_path.glob("cold.blocks.corrupt-*"))
+    reopened.extend({"i": i} for i in range(4, 40))
+    assert [r["i"] for r in BlockStore(path, block_rows=2).tail(3)] == [37, 38, 39]
+
+    # Superseded footers are rewritten away instead of piling up.
+    data = sum(length for _, length, _ in reopened._blocks)
+    assert path.stat().st_size < 3 * data
+
+
+class _Evolution:
+    def __init__(self):
+        self.rows = []
+
+    @property
+    def record_count(self):
+        return len(self.rows)
+
+    def history_tail(self, limit=200):
+        return self.rows[-limit:] if limit > 0 else []
+
+
+def test_engine_keeps_incremental_windows_and_stats(tmp_path):
+    legacy = tmp_path / "memory" / "cold" / "cold.jsonl.gz"
+    legacy.parent.mkdir(parents=True)
+    with gzip.open(legacy, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"inputs_hash": "old"}) + "\n")
+
+    evo = _Evolution()
+    cf_file = tmp_path / "counterfactual_log.jsonl"
+    engine = RelevanceEngine(str(tmp_path), evo, counterfactual=object())
+    assert engine.tier_sizes()["cold"] == 1
+    assert not legacy.exists()
+
+    for i in range(3):
+        evo.rows.append({"inputs_hash": "h", "strategy_used": "s", "score": 1.0})
+        with open(cf_file, "a", encoding="utf-8") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "inputs_hash": "h",
+                        "selected_strategy": "s",
+                        "predicted_vs_actual_delta": 0.2,
+                        "regret_score": 0.1 * i,
+                    }
+                )
+                + "\n"
+            )
+        engine.after_outcome(f"m{i}", "h", "s", 1.0, True, 5.0)
+
+    assert engine._cf_stats[("h", "s")][0] == 3
+    assert engine._hist_hits[("h", "s")] == 3
+    assert engine._signal_noise() == (1.0, 0.0)
+    stats = engine.usefulness_stats("h", "s")
+    assert stats["count"] == 3
+    assert sum(stats["tiers"].values()) == 3
+
+
+def test_legacy_cold_import_is_not_repeated_after_a_crash(tmp_path):
+    legacy = tmp_path / "memory" / "cold" / "cold.jsonl.gz"
+    legacy.parent.mkdir(parents=True)
+    with gzip.open(legacy, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"inputs_hash": "old"}) + "\n")
+    engine = RelevanceEngine(str(tmp_path), _Evolution(), counterfactual=object())
+    # Crash after the import was sealed but before the rename.
+    legacy.with_name(legacy.name + ".migrated").rename(legacy)
+
+    engine = RelevanceEngine(str(tmp_path), _Evolution(), counterfactual=object())
+    assert engine.tier_sizes()["cold"] == 1
+    assert not legacy.exists()
@@ -0,0 +1,85 @@
+import json
+
+from core.phase_engine import _OUTCOMES, PhaseEngine
+from core.sequence_miner import SequenceMiner
+
+
+def test_top_k_and_predict_next():
+    miner = SequenceMiner(max_len=4)
+    miner.extend(["plan", "build", "test", "ship"] * 5 + ["plan", "build", "fail"] * 2)
+
+    top = miner.top_k(3, min_len=2)
+    assert top[0]["support"] == 7
+    assert {"plan->build"} <= {row["name"] for row in miner.top_k(20)}
+
+    after = miner.predict_next(["plan", "build"])
+    assert after[0]["event"] == "test"
+    assert after[0]["support"] == 5
+    assert after[1]["event"] == "fail"
+    assert abs(sum(row["probability"] for row in after) - 1.0) < 1e-3
+
+    # Unknown context backs off to the shorter suffix.
+    assert miner.predict_next(["nope", "test"])[0]["event"] == "ship"
+
+
+def test_memory_is_bounded_and_rare_chains_estimated():
+    miner = SequenceMiner(max_len=3, min_support=2, capacity=64)
+    for i in range(2000):
+        miner.add(f"e{i % 97}")
+    stats = miner.stats()
+    assert stats["tracked_chains"] <= 64
+    assert stats["pruned"] > 0
+    assert miner.support(["e1", "e2"]) >= 20
+    assert miner.support(["e1", "e50"]) <= 2
+
+
+def test_mine_sequences_and_follow(tmp_path):
+    log = tmp_path / "events.jsonl"
+    rows = [{"event": e} for e in ["a", "b", "a", "b", "a", "b"]]
+    log.write_text("".join(json.dumps(r) + "\n" for r in rows))
+
+    assert SequenceMiner().mine_sequences(rows)[0]["support"] >= 2
+
+    miner = SequenceMiner()
+    assert miner.follow(log) == 6
+    assert miner.follow(log) == 0
+    with log.open("a") as fh:
+        fh.write(json.dumps({"event": "a"}) + "\n" + '{"event": "b"')
+    assert miner.follow(log) == 1
+    assert miner.support(["b", "a"]) == 3
+
+    log.write_text(json.dumps({"event": "z"}) + "\n")
+    assert miner.follow(log) == 1
+    assert miner.stats()["events"] == 1
+
+
+def _brute_force_counts(entries, window=6):
+    counts = {name: 0 for name in _OUTCOMES}
+    for i in range(len(entries)):
+        win = entries[max(0, i - window + 1) : i + 1]
+        for name, fn in _OUTCOMES.items():
+            if any(fn(e) for e in win):
+                counts[name] += 1
+    return counts
+
+
+def test_phase_engine_folds_history_incrementally(tmp_path):
+    pe = PhaseEngine(str(tmp_path / "data"))
+    entries = []
+    for i in range(40):
+        entry = {
+            "success_rate_recent": [0.1, 0.5, 0.8, 0.9][i % 4],
+            "entropy_level": [0.1, 0.5][i % 2],
+            "divergence_score": 0.6 if i % 7 == 0 else 0.0,
+            "work_intensity": 9000 if i % 11 == 0 else 100,
+            "context_cluster_id": ["steady", "at_risk", "expanding"][i % 3],
+        }
+        entries.append(entry)
+        pe._append_jsonl(pe.history_file, entry)
+        patterns = pe._detect_patterns()
+
+    expected = _brute_force_counts(entries)
+    assert {k: v["count"] for k, v in patterns.items()} == expected
+    assert patterns["abandoned"]["recent"][-1] in {"steady", "at_risk", "expanding"}
+    assert pe.predict_next_cluster()[0]["event"] == "at_risk"
+    assert pe.top_chains(1)[0]["support"] >= 10
@@ -0,0 +1,103 @@
+import asyncio
+
+from core.health_snapshot import HealthSnapshot
+from core.state_hub import HubEvent, StateHub
+
+
+def _hub(**kwargs):
+    # A long window keeps the flusher thread out of the way; tests flush by hand.
+    return StateHub(coalesce_ms=60_000, **kwargs)
+
+
+def test_publish_coalesces_and_suppresses_unchanged_keys():
+    hub = _hub()
+    hub.publish("missions", {"m1": {"status": "PENDING"}})
+    hub.publish("missions", {"m1": {"status": "RUNNING"}, "m2": {"status": "PENDING"}})
+    hub.publish("audit", {"last_event": {"event_type": "mission_created"}})
+
+    events = hub.flush()
+    assert [(e.id, e.topic) for e in events] == [(1, "missions"), (2, "audit")]
+    assert events[0].data == {
+        "delta": {"m1": {"status": "RUNNING"}, "m2": {"status": "PENDING"}}
+    }
+
+    hub.publish("missions", {"m1": {"status": "RUNNING"}})
+    assert hub.flush() == []
+    stats = hub.stats()
+    assert stats["suppressed"] == 1
+    assert stats["emitted"] == 2
+    assert hub.snapshot(["missions"])["missions"]["m2"] == {"status": "PENDING"}
+
+
+def test_event_encodes_as_sse():
+    text = HubEvent(7, "health", {"delta": {"ok": True}}).encode()
+    assert text == 'id: 7\nevent: health\ndata: {"delta":{"ok":true}}\n\n'
+
+
+def test_resume_replays_missed_events_or_falls_back_to_snapshot():
+    hub = _hub(history=2)
+    for status in ("PENDING", "RUNNING", "SUCCESS"):
+        hub.publish("missions", {"m1": status})
+        hub.flush()
+
+    async def first_event(last_event_id):
+        sub = hub.subscribe(["missions"], last_event_id)
+        try:
+            return await sub.get(timeout=1)
+        finally:
+            sub.close()
+
+    replayed = asyncio.run(first_event(2))
+    assert (replayed.id, replayed.topic) == (3, "missions")
+    assert replayed.data == {"delta": {"m1": "SUCCESS"}}
+
+    # Event 1 fell out of the two-event ring.
+    fresh = asyncio.run(first_event(0))
+    assert fresh.topic == "snapshot"
+    assert fresh.data == {"state": {"missions": {"m1": "SUCCESS"}}}
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_slow_subscriber_gets_resync_instead_of_backlog():
+    hub = _hub(queue_size=2)
+
+    async def scenario():
+        sub = hub.subscribe(["organism"], None)
+        await sub.get(timeout=1)  # initial snapshot
+        for level in range(1, 6):
+            hub.publish("organism", {"level": level})
+            hub.flush()
+        await asyncio.sleep(0.05)
+        received = []
+        while not sub.queue.empty():
+            received.append(await sub.get(timeout=1))
+        dropped = sub.dropped
+        sub.close()
+        return received, dropped
+
+    received, dropped = asyncio.run(scenario())
+    assert dropped > 0
+    assert any(e.topic == "resync" for e in received)
+    assert len(received) <= 2
+    resync = [e for e in received if e.topic == "resync"][-1]
+    assert resync.data["state"]["organism"]["level"] >= 4
+
+
+def test_health_snapshot_reports_changed_values():
+    changes = []
+    values = iter([1, 1, 2])
+    snap = HealthSnapshot(on_change=lambda name, value: changes.append((name, value)))
+    snap.register("tests", lambda: next(values))
+    for _ in range(3):
+        snap.refresh("tests")
+    assert changes == [("tests", 2)]
+
+
+def test_stream_stats_endpoint():
+    from fastapi.testclient import TestClient
+
+    from swarmz_server import app
+
+    resp = TestClient(app).get("/v1/stream/state/stats")
+    assert resp.status_code == 200
+    assert set(resp.json()["hub"]) >= {"last_event_id", "subscribers", "topics"}
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from backend import symbolic_registry as reg
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def symbolic_root(monkeypatch, tmp_path):
+    root = tmp_path / "symbolic"
+    shutil.copytree(ROOT / "symbolic" / "pantheons", root / "pantheons")
+    monkeypatch.setattr(reg, "SYMBOLIC_ROOT", root)
+    reg.invalidate_cache()
+    yield root
+    reg.invalidate_cache()
+
+
+def test_entries_are_cached_and_invalidated_by_mtime(symbolic_root, monkeypatch) -> None:
+    entries = reg.list_family_entries("pantheons")
+    assert entries
+    entry_id = entries[0]["entry_id"]
+    assert reg.get_entry_manifest("pantheons", entry_id) == entries[0]
+
+    parses = []
+    real_validate = reg.validate_manifest
+    monkeypatch.setattr(reg, "validate_manifest", lambda m: parses.append(m) or real_validate(m))
+    assert reg.list_family_entries("pantheons") == entries
+    assert parses == []
+
+    new_dir = symbolic_root / "pantheons" / "zz_new"
+    new_dir.mkdir()
+    manifest = dict(entries[0]["manifest"], id="zz_new", name="ZZ New")
+    (new_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    assert reg.count_family_entries("pantheons") == len(entries) + 1
+    assert reg.get_entry_manifest("pantheons", "zz_new")["manifest"]["name"] == "ZZ New"
+    assert len(parses) == 1
+
+    with pytest.raises(FileNotFoundError):
+        reg.get_entry_manifest("pantheons", "missing")
+
+
+def test_compiled_index_avoids_cold_parse(symbolic_root, monkeypatch) -> None:
+    reg.build_compiled_index()
+    reg.invalidate_cache()
+
+    parses = []
+    real_validate = reg.validate_manifest
+    monkeypatch.setattr(reg, "validate_manifest", lambda m: parses.append(m) or real_validate(m))
+    assert reg.list_family_entries("pantheons")
+    assert reg.get_family_manifest("pantheons")["family"] == "pantheons"
+    assert parses == []
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from core.system_sampler import SystemSampler
+
+
+def test_ring_buffer_and_history():
+    ticks = iter(range(100, 200))
+    sampler = SystemSampler(history=3, clock=lambda: float(next(ticks)))
+    for _ in range(5):
+        assert sampler.sample_now() is not None
+
+    latest = sampler.latest()
+    assert latest["ts"] == 104.0
+    assert len(latest["per_core"]) >= 1
+    assert latest["net_sent_per_sec"] is not None
+
+    rows = sampler.history(10)
+    assert [r["ts"] for r in rows] == [102.0, 103.0, 104.0]
+    assert "per_core" not in rows[0]
+    assert sampler.history(0) == []
+    assert sampler.stats()["buffered"] == 3
+    assert sampler.stats()["samples_taken"] == 5
+
+
+def test_background_thread_fills_buffer():
+    sampler = SystemSampler(interval_sec=0.1)
+    sampler.start()
+    try:
+        for _ in range(50):
+            if sampler.stats()["samples_taken"] >= 2:
+                break
+            time.sleep(0.05)
+    finally:
+        sampler.stop()
+    assert sampler.stats()["samples_taken"] >= 2
+    assert not sampler.running
+    assert sampler.identity()["hostname"]
+
+
+def test_sysmon_endpoint_serves_cached_sample():
+    from fastapi.testclient import TestClient
+    from swarmz_server import app
+
+    client = TestClient(app)
+    body = client.get("/v1/sysmon", params={"history": 5, "per_core": True}).json()
+    assert body["ok"] is True
+    assert {"cpu_percent", "memory_percent", "disk_percent", "hostname"} <= set(
+        body["system"]
+    )
+    assert len(body["per_core"]) == body["system"]["cpu_cores"]
+    assert 1 <= len(body["history"]) <= 5
+    assert "per_core" not in client.get("/v1/sysmon").json()
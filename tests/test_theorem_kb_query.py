@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from theorem_kb.query import TheoremKB, get_kb
+
+_RAW = {
+    "Number theory": [
+        {"name": "Prime number theorem", "fields": ["number theory"], "slug": "pnt"},
+        {"name": "Dirichlet's theorem on arithmetic progressions", "fields": ["number theory"], "slug": "dirichlet"},
+        {"name": "Green-Tao theorem", "fields": ["prime numbers", "additive combinatorics"], "slug": "green_tao"},
+    ],
+    "General topology": [
+        {"name": "Brouwer fixed-point theorem", "fields": ["topology"], "slug": "brouwer"},
+        {"name": "Tychonoff's theorem", "fields": ["topology"], "slug": "tychonoff"},
+    ],
+}
+
+
+def test_bm25_search_and_category_filter() -> None:
+    kb = TheoremKB.from_json(_RAW)
+    assert kb.search("prime numbers")[0]["slug"] == "green_tao"
+    assert kb.search("fixed point")[0]["slug"] == "brouwer"
+    filtered = kb.search("theorem", categories=["general topology"])
+    assert {r["slug"] for r in filtered} == {"brouwer", "tychonoff"}
+    assert kb.search("nonexistent-token") == []
+
+
+def test_related_uses_tfidf_neighbours() -> None:
+    kb = TheoremKB.from_json(_RAW)
+    assert kb.related("brouwer", k=1)[0]["slug"] == "tychonoff"
+    assert kb.get("pnt")["category"] == "Number theory"
+
+
+def test_shipped_kb_loads_and_answers() -> None:
+    kb = get_kb()
+    assert sum(c["count"] for c in kb.categories()) == len(kb.docs) > 1000
+    assert kb.search("prime number", k=3)[0]["name"] == "Prime number theorem"
+
+
+def test_duplicate_slugs_are_disambiguated() -> None:
+    raw = {
+        "A": [{"name": "Fixed point theorem", "fields": ["analysis"], "slug": "fpt"}],
+        "B": [{"name": "Fixed point theorem", "fields": ["topology"], "slug": "fpt"}],
+    }
+    kb = TheoremKB.from_json(raw)
+    assert kb.get("fpt")["category"] == "A"
+    assert kb.get("fpt-2")["category"] == "B"
+    assert kb.related("fpt-2", k=1)[0]["slug"] == "fpt"
+
+
+def test_shipped_kb_search_hits_round_trip_through_get() -> None:
+    kb = get_kb()
+    assert len(kb.by_slug) == len(kb.docs)
+    for query in ("theorem", "lemma", "fixed point", "prime", "inequality"):
+        for hit in kb.search(query, k=200):
+            hit.pop("score")
+            assert kb.get(hit["slug"]) == hit
@@ -0,0 +1,182 @@
+"""Query engine over the theorem knowledge base.
+
+``theorems.json`` is read once, on the first query, and compiled into a
+compact in-memory index: a document table of tuples, an inverted token
+index with term frequencies, and L2-normalised TF-IDF vectors.  For the
+~1.3k shipped theorems this takes ~20 ms, which is faster than loading a
+serialized copy of the index, so nothing is cached on disk.
+
+- ``search``: BM25 over name, fields and category tokens, optional
+  category filter.
+- ``related``: cosine nearest neighbours over TF-IDF vectors, scored by
+  walking only postings of the theorem's own tokens.
+
+Slugs are not unique in ``theorems.json`` (the same theorem name can appear
+under two categories).  The first occurrence keeps its slug and later ones
+become ``slug-2``, ``slug-3``, ... so every result round-trips through
+``get`` and ``related``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+KB_DIR = Path(__file__).resolve().parent
+THEOREMS_PATH = KB_DIR / "theorems.json"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP = frozenset({"the", "of", "and", "a", "an", "in", "on", "for", "s", "to"})
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP]
+
+
+class TheoremKB:
+    """Compiled theorem index; build with ``from_json`` or ``load``."""
+
+    def __init__(self, state: Dict[str, Any]):
+        # docs[i] = (name, slug, category, fields)
+        self.docs: List[Tuple[str, str, str, Tuple[str, ...]]] = state["docs"]
+        self.postings: Dict[str, List[Tuple[int, int]]] = state["postings"]
+        self.doc_len: List[int] = state["doc_len"]
+        self.vectors: List[Dict[str, float]] = state["vectors"]
+        self.avgdl = sum(self.doc_len) / len(self.doc_len) if self.doc_len else 0.0
+        self.by_slug = {doc[1]: i for i, doc in enumerate(self.docs)}
+        self.by_category: Dict[str, List[int]] = defaultdict(list)
+        for i, doc in enumerate(self.docs):
+            self.by_category[doc[2]].append(i)
+
+    @classmethod
+    def from_json(cls, raw: Dict[str, List[Dict[str, Any]]]) -> "TheoremKB":
+        docs = []
+        term_freqs: List[Counter] = []
+        seen: Dict[str, int] = {}
+        for category, items in raw.items():
+            for item in items:
+                fields = tuple(item.get("fields") or ())
+                slug = item["slug"]
+                while slug in seen:
+                    seen[item["slug"]] += 1
+                    slug = f"{item['slug']}-{seen[item['slug']]}"
+                seen.setdefault(slug, 1)
+                docs.append((item["name"], slug, category, fields))
+                text = " ".join((item["name"], " ".join(fields), category))
+                term_freqs.append(Counter(tokenize(text)))
+
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for i, tf in enumerate(term_freqs):
+            for token, n in tf.items():
+                postings[token].append((i, n))
+
+        total = len(docs)
+        idf = {t: math.log((total + 1) / (len(p) + 1)) + 1.0 for t, p in postings.items()}
+        vectors = []
+        for tf in term_freqs:
+            vec = {t: (1.0 + math.log(n)) * idf[t] for t, n in tf.items()}
+            norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+            vectors.append({t: w / norm for t, w in vec.items()})
+
+        return cls(
+            {
+                "docs": docs,
+                "postings": dict(postings),
+                "doc_len": [sum(tf.values()) for tf in term_freqs],
+                "vectors": vectors,
+            }
+        )
+
+    @classmethod
+    def load(cls, source: Path = THEOREMS_PATH) -> "TheoremKB":
+        return cls.from_json(json.loads(source.read_text(encoding="utf-8")))
+
+    def _doc(self, i: int, score: Optional[float] = None) -> Dict[str, Any]:
+        name, slug, category, fields = self.docs[i]
+        out: Dict[str, Any] = {
+            "name": name,
+            "slug": slug,
+            "category": category,
+            "fields": list(fields),
+        }
+        if score is not None:
+            out["score"] = round(score, 4)
+        return out
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        i = self.by_slug.get(slug)
+        return None if i is None else self._doc(i)
+
+    def categories(self) -> List[Dict[str, Any]]:
+        return [
+            {"category": c, "count": len(ids)} for c, ids in sorted(self.by_category.items())
+        ]
+
+    def search(
+        self, query: str, k: int = 10, categories: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """BM25-ranked theorems for ``query``, optionally within ``categories``."""
+        allowed = None
+        if categories:
+            wanted = {c.lower() for c in categories}
+            allowed = {c for c in self.by_category if c.lower() in wanted}
+        total = len(self.docs)
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            plist = self.postings.get(token)
+            if not plist:
+                continue
+            idf = math.log(1 + (total - len(plist) + 0.5) / (len(plist) + 0.5))
+            for i, tf in plist:
+                if allowed is not None and self.docs[i][2] not in allowed:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[i] / self.avgdl)
+                scores[i] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        top = heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+        return [self._doc(i, s) for i, s in top]
+
+    def related(self, slug: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Nearest theorems to ``slug`` by TF-IDF cosine similarity."""
+        i = self.by_slug.get(slug)
+        if i is None:
+            raise KeyError(slug)
+        scores: Dict[int, float] = defaultdict(float)
+        for token, weight in self.vectors[i].items():
+            for j, _ in self.postings.get(token, ()):
+                if j != i:
+                    scores[j] += weight * self.vectors[j][token]
+        top = heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+        return [self._doc(j, s) for j, s in top]
+
+
+_kb: Optional[TheoremKB] = None
+_kb_lock = threading.Lock()
+
+
+def get_kb() -> TheoremKB:
+    """Process-wide knowledge base, loaded on first use."""
+    global _kb
+    if _kb is None:
+        with _kb_lock:
+            if _kb is None:
+                _kb = TheoremKB.load()
+    return _kb
+
+
+def search(
+    query: str, k: int = 10, categories: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    return get_kb().search(query, k=k, categories=categories)
+
+
+def related(slug: str, k: int = 5) -> List[Dict[str, Any]]:
+    return get_kb().related(slug, k=k)
@@ -0,0 +1,68 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Micro-benchmark: compiled companion intent matching vs. a naive scan.
+
+Replays a corpus of chat lines (one per line; defaults to
+tools/companion_chat_corpus.txt) through the companion's compiled intent
+matcher and through the equivalent rule-by-rule ``any(k in text ...)``
+scan, checks they agree, and prints microseconds per message.
+
+    python tools/bench_companion_intents.py [--corpus FILE] [--rounds N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.companion import _INTENT_MATCHER, _INTENT_RULES  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "companion_chat_corpus.txt"
+
+
+def naive_match(text: str):
+    for label, keywords in _INTENT_RULES:
+        if any(k in text for k in keywords):
+            return label
+    return None
+
+
+def _time_per_message(fn, lines, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for line in lines:
+                fn(line)
+        best = min(best, time.perf_counter() - start)
+    return best / (rounds * len(lines)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    lines = [
+        line.lower().strip()
+        for line in args.corpus.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    mismatches = [t for t in lines if naive_match(t) != _INTENT_MATCHER.match(t)]
+    if mismatches:
+        raise SystemExit(f"matcher disagrees with naive scan on: {mismatches[:5]}")
+
+    naive_us = _time_per_message(naive_match, lines, args.rounds)
+    compiled_us = _time_per_message(_INTENT_MATCHER.match, lines, args.rounds)
+    print(f"corpus: {len(lines)} lines from {args.corpus}")
+    print(f"naive scan: {naive_us:8.2f} us/msg")
+    print(f"compiled:   {compiled_us:8.2f} us/msg  ({naive_us / compiled_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
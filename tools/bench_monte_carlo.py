@@ -0,0 +1,79 @@
+# SWARMZ Source Available License
+# Commercial use, hosting, and resale prohibited.
+# See LICENSE file for details.
+"""Benchmark: Monte Carlo strategy trajectories per second.
+
+Builds synthetic score histories for a few candidate strategies and runs
+``core.monte_carlo.simulate_strategies`` inline and across process pools
+of increasing size.  It checks that a fixed seed gives the same intervals
+for every worker count, then prints trajectories per second.
+
+    python tools/bench_monte_carlo.py [--trials N] [--strategies K] [--workers 1,2,4]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from core.monte_carlo import get_pool, shutdown_pool, simulate_strategies  # noqa: E402
+
+
+def _histories(strategies: int, window: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return {
+        f"s{i}": rng.beta(2 + i, 2, window).round(4).tolist() for i in range(strategies)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=1_000_000)
+    parser.add_argument("--strategies", type=int, default=4)
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(w) for w in sorted({1, 2, os.cpu_count() or 1})),
+        help="comma-separated worker counts (1 runs inline)",
+    )
+    args = parser.parse_args()
+
+    samples = _histories(args.strategies, args.window, args.seed)
+    reference = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        if workers > 1:
+            # Start the pool outside the timed region.
+            list(get_pool(workers).map(abs, range(workers)))
+        start = time.perf_counter()
+        result = simulate_strategies(
+            samples,
+            "s0",
+            trials=args.trials,
+            seed=args.seed,
+            batch_size=args.batch_size,
+            workers=workers,
+        )
+        elapsed = time.perf_counter() - start
+        summary = (result["projected_score"], result["regret"])
+        if reference is None:
+            reference = summary
+        elif summary != reference:
+            raise SystemExit(f"workers={workers} changed the seeded result")
+        print(
+            f"workers={workers:>2}  {args.trials} trajectories in {elapsed:.3f}s"
+            f"  ({args.trials / elapsed:,.0f}/s)"
+        )
+    shutdown_pool()
+    print(f"projected={reference[0]}  regret={reference[1]}")
+
+
+if __name__ == "__main__":
+    main()